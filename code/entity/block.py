@@ -1,19 +1,28 @@
 
 import math
+import numpy as np
+
 from collections import OrderedDict
 from typing import (
     List, 
     Dict,
+    Optional,
     Tuple,
 )
 
-from utility.define import wspace
+from utility.define import (
+    wspace,
+    blockEdgeDefinition,
+    blockEdgeIndex,
+    blockFaceDefinition,
+)
 from utility import tool as t
 from utility.udtypes import (
     PointValueType
 )
 from operation.action.ablock import BlockAction
 
+from entity.blockgeometry import BlockGeometry
 from entity.face import Face
 from entity.edge import Edge
 from entity.vertex import Vertex
@@ -29,9 +38,12 @@ class Block:
             isActive: bool,
             vertices: tuple,
             vertexCoordinates: Dict,
-            faces: Dict,
+            faces: Optional[Dict],
             spacing: Dict,
-            grading: Dict
+            grading: Dict,
+            edgeRegistry: Optional[Dict] = None,
+            activeMask: Optional[np.ndarray] = None,
+            geometry: Optional[BlockGeometry] = None
         ) -> None:
         """
         Initialize block instance
@@ -41,19 +53,26 @@ class Block:
             index (str): The associated index of the block instance
             isActive (bool): block status. Included/active is True, excluded/inactive is False
             vertices (tuple): Vertices (Type: Vertex class) used to define the block (needs 8 vertices to define each block)
-            vertexCoordinates: Coordinates of the vertex defining the block
-            faces (dict): Faces (Type: Face class) used to define the block (needs 6 faces to define each block)
+            vertexCoordinates: Coordinates of the vertex defining the block. None to read the current coordinates of the vertices.
+            faces (dict): Faces (Type: Face class) used to define the block (needs 6 faces to define each block). None to create them on first access.
             spacing (dict): Grid spacing along x, y, z directions
             grading (dict): Cell expansion ratio
+            edgeRegistry (Optional[Dict], optional): Registry of the edges of the multi-block, used when the edges are created on first access. Defaults to None.
+            activeMask (Optional[np.ndarray], optional): Activity mask of the multi-block (indexed by block id). If given, the block status is read from/written to the mask. Defaults to None.
+            geometry (Optional[BlockGeometry], optional): Cached bounds/cell counts of the multi-block blocks. Defaults to None.
         """
         
         self._id = id
         self._index = index
-        self._isActive = isActive
+        self._geometry = geometry
+        self._activeMask = activeMask
+        if activeMask is None:
+            self._isActive = isActive
         self._vertices = vertices
         self._vertexCoordinates = vertexCoordinates
         self._faces = faces
         self._edges = None
+        self._edgeRegistry = edgeRegistry
         self._multiBlockIndex = None
         self._spacing = spacing
         self._grading = grading
@@ -96,7 +115,9 @@ class Block:
     ### Block -> isActive
     @property
     def isActive(self) -> bool:
-        return self._isActive
+        if self._activeMask is None:
+            return self._isActive
+        return bool(self._activeMask[self._id])
     
     @isActive.setter
     def isActive(self, value: bool):
@@ -105,7 +126,10 @@ class Block:
         if not isinstance(value, bool):
             raise ValueError("Value of 'Block.isActive' must be a bool.")
         
-        self._isActive = value
+        if self._activeMask is None:
+            self._isActive = value
+        else:
+            self._activeMask[self._id] = value
     
     ### Block -> vertices
     @property
@@ -127,6 +151,8 @@ class Block:
     ### Block -> vertex coordinates
     @property
     def vertexCoordinates(self) -> Dict:
+        if self._vertexCoordinates is None:
+            return {iv : v.coordinates() for iv, v in enumerate(self.vertices)}
         return self._vertexCoordinates
     
     @vertexCoordinates.setter
@@ -143,6 +169,8 @@ class Block:
     ### Block -> faces
     @property
     def faces(self) -> Dict:
+        if self._faces is None:
+            self.get_faces()
         return self._faces
     
     @faces.setter
@@ -159,6 +187,8 @@ class Block:
     ### Block -> edges
     @property
     def edges(self) -> tuple:
+        if self._edges is None:
+            self.get_edges(self._edgeRegistry)
         return self._edges
     
     @edges.setter
@@ -223,7 +253,26 @@ class Block:
         
         self._grading = value
     
-    def get_edges(self) -> None:
+    def get_faces(self) -> None:
+        """
+        Define faces from the block definition.
+        The face vertices are ordered according to the
+        blockMesh convention (see utility.define.blockFaceDefinition)
+        """
+        
+        self.faces = {
+                faceName : Face(
+                        self.id,
+                        faceName,
+                        [self.vertices[i] for i in vertexPosition]
+                    )
+                for faceName, vertexPosition in blockFaceDefinition.items()
+            }
+    
+    def get_edges(
+            self,
+            edgeRegistry: Optional[Dict] = None
+        ) -> None:
         """
         Define edges from the block definition.
         The vertices are ordered from a lower coordinate
@@ -232,6 +281,10 @@ class Block:
         Example: On the back face, along x, 
         edges are --> v-0 v-1 and v-3 v-2 (not v-2 v-3)
         
+        Edges shared with a neighbouring block are looked up in
+        the (start vertex id, end vertex id) keyed registry, so
+        that both blocks refer to the same Edge object.
+        
         Convention:
             0  --> back  - bottom - x
             1  --> back  - top    - x
@@ -245,24 +298,58 @@ class Block:
             9  --> left  - top    - z
             10 --> right - bottom - z
             11 --> right - top    - z
+        
+        Args:
+            edgeRegistry (Optional[Dict], optional): Registry of the edges already defined in the multi-block. Defaults to None.
         """
         
-        self.edges = (
-                Edge(0, "x", "back-bottom", self.vertices[0], self.vertices[1]),
-                Edge(1, "x", "back-top", self.vertices[3], self.vertices[2]),
-                Edge(2, "x", "front-bottom", self.vertices[4], self.vertices[5]),
-                Edge(3, "x", "front-top", self.vertices[7], self.vertices[6]),
-                Edge(4, "y", "back-left", self.vertices[0], self.vertices[3]),
-                Edge(5, "y", "back-right", self.vertices[1], self.vertices[2]),
-                Edge(6, "y", "front-left", self.vertices[4], self.vertices[7]),
-                Edge(7, "y", "front-right", self.vertices[5], self.vertices[6]),
-                Edge(8, "z", "left-bottom", self.vertices[0], self.vertices[4]),
-                Edge(9, "z", "left-top", self.vertices[3], self.vertices[7]),
-                Edge(10, "z", "right-bottom", self.vertices[1], self.vertices[5]),
-                Edge(11, "z", "right-top", self.vertices[2], self.vertices[6]),
-            )
+        if edgeRegistry is None:
+            edgeRegistry = {}
+        
+        edges = []
+        
+        for edgeId, (direction, position, startIndex, endIndex) in enumerate(blockEdgeDefinition):
+            start = self.vertices[startIndex]
+            end = self.vertices[endIndex]
+            key = (start.id, end.id)
+            
+            if key not in edgeRegistry:
+                edgeRegistry[key] = Edge(edgeId, direction, position, start, end)
+            
+            edges.append(edgeRegistry[key])
+        
+        self.edges = tuple(edges)
     
 
+    def edge(
+            self,
+            edgeIndex: int
+        ) -> Edge:
+        """
+        Get an edge of the block by its index (see Block.get_edges).
+        If the edges of the block are not defined yet, only this
+        edge is created (in the edge registry of the multi-block).
+
+        Args:
+            edgeIndex (int): Index of the edge in the block, between 0-11
+
+        Returns:
+            Edge: The edge object
+        """
+        
+        if self._edges is not None or self._edgeRegistry is None:
+            return self.edges[edgeIndex]
+        
+        direction, position, startIndex, endIndex = blockEdgeDefinition[edgeIndex]
+        start = self.vertices[startIndex]
+        end = self.vertices[endIndex]
+        key = (start.id, end.id)
+        
+        if key not in self._edgeRegistry:
+            self._edgeRegistry[key] = Edge(edgeIndex, direction, position, start, end)
+        
+        return self._edgeRegistry[key]
+    
     def get_block_edge_location(
             self,
             locationStringList: List[str]
@@ -272,46 +359,23 @@ class Block:
 
         Args:
             locationStringList (List[str]): 
-                List of two of the following strings - 
+                List of two of the following strings (order insensitive) - 
                 front, back, left, right, top, bottom
 
         Raises:
-            ValueError: if a valid edge position index is not found
+            ValueError: if the edge description is not a list of two strings
 
         Returns:
-            int: position index of an edge in a block
+            int: position index of an edge in a block, None if the two faces don't share an edge
         """
         
-        if len(locationStringList) != 2:
+        if (not isinstance(locationStringList, (list, tuple))
+                or len(locationStringList) != 2
+                or not all(isinstance(x, str) for x in locationStringList)):
             raise ValueError("Edge location specification list must have 2 elements (string)")
         
-        locationString1 = f"{locationStringList[0]}-{locationStringList[1]}"
-        locationString2 = f"{locationStringList[1]}-{locationStringList[0]}"
-        
-        edgePosition = [
-                    "back-bottom",
-                    "back-top",
-                    "front-bottom",
-                    "front-top",
-                    "back-left",
-                    "back-right",
-                    "front-left",
-                    "front-right",
-                    "left-bottom",
-                    "left-top",
-                    "right-bottom",
-                    "right-top"
-                ]
-        
-        edgeLocationIndex = None
-        
-        for locationString in [locationString1, locationString2]:
-            if locationString in edgePosition:
-                edgeLocationIndex = edgePosition.index(locationString)
-            
-        return edgeLocationIndex
-
-
+        return blockEdgeIndex.get(frozenset(locationStringList))
+    
     def find_edge(
             self,
             edgePosition: List
@@ -320,21 +384,21 @@ class Block:
         Get the Edge object for a given Block and edge location
 
         Args:
-            blocks (Block): The Block object where the edge is location
             edgePosition (List): List of strings defining the edge location
 
+        Raises:
+            ValueError: if the edge location is not recognized
+
         Returns:
             Edge: The identified edge object
         """
         
         edgeLocationIndex = self.get_block_edge_location(edgePosition)
-            
-        if edgeLocationIndex not in range(12):
-            raise ValueError("Edge location specification not recognized")
         
-        edge = self.edges[edgeLocationIndex]
+        if edgeLocationIndex is None:
+            raise ValueError(f"Edge location specification not recognized --> {edgePosition!r}")
         
-        return edge
+        return self.edges[edgeLocationIndex]
     
     def get_hex(self) -> str:
         """ Define the block hex. """
@@ -390,13 +454,27 @@ class Block:
         """  
             Calculates min/max along x, y, z direction for a given block
             Returns a dictionary containing the min/max data
+            
+            The cached multi-block bounds are used if available.
         """
         
+        if self._geometry is not None:
+            xMin, xMax, yMin, yMax, zMin, zMax = self._geometry.bounds()[self._id].tolist()
+            
+            return {
+                    "x-min" : xMin,
+                    "x-max" : xMax,
+                    "y-min" : yMin,
+                    "y-max" : yMax,
+                    "z-min" : zMin,
+                    "z-max" : zMax,
+                }
+        
         xCoord = []
         yCoord = []
         zCoord = []
         
-        for loc, blockVertex in self._vertexCoordinates.items():
+        for loc, blockVertex in self.vertexCoordinates.items():
             coord = blockVertex
             
             xCoord.append(coord[0])
@@ -424,8 +502,15 @@ class Block:
         """
             Calculates the gid spacing along x, y, z direction for a given block.
             Returns a tuple of the spacing along the x, y, z direction
+            
+            The cached multi-block cell counts are used if available.
         """
         
+        if self._geometry is not None:
+            nx, ny, nz = self._geometry.cell_count()[self._id].tolist()
+            
+            return nx, ny, nz
+        
         blockMinMax = self.minmax()
         nx, ny, nz = t.grid_spacing(
                 blockMinMax,
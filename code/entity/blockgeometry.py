@@ -0,0 +1,151 @@
+import numpy as np
+
+from typing import (
+    Dict,
+    TypeVar,
+)
+
+from entity.vertexstore import VertexStore
+
+
+BlockGeometryT = TypeVar("BlockGeometryT", bound = "BlockGeometry")
+
+class BlockGeometry:
+    """
+    Cached bounds and cell counts of all blocks of a multi-block.
+    
+    The quantities are computed in one vectorized pass from the vertex
+    coordinate store and the hex connectivity. On the next request only
+    the blocks containing a vertex modified in the meantime (by any
+    vertex, edge, face or block edit) are recomputed.
+    
+    Every block gets the cell counts of the last block of the lattice,
+    as created (before the edits). This is the count written in
+    blockMeshDict (see 'cell_count').
+    """
+    
+    def __init__(
+            self,
+            vertexStore: VertexStore,
+            hexConnectivity: np.ndarray,
+            multiBlockIndices: np.ndarray,
+            activeMask: np.ndarray,
+            gridSpacing: Dict,
+        ) -> None:
+        """
+        Initialize BlockGeometry instance
+        
+        Args:
+            vertexStore (VertexStore): Coordinate store of the multi-block
+            hexConnectivity (np.ndarray): (nBlocks, 8) array of the vertex ids of the blocks
+            multiBlockIndices (np.ndarray): (nBlocks, 3) array of the (x, y, z) multi-block indices
+            activeMask (np.ndarray): Activity mask of the blocks (indexed by block id)
+            gridSpacing (Dict): Grid spacing along x, y, z directions
+        """
+        
+        self._vertexStore = vertexStore
+        self._hexConnectivity = hexConnectivity
+        self._multiBlockIndices = multiBlockIndices
+        self._activeMask = activeMask
+        self._spacing = np.array(
+                [gridSpacing["x"], gridSpacing["y"], gridSpacing["z"]],
+                dtype = np.float64
+            )
+        
+        self._bounds = None
+        self._cellCount = None
+        
+        ### Cell counts of the last block, as created (at least 1 cell)
+        lastBlockBounds = self._compute_bounds(np.array([self._hexConnectivity.shape[0] - 1]))[0]
+        self._latticeCellCount = np.maximum(
+                ((lastBlockBounds[1::2] - lastBlockBounds[0::2]) / self._spacing).astype(np.int64),
+                1
+            )
+    
+    def __repr__(self):
+        return f"BlockGeometry : {self._hexConnectivity.shape[0]} blocks"
+    
+    def invalidate(self) -> None:
+        """ Drop the cached values, everything is recomputed on the next request """
+        
+        self._bounds = None
+        self._cellCount = None
+    
+    def _compute_bounds(
+            self,
+            blockIds: np.ndarray
+        ) -> np.ndarray:
+        """
+        Compute the min/max of the given blocks
+        
+        Args:
+            blockIds (np.ndarray): Ids of the blocks
+        
+        Returns:
+            np.ndarray: (len(blockIds), 6) array --> x-min, x-max, y-min, y-max, z-min, z-max
+        """
+        
+        ### (nBlocks, 8, 3)
+        blockCoordinates = self._vertexStore.coordinates[self._hexConnectivity[blockIds]]
+        
+        bounds = np.empty((len(blockIds), 6), dtype = np.float64)
+        bounds[:, 0::2] = blockCoordinates.min(axis = 1)
+        bounds[:, 1::2] = blockCoordinates.max(axis = 1)
+        
+        return bounds
+    
+    def bounds(self) -> np.ndarray:
+        """
+        Get the min/max of all blocks along x, y, z direction
+        
+        Returns:
+            np.ndarray: (nBlocks, 6) array --> x-min, x-max, y-min, y-max, z-min, z-max
+        """
+        
+        modifiedVertices = self._vertexStore.pop_modified()
+        
+        if self._bounds is None:
+            self._bounds = self._compute_bounds(np.arange(self._hexConnectivity.shape[0]))
+        
+        elif modifiedVertices.size > 0:
+            blockIds = np.flatnonzero(
+                    np.isin(self._hexConnectivity, modifiedVertices).any(axis = 1)
+                )
+            self._bounds[blockIds] = self._compute_bounds(blockIds)
+        
+        return self._bounds
+    
+    def seed_cell_count(
+            self,
+            cellCount: np.ndarray
+        ) -> None:
+        """
+        Set known (e.g. saved) cell counts of the current geometry, instead of computing them
+        
+        Args:
+            cellCount (np.ndarray): (nBlocks, 3) integer array --> nx, ny, nz
+        
+        Raises:
+            ValueError: If the shape of the cell counts doesn't match the blocks
+        """
+        
+        if cellCount.shape != (self._hexConnectivity.shape[0], 3):
+            raise ValueError("Shape of the cell counts must be (nBlocks, 3).")
+        
+        self._cellCount = np.asarray(cellCount, dtype = np.int64)
+        self._latticeCellCount = self._cellCount[-1].copy()
+    
+    def cell_count(self) -> np.ndarray:
+        """
+        Get the number of cells of all blocks along x, y, z direction.
+        The cell counts of the last block of the lattice (before the edits)
+        are used for all blocks.
+        
+        Returns:
+            np.ndarray: (nBlocks, 3) integer array --> nx, ny, nz
+        """
+        
+        if self._cellCount is None:
+            self._cellCount = np.tile(self._latticeCellCount, (self._hexConnectivity.shape[0], 1))
+        
+        return self._cellCount
@@ -0,0 +1,106 @@
+import numpy as np
+
+from typing import (
+    Tuple,
+    Union,
+)
+
+
+SelectionKeyType = Union[int, slice, Tuple[Union[int, slice], ...]]
+
+
+class BlockSelector:
+    """
+    Index-range selection of blocks in the dense block grid of a multi-block.
+    
+    The grid is indexed by the (x, y, z) multi-block indices, any NumPy basic
+    index (integers, slices, negative indices) selects the blocks in one step.
+    
+    Usage:
+        mb.select[2:5, :, 0]        --> ids of the blocks with x-index 2-4, any y-index, z-index 0
+        mb.select[:, -1]            --> ids of the blocks of the last ZX slice
+        mb.select["2:5, :, 0"]      --> same selection as a string (edit/input files)
+    """
+    
+    def __init__(
+            self,
+            blockGrid: np.ndarray
+        ) -> None:
+        """
+        Initialize BlockSelector instance
+        
+        Args:
+            blockGrid (np.ndarray): (nx, ny, nz) array of the block ids
+        """
+        
+        self._blockGrid = blockGrid
+    
+    def __repr__(self):
+        return f"BlockSelector : {self._blockGrid.shape} block grid"
+    
+    def __getitem__(
+            self,
+            key: Union[str, SelectionKeyType]
+        ) -> np.ndarray:
+        """
+        Get the ids of the selected blocks
+        
+        Args:
+            key (Union[str, SelectionKeyType]): Index/slice per axis (x, y, z) or its string form
+        
+        Raises:
+            ValueError: If the selection is invalid or outside of the block grid
+        
+        Returns:
+            np.ndarray: Sorted ids of the selected blocks
+        """
+        
+        if isinstance(key, str):
+            key = self.parse(key)
+        
+        if not isinstance(key, tuple):
+            key = (key,)
+        
+        if len(key) > 3 or not all(isinstance(x, (int, np.integer, slice)) for x in key):
+            raise ValueError(f"Block selection must be an index/slice per axis (x, y, z) --> {key!r}")
+        
+        try:
+            blockIds = self._blockGrid[key]
+        except IndexError as error:
+            raise ValueError(f"Block selection is outside of the multi-block {self._blockGrid.shape} --> {key!r}") from error
+        
+        return np.sort(np.ravel(blockIds))
+    
+    @staticmethod
+    def parse(
+            text: str
+        ) -> Tuple[Union[int, slice], ...]:
+        """
+        Parse the string form of a block selection, e.g. "2:5, :, 0" or "[2:5, :, 0]"
+        
+        Args:
+            text (str): Comma separated index/slice per axis (x, y, z)
+        
+        Raises:
+            ValueError: If the string is not a valid selection
+        
+        Returns:
+            Tuple[Union[int, slice], ...]: Index/slice per axis
+        """
+        
+        key = []
+        
+        for item in text.strip().removeprefix("[").removesuffix("]").split(","):
+            parts = [x.strip() for x in item.split(":")]
+            
+            try:
+                if len(parts) == 1:
+                    key.append(int(parts[0]))
+                elif len(parts) <= 3:
+                    key.append(slice(*[int(x) if x else None for x in parts]))
+                else:
+                    raise ValueError
+            except ValueError:
+                raise ValueError(f"Invalid block selection --> {text!r}") from None
+        
+        return tuple(key)
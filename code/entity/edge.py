@@ -1,7 +1,11 @@
+import numpy as np
+
 from collections import OrderedDict
 from typing import (
+    Callable,
     List, 
     Dict,
+    Optional,
     TypeVar
 )
 
@@ -23,6 +27,9 @@ EdgeT = TypeVar("EdgeT", bound = "Edge")
 class Edge:
     """ Attributes and methods associated with an edge """
     
+    ### Called with the edge before its type/definition changes (see 'EditJournal')
+    changeObserver: Optional[Callable[["Edge"], None]] = None
+    
     def __init__(
             self,
             id: int,
@@ -48,7 +55,6 @@ class Edge:
         self._position = position
         self._start = start
         self._end = end
-        self._center: PointType = t.center([start, end])
         self._type: EdgeType = ""
         self._feature: EdgeFeature
         self._editPoints: PointListType
@@ -61,7 +67,16 @@ class Edge:
     def __eq__(self, value):
         if not isinstance(value, Edge):
             return False
-        return self.start == value.start and self.end == value.end
+        return self.key == value.key
+    
+    def __hash__(self):
+        return hash(self.key)
+    
+    ### Edge -> key
+    @property
+    def key(self) -> tuple:
+        """ (start vertex id, end vertex id) pair identifying the edge in the multi-block """
+        return (self._start.id, self._end.id)
     
     ### Edge -> id
     @property
@@ -132,18 +147,21 @@ class Edge:
             raise TypeError("Value of 'Edge.end' must be an instance of 'Vertex' class.")
         self._end = value
     
-    ### Edge -> center
+    ### Edge -> vertexIds
     @property
-    def center(self) -> Vertex:
-        return self._center
+    def vertexIds(self) -> np.ndarray:
+        return np.array([self._start.id, self._end.id])
     
-    @center.setter
-    def center(self, value: PointType):
-        """ Check, raise error and assign value of Edge.center """
+    ### Edge -> center
+    @property
+    def center(self) -> PointType:
+        """ Midpoint of the edge, from the current vertex coordinates """
+        
+        store = self._start.store
+        if store is not None and store is self._end.store:
+            return tuple(store.centroids(self.vertexIds).tolist())
         
-        if not isinstance(value, PointType):
-            raise TypeError("Value of 'Edge.center' must be a PointType.")
-        self._center = value
+        return t.center([self._start, self._end])
     
     ### Edge -> type
     @property
@@ -156,6 +174,10 @@ class Edge:
         
         if not isinstance(value, str):
             raise TypeError("Value of 'Edge.type' must be a string.")
+        
+        if Edge.changeObserver is not None:
+            Edge.changeObserver(self)
+        
         self._type = value
     
     ### Edge -> editPoints
@@ -180,6 +202,9 @@ class Edge:
     def definition(self, value: str):
         """ Check, raise error and assign value of Edge.definition """
         
+        if Edge.changeObserver is not None:
+            Edge.changeObserver(self)
+        
         self._definition = value
     
     
@@ -262,16 +287,23 @@ class Edge:
             ratio (PointValueType): Ratio of the scaling operation
         """
         
+        store = self.start.store
+        if store is not None and store is self.end.store:
+            store.scale_about_centroids(self.vertexIds, ratio)
+            return self
+        
+        center = self.center
+        
         ### Edge start
         self.start.scale(
                 ratio,
-                self.center
+                center
             )
         
         ### Edge end
         self.end.scale(
                 ratio,
-                self.center
+                center
             )
         
         return self
@@ -310,30 +342,22 @@ class Edge:
         
         return
     
-    # def polyline(
-    #         self,
-    #         polylinePoints: tuple[tuple]
-    #     ) -> None:
-    #     """
-    #     Create definition of polyline for given points 
-
-    #     Args:
-    #         polylinePoints (tuple[tuple]): tuple of x, y, z coordinates for the point needed to define the polyline
+    def polyline(
+            self,
+            editInfo: Dict
+        ) -> None:
+        """
+        Create definition for a polyline through given points
 
-    #     Returns:
-    #         _type_: Definition of the edge polyline for the blockMeshDict
-    #     """
-        
-    #     for _p in polylinePoints:
-    #         t.check_coordinate(_p)
+        Args:
+            editInfo (Dict): Dictionary containing the task (making polyline) details.
+        """
         
-    #     polylineDef = (indent * 1) + f"polyline {self._start.id} {self._end.id} \n"
-    #     polylineDef += (indent * 1) + "(\n"
-    #     for _p in polylinePoints:
-    #         polylineDef += (indent * 2) + f"({_p[0]} {_p[1]} {_p[2]})\n"
-    #     polylineDef += (indent * 1) + ")\n"
+        self.type = "polyline"
+        self._feature = EdgeFeature(self.type, self)
+        self._feature.make_polyline(editInfo)
         
-    #     return polylineDef
+        return
     
     # def polySpline(self) -> None:
     #     """ Create definition of polySpline for given points """
@@ -1,3 +1,5 @@
+import numpy as np
+
 from collections import OrderedDict
 from typing import (
     List, 
@@ -9,7 +11,10 @@ from typing import (
 from entity.edge import Edge
 from entity.vertex import Vertex
 from utility.define import blockFaceName
-from utility.udtypes import PointValueType
+from utility.udtypes import (
+    PointType,
+    PointValueType,
+)
 from utility import tool as t
 from operation.action.aface import FaceAction
 
@@ -87,6 +92,22 @@ class Face:
         
         self._vertices = value
     
+    ### Face - vertexIds
+    @property
+    def vertexIds(self) -> np.ndarray:
+        return np.array([x.id for x in self._vertices])
+    
+    ### Face - center
+    @property
+    def center(self) -> PointType:
+        """ Centroid of the face vertices, from the current vertex coordinates """
+        
+        store = self._vertices[0].store
+        if store is not None and all(x.store is store for x in self._vertices):
+            return tuple(store.centroids(self.vertexIds).tolist())
+        
+        return t.center(self._vertices)
+    
     ### Face - edges
     @property
     def edges(self) -> Tuple[Edge]:
@@ -0,0 +1,62 @@
+from collections.abc import Mapping
+from numbers import Integral
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+)
+
+
+class LazyMap(Mapping):
+    """
+    Read-only mapping of the ids 0 ... N-1 to objects created on first access.
+    
+    Used for the vertices/blocks of a loaded multi-block, so that only the
+    objects actually used are created (the data stays in the arrays).
+    
+    Usage:
+        vertices = LazyMap(len(store), lambda x: Vertex.from_store(x, store))
+        vertices[12]            --> created on first access, then cached
+        len(vertices)           --> N, nothing is created
+    """
+    
+    def __init__(
+            self,
+            size: int,
+            factory: Callable[[int], Any]
+        ) -> None:
+        """
+        Initialize LazyMap instance
+        
+        Args:
+            size (int): Number of ids
+            factory (Callable[[int], Any]): Creates the object of an id
+        """
+        
+        self._size = size
+        self._factory = factory
+        self._objects: Dict[int, Any] = {}
+    
+    def __repr__(self):
+        return f"LazyMap : {len(self._objects)}/{self._size} objects created"
+    
+    def __getitem__(self, key: int) -> Any:
+        if key in self._objects:
+            return self._objects[key]
+        
+        if not isinstance(key, Integral) or not 0 <= key < self._size:
+            raise KeyError(key)
+        
+        self._objects[key] = self._factory(key)
+        
+        return self._objects[key]
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._size))
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, Integral) and 0 <= key < self._size
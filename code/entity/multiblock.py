@@ -1,25 +1,39 @@
 
 import math
+import json
+import heapq
+import itertools
 import numpy as np
 
-from collections import OrderedDict, defaultdict
-from typing import List, Dict, TypeVar
+from collections import OrderedDict
+from typing import List, Dict, Optional, Sequence, TypeVar, Union
 
 from entity.block import Block
+from entity.blockgeometry import BlockGeometry
+from entity.blockselector import BlockSelector
+from entity.edge import Edge
 from entity.face import Face
+from entity.lazymap import LazyMap
 from entity.slice import Slice
 from entity.vertex import Vertex
+from entity.vertexstore import VertexStore
 from operation.action.amblock import MultiBlockAction
 from utility.define import (
     indent,
     VSEP,
+    blockEdgeDefinition,
     quadrantEdgeRule,
     slicePlaneAxisIndex,
 )
-from utility.udtypes import PointValueType
+from utility.udtypes import PointType, PointValueType
 from utility import tool as t
 
 
+### Increase when the content/layout of the saved file changes
+saveFormatVersion = 3
+
+MultiBlockT = TypeVar("MultiBlockT", bound = "MultiBlock")
+
 class MultiBlock:
     """ Class to contain all attributes and generate the desired blockMeshDict """
     
@@ -37,13 +51,16 @@ class MultiBlock:
             boundingBox (dict): Bounding box of the multi-block mesh region
             splitPlanes (list): Planes at which the bounding box will be split
             gridSpacing (dict): Grid spacing for the blocks
-            hex2exclude {list}: Ids of the block/hex to exclude in the dictionary to modify the multi-block mesh region
+            hex2exclude {list}: Ids of the block/hex to exclude in the dictionary to modify the multi-block mesh region.
+                An entry can also be a dictionary of inclusive multi-block index ranges, 
+                e.g. {"x" : [None, 2], "z" : [5, None]} --> all blocks with ix <= 2 and iz >= 5
         """
         self._boundingBox = boundingBox
         self._splitPlanes = splitPlanes
         self._gridSpacing = gridSpacing
         self._hex2exclude = hex2exclude
         self._blockGrid = None
+        self._select = None
                 
         self._dx = self._gridSpacing["x"]
         self._dy = self._gridSpacing["y"]
@@ -57,7 +74,17 @@ class MultiBlock:
         self.blocks = OrderedDict()
         self.slices = OrderedDict()
         
-        self.edges = []
+        self.vertexStore = None
+        self.hexConnectivity = None
+        self.multiBlockIndices = None
+        self.activeMask = None
+        self.geometry = None
+        
+        self.edgeRegistry = {}
+        self.boundaryDefinition = []
+        
+        ### (sorting key, edge) of the registered edges, in block order (see 'MultiBlock.get_edges')
+        self._orderedEdges = []
         
         self._action = MultiBlockAction(self)
     
@@ -119,7 +146,7 @@ class MultiBlock:
         return self._hex2exclude
     
     @hex2exclude.setter
-    def hex2exclude(self, value: List[Block]):
+    def hex2exclude(self, value: List[Union[int, Dict]]):
         """ Check, raise error and assign value of MultiBlock.hex2exclude """
         
         if not isinstance(value, list):
@@ -129,17 +156,25 @@ class MultiBlock:
     
     ### MultiBlock - blockGrid
     @property
-    def blockGrid(self):
+    def blockGrid(self) -> np.ndarray:
         return self._blockGrid
     
     @blockGrid.setter
-    def blockGrid(self, value: Dict):
+    def blockGrid(self, value: np.ndarray):
         """ Check, raise error and assign value of MultiBlock.blockGrid """
         
-        if not isinstance(value, dict):
-            raise ValueError("Value of 'MultiBlock.blockGrid' must be a dictionary.")
+        if not isinstance(value, np.ndarray) or value.ndim != 3:
+            raise ValueError("Value of 'MultiBlock.blockGrid' must be a (nx, ny, nz) array of block ids.")
         
         self._blockGrid = value
+        self._select = BlockSelector(value)
+    
+    ### MultiBlock - select
+    @property
+    def select(self) -> BlockSelector:
+        """ Block ids of an index-range selection of the block grid, e.g. mb.select[2:5, :, 0] """
+        
+        return self._select
     
     def split_locations(self) -> None:
         """
@@ -208,158 +243,6 @@ class MultiBlock:
         print(str2print)
     
     
-    def _define_block_point_order(
-            self,
-            zBack: int, 
-            zFront: int,
-            yBottom: int,
-            yTop: int,
-            ix: int
-        ) -> tuple:
-        """
-        Define and arrange vertices needed to define a block.
-
-        Args:
-            zBack (int): z-index associated with the back face
-            zFront (int): z-index associated with the front face
-            yBottom (int): y-index associated with the bottom face
-            yTop (int): y-index associated with the yop face
-            ix (int): Index /vertex id
-
-        Returns:
-            tuple: of 8 instances of the Vertex class defining 
-                the block ordered according to blockMesh convention
-        """
-        
-        pointBackBottomLeft = self.vertexGroupDict[zBack][yBottom][ix]
-        pointBackBottomRight = self.vertexGroupDict[zBack][yBottom][ix + 1]
-        
-        pointBackTopRight = self.vertexGroupDict[zBack][yTop][ix + 1]
-        pointBackTopLeft = self.vertexGroupDict[zBack][yTop][ix]
-        
-        pointFrontBottomLeft = self.vertexGroupDict[zFront][yBottom][ix]
-        pointFrontBottomRight = self.vertexGroupDict[zFront][yBottom][ix + 1]
-        
-        pointFrontTopRight = self.vertexGroupDict[zFront][yTop][ix + 1]
-        pointFrontTopLeft = self.vertexGroupDict[zFront][yTop][ix]
-        
-        return (
-                pointBackBottomLeft,
-                pointBackBottomRight,
-                pointBackTopRight,
-                pointBackTopLeft,
-                pointFrontBottomLeft,
-                pointFrontBottomRight,
-                pointFrontTopRight,
-                pointFrontTopLeft
-            )
-    
-    def _define_face(
-            self,
-            index: int,
-            pointBackBottomLeft: Vertex,
-            pointBackBottomRight: Vertex,
-            pointBackTopRight: Vertex,
-            pointBackTopLeft: Vertex,
-            pointFrontBottomLeft: Vertex,
-            pointFrontBottomRight: Vertex,
-            pointFrontTopRight: Vertex,
-            pointFrontTopLeft: Vertex
-        ) -> Dict:
-        """
-        Define block faces for a given block id.
-
-        Args:
-            index (int): Id of the block to which these faces belong
-            pointBackBottomLeft (Vertex): point position, back-bottom-left
-            pointBackBottomRight (Vertex): point position,  back-bottom-right
-            pointBackTopRight (Vertex): point position, back-top-right
-            pointBackTopLeft (Vertex): point position, back-yop-left
-            pointFrontBottomLeft (Vertex): point position, front-bottom-left
-            pointFrontBottomRight (Vertex): point position, front-bottom-right
-            pointFrontTopRight (Vertex): point position, front-top-right
-            pointFrontTopLeft (Vertex): point position, front-top-left
-
-        Returns:
-            Dict: of 6 instances of the Face class which defines the 
-                given block
-        """
-        
-        faces = {}
-        
-        faceName =   "front"          
-        faces[faceName] = Face(
-                            index,
-                            faceName,
-                            [
-                                pointFrontBottomLeft,
-                                pointFrontTopLeft,
-                                pointFrontTopRight,
-                                pointFrontBottomRight,
-                            ]
-                        )
-        
-        faceName =   "back"          
-        faces[faceName] = Face(
-                            index,
-                            faceName,
-                            [
-                                pointBackBottomLeft,
-                                pointBackBottomRight,
-                                pointBackTopRight,
-                                pointBackTopLeft,
-                            ]
-                        )
-        
-        faceName =   "left"          
-        faces[faceName] = Face(
-                            index,
-                            faceName,
-                            [
-                                pointBackBottomLeft,
-                                pointBackTopLeft,
-                                pointFrontTopLeft,
-                                pointFrontBottomLeft,
-                            ]
-                        )
-        
-        faceName =   "right"          
-        faces[faceName] = Face(
-                            index,
-                            faceName,
-                            [
-                                pointFrontBottomRight,
-                                pointFrontTopRight,
-                                pointBackTopRight,
-                                pointBackBottomRight,
-                            ]
-                        )
-        
-        faceName =   "bottom"          
-        faces[faceName] = Face(
-                            index,
-                            faceName,
-                            [
-                                pointBackBottomLeft,
-                                pointFrontBottomLeft,
-                                pointFrontBottomRight,
-                                pointBackBottomRight,
-                            ]
-                        )
-        
-        faceName =   "top"          
-        faces[faceName] = Face(
-                            index,
-                            faceName,
-                            [
-                                pointBackTopLeft,
-                                pointBackTopRight,
-                                pointFrontTopRight,
-                                pointFrontTopLeft,
-                            ]
-                        )
-        return faces
-    
     def _define_block(
             self,
             hexCount: int,
@@ -367,7 +250,7 @@ class MultiBlock:
             isActive: bool,
             blockVertices: tuple,
             blockVertexCoordinates: Dict
-        ) -> None:
+        ) -> Block:
         """
         Define block for a given block id.
 
@@ -376,7 +259,7 @@ class MultiBlock:
             blockIndex (str): A string representing the x, y, z position of the block in the multi-block
             isActive (bool): block status. Included/active is True, excluded/inactive is False
             blockVertices (tuple): Tuple of 8 instances of the Vertex class
-            blockVertexCoordinates (Dict): Coordinates of the vertex defining the block
+            blockVertexCoordinates (Dict): Coordinates of the vertex defining the block. None to use the current vertex coordinates.
         """
         
         grading = {
@@ -385,111 +268,321 @@ class MultiBlock:
             "z" : 1,
         }
         
-        faces = self._define_face(
-                hexCount,
-                *blockVertices
+        ### Faces and edges are created on first access
+        return Block(
+                    hexCount,
+                    blockIndex,
+                    isActive,
+                    blockVertices,
+                    blockVertexCoordinates,
+                    None,
+                    self._gridSpacing,
+                    grading,
+                    self.edgeRegistry,
+                    self.activeMask,
+                    self.geometry
+                )
+    
+    def _load_block(
+            self,
+            blockId: int
+        ) -> Block:
+        """ Create a block of a loaded multi-block from the arrays (see 'MultiBlock.load') """
+        
+        ix, iy, iz = self.multiBlockIndices[blockId].tolist()
+        
+        iblock = self._define_block(
+                blockId,
+                "x-" + str(ix) + "_y-" + str(iy) + "_z-" + str(iz),
+                bool(self.activeMask[blockId]),
+                tuple(self.vertices[v] for v in self.hexConnectivity[blockId].tolist()),
+                None
             )
+        iblock.multiBlockIndex = (ix, iy, iz)
         
-        self.blocks[hexCount] = Block(
-                                        hexCount,
-                                        blockIndex,
-                                        isActive,
-                                        blockVertices,
-                                        blockVertexCoordinates,
-                                        faces,
-                                        self._gridSpacing,
-                                        grading
-                                    )
-        self.blocks[hexCount].get_edges()
+        return iblock
     
     def create_vertex_group(self):
-        """ Calculated vertex location, create groups/dicts """
-        
-        vertexCount = 0
+        """ Calculated vertex location, create the vertex store and the vertices """
+        
+        ### All lattice coordinates are built at once,
+        ### the vertices are views into the store
+        self.vertexStore = VertexStore.lattice(
+                self.xVertices,
+                self.yVertices,
+                self.zVertices
+            )
         
-        self.zSplitIndex = []
-        self.ySplitIndex = []
-        self.xSplitIndex = []
+        self.vertices = OrderedDict(
+                (vertexId, Vertex.from_store(vertexId, self.vertexStore))
+                for vertexId in range(len(self.vertexStore))
+            )
+    
+    
+    def exclusion_range_mask(
+            self,
+            exclusionRange: Dict
+        ) -> np.ndarray:
+        """
+        Get the blocks within a range of multi-block indices
+
+        Args:
+            exclusionRange (Dict): Inclusive [min, max] multi-block index range per axis ("x", "y", "z").
+                None (null) for an open end, missing axis for the entire axis.
+
+        Raises:
+            ValueError: If the range definition is invalid
+
+        Returns:
+            np.ndarray: Boolean array (indexed by block id), True for the blocks in the range
+        """
         
-        self.vertexGroupDict = OrderedDict()
+        mask = np.ones(self.nBlock["total"], dtype = bool)
         
-        for k in range(self.nBlock["z"] + 1):
-            zIndex = "z_" + str(k)
-            self.zSplitIndex.append(zIndex)
-            self.vertexGroupDict[zIndex] = OrderedDict()
+        for axisName, indexRange in exclusionRange.items():
+            if axisName not in ["x", "y", "z"] or len(indexRange) != 2:
+                raise ValueError(f"Invalid 'hex2exclude' range definition --> {exclusionRange}")
             
-            for j in range(self.nBlock["y"] + 1):
-                yIndex = "y_" + str(j)
-                self.ySplitIndex.append(yIndex)
-                self.vertexGroupDict[zIndex][yIndex] = {}
-                
-                for i in range(self.nBlock["x"] + 1):
-                    self.vertices[vertexCount] = Vertex(
-                                                        vertexCount,
-                                                        self.xVertices[i],
-                                                        self.yVertices[j],
-                                                        self.zVertices[k]
-                                                    )
-                    self.xSplitIndex.append(self.xVertices[i])
-                    self.vertexGroupDict[zIndex][yIndex][i] = self.vertices[vertexCount]
-                    vertexCount += 1
+            indexMin, indexMax = indexRange
+            axisIndices = self.multiBlockIndices[:, t.get_axis_index(axisName)]
+            
+            if indexMin is not None:
+                mask &= axisIndices >= indexMin
+            if indexMax is not None:
+                mask &= axisIndices <= indexMax
+        
+        return mask
     
+    def activity_mask(self) -> np.ndarray:
+        """
+        Create the activity mask of the blocks from hex2exclude.
+        Block ids, multi-block index ranges and block selections
+        (e.g. "2:5, :, 0", see MultiBlock.select) are applied in one step each.
+
+        Raises:
+            ValueError: If an excluded block id is not in the multi-block
+
+        Returns:
+            np.ndarray: Boolean array (indexed by block id), True for included/active blocks
+        """
+        
+        activeMask = np.ones(self.nBlock["total"], dtype = bool)
+        
+        blockIds = np.array(
+                [x for x in self._hex2exclude if not isinstance(x, (dict, str))],
+                dtype = np.int64
+            )
+        
+        if np.any((blockIds < 0) | (blockIds >= self.nBlock["total"])):
+            raise ValueError("Block id(s) in 'hex2exclude' are outside of the multi-block.")
+        
+        activeMask[blockIds] = False
+        
+        for exclusionRange in [x for x in self._hex2exclude if isinstance(x, dict)]:
+            activeMask &= ~self.exclusion_range_mask(exclusionRange)
+        
+        for selection in [x for x in self._hex2exclude if isinstance(x, str)]:
+            activeMask[self.select[selection]] = False
+        
+        return activeMask
     
     def create_blocks(self):
         """ Creates a dictionary to contain all the block/hex definitions """
         
-        blockVertexCoordinates = {}
-        hexCount = 0
-        xCount = 0
+        self.hexConnectivity, self.multiBlockIndices = t.lattice_hex_connectivity(
+                self.nBlock["x"],
+                self.nBlock["y"],
+                self.nBlock["z"]
+            )
         
-        for iz in range(self.nBlock["z"]):
-            zBack = self.zSplitIndex[iz]
-            zFront = self.zSplitIndex[iz + 1]
-            
-            for iy in range(self.nBlock["y"]):
-                yBottom = self.ySplitIndex[iy]
-                yTop = self.ySplitIndex[iy + 1]
-                
-                for ix in range(self.nBlock["x"]):
-                    if hexCount in self._hex2exclude:
-                        isActive = False
-                    else:
-                        isActive = True
-                    blockVertices = self._define_block_point_order(
-                                            zBack, 
-                                            zFront,
-                                            yBottom,
-                                            yTop,
-                                            ix
-                                        )
-                    blockIndex = "x-" + str(ix) + "_y-" + str(iy) + "_z-" + str(iz)
-                    
-                    for iv, blockVertex in enumerate(blockVertices):
-                        blockVertexCoordinates[iv] = blockVertex.coordinates()
-                    
-                    self._define_block(
-                            hexCount,
-                            blockIndex,
-                            isActive,
-                            blockVertices,
-                            blockVertexCoordinates
-                        )
-                    
-                    hexCount += 1
-                    xCount +=1
+        self.create_multiblock_grid()
+        self.activeMask = self.activity_mask()
+        
+        ### Bounds and cell counts of all blocks, computed on demand
+        self.geometry = BlockGeometry(
+                self.vertexStore,
+                self.hexConnectivity,
+                self.multiBlockIndices,
+                self.activeMask,
+                self._gridSpacing
+            )
+        
+        vertices = self.vertices
         
+        for hexCount, (vertexIds, (ix, iy, iz), isActive) in enumerate(zip(
+                self.hexConnectivity.tolist(),
+                self.multiBlockIndices.tolist(),
+                self.activeMask.tolist()
+            )):
+            blockVertices = tuple(vertices[v] for v in vertexIds)
+            blockIndex = "x-" + str(ix) + "_y-" + str(iy) + "_z-" + str(iz)
+            
+            self.blocks[hexCount] = self._define_block(
+                    hexCount,
+                    blockIndex,
+                    isActive,
+                    blockVertices,
+                    None
+                )
         
         return self.blocks
     
-    def get_edges(self) -> None:
-        """  """
+    def vertex_blocks(
+            self,
+            vertexId: int
+        ) -> set:
+        """
+        Get the ids of the blocks sharing a given lattice vertex
+
+        Args:
+            vertexId (int): Id of the vertex
+
+        Returns:
+            set: Ids of the (up to 8) blocks containing the vertex
+        """
+        
+        nxVertex = self.nBlock["x"] + 1
+        nyVertex = self.nBlock["y"] + 1
+        
+        ix = vertexId % nxVertex
+        iy = (vertexId // nxVertex) % nyVertex
+        iz = vertexId // (nxVertex * nyVertex)
+        
+        return {
+                bx + self.nBlock["x"] * (by + self.nBlock["y"] * bz)
+                for bz in (iz - 1, iz) if 0 <= bz < self.nBlock["z"]
+                for by in (iy - 1, iy) if 0 <= by < self.nBlock["y"]
+                for bx in (ix - 1, ix) if 0 <= bx < self.nBlock["x"]
+            }
+    
+    def _edge_order(
+            self,
+            edge: Edge
+        ) -> tuple:
+        """
+        Sorting key of an edge --> (block id, edge position) of the
+        first block containing the edge. Independent of the order in
+        which the edges were created.
+        """
+        
+        blockId = min(self.vertex_blocks(edge.start.id) & self.vertex_blocks(edge.end.id))
+        blockVertexIds = self.hexConnectivity[blockId].tolist()
+        edgeVertexPosition = (
+                blockVertexIds.index(edge.start.id),
+                blockVertexIds.index(edge.end.id)
+            )
         
-        for blockId, iblock in self.blocks.items():
-            for iedge in iblock.edges:
-                if iedge not in self.edges:
-                    self.edges.append(iedge)
+        for edgeId, (direction, position, startIndex, endIndex) in enumerate(blockEdgeDefinition):
+            if (startIndex, endIndex) == edgeVertexPosition:
+                break
         
+        return (blockId, edgeId)
     
+    def get_edges(self) -> List[Edge]:
+        """
+        Collect the edges of the multi-block.
+        Edges are created on first access of Block.edges, so only
+        the edges of the blocks touched by an edit are registered.
+        Shared edges are resolved to one Edge object through the
+        edge registry.
+        
+        The ordered edges are kept between calls. Edges are only added to
+        the registry (in insertion order), so only the edges registered
+        since the previous call are sorted and merged in.
+        
+        Returns:
+            List[Edge]: Registered edges, in block order
+        """
+        
+        orderedCount = len(self._orderedEdges)
+        
+        if len(self.edgeRegistry) < orderedCount:
+            ### Registry replaced/cleared --> ordered again
+            self._orderedEdges = []
+            orderedCount = 0
+        
+        if len(self.edgeRegistry) > orderedCount:
+            newEdges = sorted(
+                    ((self._edge_order(x), x) for x in itertools.islice(self.edgeRegistry.values(), orderedCount, None)),
+                    key = lambda x: x[0]
+                )
+            self._orderedEdges = list(heapq.merge(self._orderedEdges, newEdges, key = lambda x: x[0]))
+        
+        return [x[1] for x in self._orderedEdges]
+    
+    ### MultiBlock - edges
+    @property
+    def edges(self) -> List[Edge]:
+        return self.get_edges()
+    
+    def get_edge(
+            self,
+            startId: int,
+            endId: int
+        ) -> Edge:
+        """
+        Get the edge between two vertices of the multi-block.
+        The edges of the first block containing the edge are
+        created if needed.
+        
+        Args:
+            startId (int): Id of the start vertex
+            endId (int): Id of the end vertex
+        
+        Raises:
+            ValueError: If the vertices don't define an edge of the multi-block
+        
+        Returns:
+            Edge: Edge object from the edge registry
+        """
+        
+        if (startId, endId) not in self.edgeRegistry:
+            blockIds = self.vertex_blocks(startId) & self.vertex_blocks(endId)
+        
+            if len(blockIds) > 0:
+                self.blocks[min(blockIds)].edges
+        
+        if (startId, endId) not in self.edgeRegistry:
+            raise ValueError(f"Vertices ({startId}, {endId}) don't define an edge of the multi-block.")
+        
+        return self.edgeRegistry[(startId, endId)]
+    
+    def edge_centers(
+            self,
+            edges: Sequence[Edge]
+        ) -> np.ndarray:
+        """
+        Get the midpoints of edges from the current vertex coordinates
+        
+        Args:
+            edges (Sequence[Edge]): Edges of the multi-block
+        
+        Returns:
+            np.ndarray: (M, 3) coordinates of the edge midpoints
+        """
+        
+        vertexIds = np.array([edge.key for edge in edges], dtype = np.int64).reshape(-1, 2)
+        
+        return self.vertexStore.centroids(vertexIds)
+    
+    def face_centers(
+            self,
+            faces: Sequence[Face]
+        ) -> np.ndarray:
+        """
+        Get the centroids of faces from the current vertex coordinates
+        
+        Args:
+            faces (Sequence[Face]): Faces of the blocks of the multi-block
+        
+        Returns:
+            np.ndarray: (M, 3) coordinates of the face centroids
+        """
+        
+        vertexIds = np.array([[x.id for x in face.vertices] for face in faces], dtype = np.int64).reshape(-1, 4)
+        
+        return self.vertexStore.centroids(vertexIds)
+        
     def get_slices(self) -> None:
         """
         Blocks are stacked in the following manner :
@@ -565,33 +658,22 @@ class MultiBlock:
     def assign_multiblock_index_to_block(self) -> None:
         """ Assign (x, y, z) index to blocks in the multi-block grid """
         
-        xIndexCount = 0
-        yIndexCount = 0
-        zIndexCount = 0
-        
-        for i in range(len(self.blocks)):
-            self.blocks[i].multiBlockIndex = (xIndexCount, yIndexCount, zIndexCount)
-            xIndexCount += 1
-            if (i + 1) % (self.nBlock["x"]) == 0:
-                xIndexCount = 0
-                yIndexCount += 1
-                if (i + 1) % (self.nBlock["x"] * self.nBlock["y"]) == 0:
-                    yIndexCount = 0
-                    zIndexCount += 1
+        for blockId, blockIndex in enumerate(self.multiBlockIndices.tolist()):
+            self.blocks[blockId].multiBlockIndex = tuple(blockIndex)
     
     def create_multiblock_grid(
             self
         ) -> None:
-        """ Create block-grid for MultiBlock object """
+        """ Create block-grid (block ids indexed by the multi-block index) for MultiBlock object """
+        
+        ### Dense (nx, ny, nz) grid of the block ids
+        blockGrid = np.empty(
+                (self.nBlock["x"], self.nBlock["y"], self.nBlock["z"]),
+                dtype = np.int64
+            )
         
-        ### defining a 3-level empty nested dictionary
-        ### for initializing empty grid
-        blockGrid = defaultdict(lambda: defaultdict(dict))
+        blockGrid[tuple(self.multiBlockIndices.T)] = np.arange(self.nBlock["total"])
         
-        for blockId, iblock in self.blocks.items():
-            ix, iy, iz = iblock.multiBlockIndex
-            blockGrid[ix][iy][iz] = iblock
-            
         self.blockGrid = blockGrid
     
     def make(self) -> None:
@@ -601,19 +683,215 @@ class MultiBlock:
         self.block_count()
         self.create_vertex_group()
         self.create_blocks()
-        self.get_edges()
         self.get_slices()
         self.assign_multiblock_index_to_block()
-        self.create_multiblock_grid()
+    
+    def save(
+            self,
+            path: str
+        ) -> None:
+        """
+        Save the multi-block (after the edits are applied) in a binary (uncompressed .npz) file.
+        
+        The file contains the user inputs, vertex coordinates and merges, hex connectivity,
+        activity mask, multi-block indices, cell counts and grading of the blocks,
+        the curved edge definitions and the boundary definitions.
+        
+        Args:
+            path (str): Path of the file
+        """
+        
+        inputs = {
+                "boundingBox" : self._boundingBox,
+                "splitPlanes" : self._splitPlanes,
+                "gridSpacing" : self._gridSpacing,
+                "hex2exclude" : self._hex2exclude,
+            }
+        
+        curvedEdges = [x for x in self.edges if x.type in ["arc", "spline", "polyline"]]
+        
+        grading = np.array(
+                [[x.grading["x"], x.grading["y"], x.grading["z"]] for x in self.blocks.values()],
+                dtype = np.float64
+            )
+        
+        with open(path, "wb") as sf:
+            np.savez(
+                    sf,
+                    version = np.array(saveFormatVersion),
+                    inputs = np.array(json.dumps(inputs)),
+                    coordinates = self.vertexStore.coordinates,
+                    integerMask = self.vertexStore.integerMask,
+                    vertexParent = self.vertexStore.parent,
+                    hexConnectivity = self.hexConnectivity,
+                    multiBlockIndices = self.multiBlockIndices,
+                    activeMask = self.activeMask,
+                    cellCount = self.geometry.cell_count(),
+                    grading = grading,
+                    edgeKey = np.array([x.key for x in curvedEdges], dtype = np.int64).reshape(-1, 2),
+                    edgeType = np.array([x.type for x in curvedEdges], dtype = str),
+                    edgeDefinition = np.array([x.definition for x in curvedEdges], dtype = str),
+                    boundaryDefinition = np.array(self.boundaryDefinition, dtype = str),
+                )
+    
+    def restore(
+            self,
+            path: str
+        ) -> None:
+        """
+        Restore the state saved with 'MultiBlock.save' into this (made) multi-block
+        
+        Args:
+            path (str): Path of the file
+        
+        Raises:
+            ValueError: If the saved multi-block doesn't match this multi-block
+        """
+        
+        with np.load(path) as data:
+            self.check_saved_version(data, path)
+            
+            if not np.array_equal(data["hexConnectivity"], self.hexConnectivity):
+                raise ValueError(f"Saved multi-block doesn't match the multi-block --> {path}")
+            
+            self.vertexStore.coordinates = data["coordinates"]
+            self.vertexStore.integerMask = data["integerMask"]
+            self.vertexStore.parent = data["vertexParent"]
+            self.activeMask[:] = data["activeMask"]
+            self.geometry.seed_cell_count(data["cellCount"])
+            
+            self.restore_edit_state(data)
+    
+    @staticmethod
+    def check_saved_version(
+            data: np.lib.npyio.NpzFile,
+            path: str
+        ) -> None:
+        """ Check the format version of a file saved with 'MultiBlock.save' """
+        
+        if int(data["version"]) != saveFormatVersion:
+            raise ValueError(f"Unsupported multi-block file version --> {path}")
+    
+    def restore_edit_state(
+            self,
+            data: np.lib.npyio.NpzFile
+        ) -> None:
+        """
+        Restore the block grading, curved edges and boundaries saved with 'MultiBlock.save'
+        
+        Args:
+            data (np.lib.npyio.NpzFile): Content of the saved file
+        """
+        
+        ### Blocks are created with uniform grading
+        grading = data["grading"]
+        for blockId in np.flatnonzero((grading != 1).any(axis = 1)).tolist():
+            self.blocks[blockId].grading = dict(zip(["x", "y", "z"], grading[blockId].tolist()))
+        
+        for (startId, endId), edgeType, edgeDefinition in zip(
+                data["edgeKey"].tolist(),
+                data["edgeType"].tolist(),
+                data["edgeDefinition"].tolist()
+            ):
+            iedge = self.get_edge(startId, endId)
+            iedge.type = edgeType
+            iedge.definition = edgeDefinition
+        
+        self.boundaryDefinition = data["boundaryDefinition"].tolist()
+    
+    @classmethod
+    def load(
+            cls,
+            path: str
+        ) -> MultiBlockT:
+        """
+        Load a multi-block saved with 'MultiBlock.save'.
+        The edit file is not needed and the multi-block is not made again:
+        the vertex store, hex connectivity, multi-block indices and activity
+        mask use the arrays read from the file (not copied). The Vertex and
+        Block objects are created on first access (see 'LazyMap').
+        
+        Args:
+            path (str): Path of the file
+        
+        Raises:
+            ValueError: If the file version is not supported
+        
+        Returns:
+            MultiBlockT: Multi-block with the edits applied
+        """
+        
+        with np.load(path) as data:
+            cls.check_saved_version(data, path)
+            
+            inputs = json.loads(str(data["inputs"]))
+            mb = cls(
+                    inputs["boundingBox"],
+                    inputs["splitPlanes"],
+                    inputs["gridSpacing"],
+                    inputs["hex2exclude"]
+                )
+            
+            mb.split_locations()
+            mb.block_count()
+            
+            mb.vertexStore = VertexStore(
+                    data["coordinates"],
+                    data["vertexParent"],
+                    data["integerMask"]
+                )
+            mb.hexConnectivity = data["hexConnectivity"]
+            mb.multiBlockIndices = data["multiBlockIndices"]
+            mb.activeMask = data["activeMask"]
+            mb.create_multiblock_grid()
+            
+            mb.geometry = BlockGeometry(
+                    mb.vertexStore,
+                    mb.hexConnectivity,
+                    mb.multiBlockIndices,
+                    mb.activeMask,
+                    mb._gridSpacing
+                )
+            mb.geometry.seed_cell_count(data["cellCount"])
+            
+            vertexStore = mb.vertexStore
+            mb.vertices = LazyMap(
+                    len(vertexStore),
+                    lambda x: Vertex.from_store(x, vertexStore)
+                )
+            mb.blocks = LazyMap(
+                    mb.nBlock["total"],
+                    mb._load_block
+                )
+            mb.get_slices()
+            
+            mb.restore_edit_state(data)
+        
+        return mb
     
     def get_block_with_multiblock_index(
             self,
             multiblockIndex: tuple
         ) -> Block:
+        """
+        Get the block at a multi-block index
+
+        Args:
+            multiblockIndex (tuple): (x, y, z) multi-block index of the block
+
+        Raises:
+            ValueError: If the index is outside of the multi-block
+
+        Returns:
+            Block: Block at the index
+        """
         
         x, y, z = multiblockIndex
         
-        return self.blockGrid[x][y][z]
+        if not all(0 <= i < n for i, n in zip((x, y, z), self.blockGrid.shape)):
+            raise ValueError(f"Multi-block index is outside of the multi-block --> {multiblockIndex}")
+        
+        return self.blocks[int(self.blockGrid[x, y, z])]
     
     def slice_info(self) -> str:
         """ Generate slice information of the multi-block """
@@ -656,72 +934,48 @@ class MultiBlock:
         return sliceInfoStr
     
     
-    def scaleSliceBlocks (
+    def scale_blocks(
             self,
-            blocks2scale: List,
-            scalingPlane: str,
+            blockIds: List[int],
             ratio: float,
-            reference: tuple
+            scalingPlane: Optional[str] = None,
+            reference: Optional[PointType] = None
         ) -> None:
+        """
+        Scale a selection of blocks in a plane or in 3D.
+        The vertices shared by the blocks are scaled once, in one array operation.
+
+        Args:
+            blockIds (List[int]): Ids of the blocks to scale
+            ratio (float): Ratio of the scaling operation
+            scalingPlane (Optional[str], optional): Plane ("xy", "yz", "zx") of the scaling. Defaults to None (3D).
+            reference (Optional[PointType], optional): Center of the scaling. Defaults to None (centroid of the block vertices).
+
+        Raises:
+            ValueError: If the scaling plane is not recognized
+        """
         
-        vertices = []
-        
-        for iblock in blocks2scale:
-            vertices.extend(iblock.vertices)
+        axisMask = np.ones(3, dtype = bool)
         
-        vertices = list(set(vertices))
+        if scalingPlane is not None:
+            if scalingPlane not in slicePlaneAxisIndex:
+                raise ValueError(f"Scaling plane must be any of {list(slicePlaneAxisIndex)} --> {scalingPlane!r}")
+            
+            axisMask[:] = False
+            axisMask[list(slicePlaneAxisIndex[scalingPlane].values())] = True
         
-        xCoordinates = []
-        yCoordinates = []
-        zCoordinates = []
+        vertexIds = np.unique(self.hexConnectivity[np.asarray(blockIds, dtype = np.int64)])
+        coordinates = self.vertexStore.coordinates[vertexIds]
         
-        ### Unique coordinates
-        xCoordinates = list(set([i.coordinates()[0] for i in vertices]))
-        yCoordinates = list(set([i.coordinates()[1] for i in vertices]))
-        zCoordinates = list(set([i.coordinates()[2] for i in vertices]))
+        if reference is None:
+            center = coordinates.mean(axis = 0)
+        else:
+            center = np.asarray(reference, dtype = np.float64)
         
-        meanX = sum(xCoordinates)/len(xCoordinates)
-        meanY = sum(yCoordinates)/len(yCoordinates)
-        meanZ = sum(zCoordinates)/len(zCoordinates)
+        coordinates[:, axisMask] = center[axisMask] + (coordinates[:, axisMask] - center[axisMask]) * ratio
         
-        if scalingPlane == "xy":
-            xScaledValues = {}
-            yScaledValues = {}
-            for ix in xCoordinates:
-                xScaledValues[ix] = meanX + (ix - meanX) * ratio
-            for iy in yCoordinates:
-                yScaledValues[iy] = meanY + (iy - meanY) * ratio
-                
-            for ivertex in vertices:
-                ix, iy, iz = ivertex.coordinates()
-                ivertex.x = xScaledValues[ix]
-                ivertex.y = yScaledValues[iy]
-        
-        elif scalingPlane == "yz":
-            yScaledValues = {}
-            zScaledValues = {}
-            for iy in yCoordinates:
-                yScaledValues[iy] = meanY + (iy - meanY) * ratio
-            for iz in zCoordinates:
-                zScaledValues[iz] = meanZ + (iz - meanZ) * ratio
-                
-            for ivertex in vertices:
-                ix, iy, iz = ivertex.coordinates()
-                ivertex.y = yScaledValues[iy]
-                ivertex.z = zScaledValues[iz]
-        
-        elif scalingPlane == "zx":
-            zScaledValues = {}
-            xScaledValues = {}
-            for iz in zCoordinates:
-                zScaledValues[iz] = meanZ + (iz - meanZ) * ratio
-            for ix in xCoordinates:
-                xScaledValues[ix] = meanX + (ix - meanX) * ratio
-                
-            for ivertex in vertices:
-                ix, iy, iz = ivertex.coordinates()
-                ivertex.z = xScaledValues[iz]
-                ivertex.x = xScaledValues[ix]
+        self.vertexStore.coordinates[vertexIds] = coordinates
+        self.vertexStore.mark_modified(vertexIds)
     
     #---------------------------------------
     ### Quadrant Section - Start
@@ -824,6 +1078,137 @@ class MultiBlock:
                 radius,
             )
     
+    def check_circle_array(
+            self,
+            startingBlockIds: np.ndarray,
+            endingBlockIds: np.ndarray
+        ) -> np.ndarray:
+        """
+        Check the block selections of many circles at once. The blocks of a
+        circle must span 4 x 4 blocks in a slice plane and the circles must
+        not share vertices.
+
+        Args:
+            startingBlockIds (np.ndarray): Id of the starting block (diagonally left-bottom) of each circle
+            endingBlockIds (np.ndarray): Id of the ending block (diagonally top-right) of each circle
+
+        Raises:
+            ValueError: Listing all invalid circles
+
+        Returns:
+            np.ndarray: Slice plane of each circle
+        """
+        
+        startingBlockIds = np.asarray(startingBlockIds, dtype = np.int64)
+        endingBlockIds = np.asarray(endingBlockIds, dtype = np.int64)
+        
+        isInRange = (
+                (startingBlockIds >= 0) & (startingBlockIds < self.nBlock["total"])
+                & (endingBlockIds >= 0) & (endingBlockIds < self.nBlock["total"])
+            )
+        
+        if not isInRange.all():
+            raise ValueError(f"Block id(s) of circle(s) {np.flatnonzero(~isInRange).tolist()} are outside of the multi-block.")
+        
+        startingIndices = self.multiBlockIndices[startingBlockIds]
+        blockSpan = self.multiBlockIndices[endingBlockIds] - startingIndices
+        
+        ### Slice plane --> the (only) axis along which the starting and ending block indices are equal
+        isNormalAxis = blockSpan == 0
+        slicePlanes = np.array(["yz", "zx", "xy"])[isNormalAxis.argmax(axis = 1)]
+        isValid = (isNormalAxis.sum(axis = 1) == 1) & ((blockSpan == 3) | isNormalAxis).all(axis = 1)
+        
+        errors = [
+                f"circle {x} : blocks {startingBlockIds[x]} - {endingBlockIds[x]} must span 4 x 4 blocks in a slice plane"
+                for x in np.flatnonzero(~isValid).tolist()
+            ]
+        
+        ### Vertices of the 16 blocks of each (valid) circle
+        ### (explicit row length --> no valid circle gives an empty array instead of a reshape error)
+        validIds = np.flatnonzero(isValid)
+        blockOffsets = np.stack(np.meshgrid(*[np.arange(4)] * 3, indexing = "ij"), axis = -1).reshape(-1, 3)
+        blockIndices = startingIndices[validIds, np.newaxis, :] + blockOffsets * (blockSpan[validIds, np.newaxis, :] == 3)
+        vertexIds = np.sort(
+                self.hexConnectivity[self.blockGrid[tuple(np.moveaxis(blockIndices, -1, 0))]].reshape(len(validIds), len(blockOffsets) * 8),
+                axis = 1
+            )
+        
+        isFirst = np.ones(vertexIds.shape, dtype = bool)
+        isFirst[:, 1:] = vertexIds[:, 1:] != vertexIds[:, :-1]
+        isShared = np.bincount(vertexIds[isFirst], minlength = len(self.vertexStore)) > 1
+        
+        sharingIds = validIds[isShared[vertexIds].any(axis = 1)]
+        if sharingIds.size:
+            errors.append(f"circles {sharingIds.tolist()} share vertices, at least one block is needed between the circles")
+        
+        if errors:
+            raise ValueError("Invalid circle array --> " + "; ".join(errors))
+        
+        return slicePlanes
+    
+    def circle_pattern(
+            self,
+            startblockId: int,
+            endblockId: int,
+            pitch: List[int],
+            count: List[int]
+        ) -> tuple:
+        """
+        Get the block selections of a regular pattern of circles
+
+        Args:
+            startblockId (int): Id of the starting block (diagonally left-bottom) of the first circle
+            endblockId (int): Id of the ending block (diagonally top-right) of the first circle
+            pitch (List[int]): Distance (number of blocks) between the circles along x, y, z
+            count (List[int]): Number of circles along x, y, z
+
+        Raises:
+            ValueError: If the pattern is outside of the multi-block
+
+        Returns:
+            tuple: Starting block ids, ending block ids of the circles
+        """
+        
+        shifts = np.stack(np.meshgrid(*[np.arange(n) for n in count], indexing = "ij"), axis = -1).reshape(-1, 3) * pitch
+        
+        startingIndices = self.multiBlockIndices[startblockId] + shifts
+        endingIndices = self.multiBlockIndices[endblockId] + shifts
+        
+        gridShape = np.array(self.blockGrid.shape)
+        if ((startingIndices < 0) | (endingIndices < 0) | (startingIndices >= gridShape) | (endingIndices >= gridShape)).any():
+            raise ValueError(f"Circle pattern (pitch {pitch}, count {count}) is outside of the multi-block.")
+        
+        return self.blockGrid[tuple(startingIndices.T)], self.blockGrid[tuple(endingIndices.T)]
+    
+    def make_circle_array(
+            self,
+            startingBlockIds: np.ndarray,
+            endingBlockIds: np.ndarray,
+            radius: Union[float, np.ndarray]
+        ) -> None:
+        """
+        Make many circles at once, see 'check_circle_array' for the block selections
+
+        Args:
+            startingBlockIds (np.ndarray): Id of the starting block (diagonally left-bottom) of each circle
+            endingBlockIds (np.ndarray): Id of the ending block (diagonally top-right) of each circle
+            radius (Union[float, np.ndarray]): Radius of the circles, or of each circle
+
+        Raises:
+            ValueError: If the block selections are invalid
+        """
+        
+        slicePlanes = self.check_circle_array(
+                startingBlockIds,
+                endingBlockIds
+            )
+        
+        self._action.make_circle_array(
+                slicePlanes,
+                np.asarray(startingBlockIds, dtype = np.int64),
+                np.broadcast_to(np.asarray(radius, dtype = np.float64), slicePlanes.shape)
+            )
+    
     #---------------------------------------
     ### Quadrant Section - Start
     #---------------------------------------
@@ -21,7 +21,17 @@ from utility.udtypes import (
 VertexT = TypeVar("VertexT", bound = "Vertex")
 
 class Vertex(Point):
-    """ Attributes and methods associated with a vertex """
+    """
+    Attributes and methods associated with a vertex
+    
+    A vertex either holds its own coordinates, or is a view into
+    one row of a 'VertexStore' (see 'Vertex.from_store').
+    """
+    
+    __slots__ = ["_id", "_store", "_x", "_y", "_z"]
+    
+    ### The vertex actions are stateless, one instance is shared
+    _action = VertexAction()
     
     def __init__(
             self,
@@ -40,10 +50,37 @@ class Vertex(Point):
             z (float): Z-coordinate of the vertex
         """
         
+        self._store = None
         super().__init__(x, y, z)
         self._id = id
-        self._action = VertexAction()
+    
+    @classmethod
+    def from_store(
+            cls,
+            id: int,
+            store: "VertexStore"
+        ) -> VertexT:
+        """
+        Create a vertex as a view into a row of a vertex store
+
+        Args:
+            id (int): Id of the vertex, i.e. the row in the store
+            store (VertexStore): Coordinate store of the multi-block
+
+        Returns:
+            VertexT: Vertex reading/writing its coordinates from/to the store
+        """
         
+        vertex = cls.__new__(cls)
+        vertex._id = id
+        vertex._store = store
+        
+        return vertex
+    
+    ### Vertex -> store
+    @property
+    def store(self) -> Optional["VertexStore"]:
+        return self._store
         
     def __repr__(self):
         return f"v{self.id} ({self.x} {self.y} {self.z})"
@@ -65,7 +102,9 @@ class Vertex(Point):
     ### Vertex -> x
     @property
     def x(self) -> float:
-        return self._x
+        if self._store is None:
+            return self._x
+        return self._store.coordinate(self._id, 0)
     
     @x.setter
     def x(self, value: CoordinateValueType) -> None:
@@ -74,12 +113,17 @@ class Vertex(Point):
         if not isinstance(value, CoordinateValueType):
             raise ValueError("Value of 'Vertex.x' must be either an integer or a float.")
         
-        self._x = value
+        if self._store is None:
+            self._x = value
+        else:
+            self._store.set_coordinate(self._id, 0, value)
     
     ### Vertex -> y
     @property
     def y(self) -> float:
-        return self._y
+        if self._store is None:
+            return self._y
+        return self._store.coordinate(self._id, 1)
     
     @y.setter
     def y(self, value: CoordinateValueType) -> None:
@@ -88,13 +132,18 @@ class Vertex(Point):
         if not isinstance(value, CoordinateValueType):
             raise ValueError("Value of 'Vertex.y' must be either an integer or a float.")
         
-        self._y = value
+        if self._store is None:
+            self._y = value
+        else:
+            self._store.set_coordinate(self._id, 1, value)
             
     
     ### Vertex -> z
     @property
     def z(self) -> float:
-        return self._z
+        if self._store is None:
+            return self._z
+        return self._store.coordinate(self._id, 2)
     
     @z.setter
     def z(self, value: CoordinateValueType) -> None:
@@ -103,12 +152,17 @@ class Vertex(Point):
         if not isinstance(value, CoordinateValueType):
             raise ValueError("Value of 'Vertex.z' must be either an integer or a float.")
         
-        self._z = value
+        if self._store is None:
+            self._z = value
+        else:
+            self._store.set_coordinate(self._id, 2, value)
     
     def coordinates(self) -> VertexT:
         """ Returns a tuple of the vertex coordinate as (x, y, z) """
         
-        return (self.x, self.y, self.z)
+        if self._store is None:
+            return (self._x, self._y, self._z)
+        return tuple(self._store.coordinate(self._id, x) for x in range(3))
     
     def move(
             self,
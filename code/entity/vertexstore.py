@@ -0,0 +1,386 @@
+import numpy as np
+
+from typing import (
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from utility.udtypes import PointValueType
+
+
+VertexStoreT = TypeVar("VertexStoreT", bound = "VertexStore")
+
+class VertexStore:
+    """
+    Struct-of-arrays storage for the vertex coordinates of a multi-block.
+    
+    The coordinates are kept in a contiguous (N, 3) float64 array, where
+    the row index is the vertex id. Instances of the 'Vertex' class created
+    with 'Vertex.from_store' are lightweight views into one row.
+    
+    Modified vertices are tracked so that cached quantities (e.g. block
+    bounds) can be updated selectively. Code writing directly into the
+    coordinate array must call 'mark_modified' for the changed rows.
+    
+    The coordinates given as integers (e.g. bounding box "x-min" : 0) are
+    flagged in an integer mask and read back as integers, so they are
+    written in blockMeshDict as given ('0', not '0.0'). Rows written
+    through the coordinate array are floats, unless 'mark_modified' is
+    given their integer flags.
+    
+    Collapsed vertices are recorded as merges in a union-find structure
+    (parent array over the vertex ids), see 'VertexStore.merge' and
+    'VertexStore.compact_labels'.
+    """
+    
+    def __init__(
+            self,
+            coordinates: np.ndarray,
+            parent: Optional[np.ndarray] = None,
+            integerMask: Optional[np.ndarray] = None
+        ) -> None:
+        """
+        Initialize VertexStore instance.
+        A contiguous float64 coordinate array is used as is (not copied).
+        
+        Args:
+            coordinates (np.ndarray): Array of shape (N, 3) containing the x, y, z coordinates of the vertices
+            parent (Optional[np.ndarray], optional): Merge parent of the vertices (see 'VertexStore.merge'). Defaults to None (no merge).
+            integerMask (Optional[np.ndarray], optional): Array of shape (N, 3), True for the integer coordinates. Defaults to None (float coordinates).
+        """
+        
+        coordinates = np.ascontiguousarray(coordinates, dtype = np.float64)
+        
+        if coordinates.ndim != 2 or coordinates.shape[1] != 3:
+            raise ValueError("Value of 'VertexStore.coordinates' must be an array of shape (N, 3).")
+        
+        self._coordinates = coordinates
+        self._modified = np.zeros(coordinates.shape[0], dtype = bool)
+        self._parent = np.arange(coordinates.shape[0], dtype = np.int64)
+        self._integerMask = np.zeros(coordinates.shape, dtype = bool)
+        
+        if parent is not None:
+            self.parent = parent
+        
+        if integerMask is not None:
+            self.integerMask = integerMask
+    
+    def __len__(self) -> int:
+        return self._coordinates.shape[0]
+    
+    def __repr__(self):
+        return f"VertexStore : {len(self)} vertices"
+    
+    ### VertexStore -> coordinates
+    @property
+    def coordinates(self) -> np.ndarray:
+        return self._coordinates
+    
+    @coordinates.setter
+    def coordinates(self, value: np.ndarray) -> None:
+        """ Check, raise error and assign value of VertexStore.coordinates """
+        
+        if not isinstance(value, np.ndarray):
+            raise ValueError("Value of 'VertexStore.coordinates' must be a numpy array.")
+        
+        if value.shape != self._coordinates.shape:
+            raise ValueError("Shape of 'VertexStore.coordinates' can not be changed.")
+        
+        self._coordinates[:] = value
+        self._modified[:] = True
+        self._integerMask[:] = False
+    
+    ### VertexStore -> integerMask
+    @property
+    def integerMask(self) -> np.ndarray:
+        return self._integerMask
+    
+    @integerMask.setter
+    def integerMask(self, value: np.ndarray) -> None:
+        """ Check, raise error and assign value of VertexStore.integerMask """
+        
+        if not isinstance(value, np.ndarray) or value.shape != self._integerMask.shape:
+            raise ValueError("Value of 'VertexStore.integerMask' must be an array of shape (N, 3).")
+        
+        self._integerMask[:] = value
+    
+    def coordinate(
+            self,
+            vertexId: int,
+            axis: int
+        ) -> PointValueType:
+        """
+        Get a coordinate of a vertex, as an integer if it was given as an integer
+        
+        Args:
+            vertexId (int): Id of the vertex
+            axis (int): Axis of the coordinate (0 --> x, 1 --> y, 2 --> z)
+        
+        Returns:
+            PointValueType: Coordinate of the vertex
+        """
+        
+        value = self._coordinates.item(vertexId, axis)
+        
+        if self._integerMask.item(vertexId, axis):
+            return int(value)
+        
+        return value
+    
+    def set_coordinate(
+            self,
+            vertexId: int,
+            axis: int,
+            value: PointValueType
+        ) -> None:
+        """
+        Set a coordinate of a vertex and flag the vertex as modified
+        
+        Args:
+            vertexId (int): Id of the vertex
+            axis (int): Axis of the coordinate (0 --> x, 1 --> y, 2 --> z)
+            value (PointValueType): New coordinate of the vertex
+        """
+        
+        self._coordinates[vertexId, axis] = value
+        self._integerMask[vertexId, axis] = is_integer(value)
+        self._modified[vertexId] = True
+    
+    ### VertexStore -> parent
+    @property
+    def parent(self) -> np.ndarray:
+        return self._parent
+    
+    @parent.setter
+    def parent(self, value: np.ndarray) -> None:
+        """ Check, raise error and assign value of VertexStore.parent """
+        
+        if not isinstance(value, np.ndarray) or value.shape != self._parent.shape:
+            raise ValueError("Value of 'VertexStore.parent' must be an array of shape (N,).")
+        
+        if ((value < 0) | (value >= len(self))).any():
+            raise ValueError("Value of 'VertexStore.parent' must contain vertex ids.")
+        
+        self._parent[:] = value
+    
+    def find(
+            self,
+            vertexId: int
+        ) -> int:
+        """
+        Get the representative (root) vertex of the merge group of a vertex
+        
+        Args:
+            vertexId (int): Id of the vertex
+        
+        Returns:
+            int: Id of the representative vertex
+        """
+        
+        parent = self._parent
+        
+        ### Path halving
+        while parent[vertexId] != vertexId:
+            parent[vertexId] = parent[parent[vertexId]]
+            vertexId = parent[vertexId]
+        
+        return int(vertexId)
+    
+    def merge(
+            self,
+            vertexId: int,
+            targetId: int
+        ) -> None:
+        """
+        Merge the group of a (collapsed) vertex into the group of the target vertex
+        
+        Args:
+            vertexId (int): Id of the collapsed vertex
+            targetId (int): Id of the vertex collapsed to
+        """
+        
+        root = self.find(vertexId)
+        targetRoot = self.find(targetId)
+        
+        if root != targetRoot:
+            self._parent[root] = targetRoot
+    
+    def roots(self) -> np.ndarray:
+        """
+        Get the representative vertex of every vertex
+        
+        Returns:
+            np.ndarray: Id of the representative vertex, for each vertex id
+        """
+        
+        roots = self._parent
+        
+        ### Pointer jumping
+        while True:
+            nextRoots = roots[roots]
+            if np.array_equal(nextRoots, roots):
+                return roots.copy()
+            roots = nextRoots
+    
+    def compact_labels(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the compacted, renumbered vertex labels (for blockMeshDict).
+        
+        A merged vertex gets the label of its representative vertex, as
+        long as it's still at the location of the representative. Vertices
+        moved away after the merge keep their own label. The labels of the
+        kept vertices are consecutive and in the order of the vertex ids.
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]:
+                Label of each vertex id, mask of the vertices written in blockMeshDict
+        """
+        
+        vertexIds = np.arange(len(self))
+        roots = self.roots()
+        
+        isMerged = (self._coordinates == self._coordinates[roots]).all(axis = 1)
+        representative = np.where(isMerged, roots, vertexIds)
+        
+        isKept = representative == vertexIds
+        labels = (np.cumsum(isKept) - 1)[representative]
+        
+        return labels, isKept
+    
+    def centroids(
+            self,
+            vertexIds: np.ndarray
+        ) -> np.ndarray:
+        """
+        Get the centroids of groups of vertices (edge midpoints, face centroids)
+        from the current coordinates, all groups in one gather
+        
+        Args:
+            vertexIds (np.ndarray): (..., k) ids of the k vertices of each group, e.g. (M, 2) for edges
+        
+        Returns:
+            np.ndarray: (..., 3) coordinates of the centroid of each group
+        """
+        
+        return self._coordinates[vertexIds].mean(axis = -2)
+    
+    def scale_about_centroids(
+            self,
+            vertexIds: np.ndarray,
+            ratio: PointValueType
+        ) -> None:
+        """
+        Scale groups of vertices about their own centroids (e.g. edges, faces).
+        The groups must not share vertices.
+        
+        Args:
+            vertexIds (np.ndarray): (..., k) ids of the k vertices of each group
+            ratio (PointValueType): Ratio of the scaling operation
+        """
+        
+        vertexIds = np.asarray(vertexIds, dtype = np.int64)
+        coordinates = self._coordinates[vertexIds]
+        centroids = coordinates.mean(axis = -2, keepdims = True)
+        
+        self._coordinates[vertexIds] = centroids + (coordinates - centroids) * ratio
+        self.mark_modified(vertexIds.ravel())
+    
+    def mark_modified(
+            self,
+            vertexIds: Union[int, np.ndarray],
+            integerMask: Union[bool, np.ndarray] = False
+        ) -> None:
+        """
+        Flag vertices as modified
+        
+        Args:
+            vertexIds (Union[int, np.ndarray]): Id(s) of the modified vertices
+            integerMask (Union[bool, np.ndarray], optional): Integer flags of the new coordinates, (..., 3) or broadcast. Defaults to False (float coordinates).
+        """
+        
+        self._modified[vertexIds] = True
+        self._integerMask[vertexIds] = integerMask
+    
+    def pop_modified(self) -> np.ndarray:
+        """
+        Get the ids of the vertices modified since the last call and reset the flags
+        
+        Returns:
+            np.ndarray: Ids of the modified vertices
+        """
+        
+        vertexIds = np.flatnonzero(self._modified)
+        self._modified[:] = False
+        
+        return vertexIds
+    
+    @classmethod
+    def lattice(
+            cls,
+            xVertices: List[PointValueType],
+            yVertices: List[PointValueType],
+            zVertices: List[PointValueType],
+        ) -> VertexStoreT:
+        """
+        Create the vertex coordinates of a (z, y, x) lattice.
+        
+        Vertices are numbered first along x, then along y, then along z,
+        i.e. vertex id = ix + nx * (iy + ny * iz)
+        
+        Args:
+            xVertices (List[PointValueType]): Lattice locations along x
+            yVertices (List[PointValueType]): Lattice locations along y
+            zVertices (List[PointValueType]): Lattice locations along z
+        
+        Returns:
+            VertexStoreT: Vertex store containing the lattice coordinates
+        """
+        
+        zGrid, yGrid, xGrid = np.meshgrid(
+                np.asarray(zVertices, dtype = np.float64),
+                np.asarray(yVertices, dtype = np.float64),
+                np.asarray(xVertices, dtype = np.float64),
+                indexing = "ij"
+            )
+        
+        coordinates = np.stack(
+                (xGrid.ravel(), yGrid.ravel(), zGrid.ravel()),
+                axis = 1
+            )
+        
+        zInteger, yInteger, xInteger = np.meshgrid(
+                integer_mask(zVertices),
+                integer_mask(yVertices),
+                integer_mask(xVertices),
+                indexing = "ij"
+            )
+        
+        integerMask = np.stack(
+                (xInteger.ravel(), yInteger.ravel(), zInteger.ravel()),
+                axis = 1
+            )
+        
+        return cls(coordinates, integerMask = integerMask)
+
+
+def is_integer(value) -> bool:
+    """ Check if a coordinate is an integer (not a float) """
+    
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+def integer_mask(values) -> np.ndarray:
+    """
+    Get the integer flags of coordinate values
+    
+    Args:
+        values: Coordinate values, e.g. a point or a list of lattice locations
+    
+    Returns:
+        np.ndarray: True for the values which are integers
+    """
+    
+    return np.array([is_integer(x) for x in values], dtype = bool)
@@ -3,13 +3,17 @@
 
 
 
+import numpy as np
+
 from typing import (
     Dict,
+    Sequence,
     TypeVar,
 )
 from utility.udtypes import (
     AngleType,
     EdgeType,
+    PointListType,
     PointType,
 )
 from utility.define import indent
@@ -81,13 +85,13 @@ class EdgeFeature:
             EdgeT: Returns the Edge for which the arc has been defined
         """
         
-        t.check_coordinate(editInfo["arc-point"])
-        
         if editInfo["method"] == "arc-point":
+            t.check_coordinate(editInfo["arc-point"])
             arcPoint = editInfo["arc-point"]
             self.edge.definition = f"arc {self.edge.start.id} {self.edge.end.id} ({arcPoint[0]} {arcPoint[1]} {arcPoint[2]})"
         
         elif editInfo["method"] == "center-radius":
+            t.check_coordinate(editInfo["center"])
             arcPoint = self.arc_from_center_and_radius(
                     editInfo["center"],
                     editInfo["angle"]
@@ -98,6 +102,53 @@ class EdgeFeature:
         
         return self.edge
     
+    def curve_points(
+            self,
+            editInfo: Dict
+        ) -> PointListType:
+        """
+        Get the points of a curve (see 'Curve') between the start and the end of the edge
+
+        Args:
+            editInfo (Dict): Dictionary containing the "curve", the "tolerance" and optionally the "parameter-range"
+
+        Returns:
+            PointListType: Coordinates of the inner points of the edge
+        """
+        
+        curvePoints = editInfo["curve"].sample(
+                [self.edge.start.coordinates()],
+                [self.edge.end.coordinates()],
+                editInfo["tolerance"],
+                [editInfo.get("parameter-range", [np.nan, np.nan])]
+            )[0]
+        
+        return tuple(tuple(x) for x in curvePoints.tolist())
+    
+    def point_list_definition(
+            self,
+            points: Sequence[PointType]
+        ) -> str:
+        """
+        Definition of an edge through a list of points (spline, polyline)
+
+        Args:
+            points (Sequence[PointType]): Coordinates of the inner points of the edge
+
+        Returns:
+            str: Definition of the edge for the blockMeshDict
+        """
+        
+        for ipoint in points:
+            t.check_coordinate(ipoint)
+        
+        definition = f"{self._type} {self.edge.start.id} {self.edge.end.id}\n{indent}(\n"
+        for ipoint in points:
+            definition += f"{indent*2}({ipoint[0]} {ipoint[1]} {ipoint[2]})\n"
+        definition += f"{indent})"
+        
+        return definition
+    
     def make_spline(
             self,
             editInfo: Dict
@@ -106,26 +157,47 @@ class EdgeFeature:
         make spline with a given edge
 
         Args:
-            editInfo (Dict): Dictionary containing the arch formation details
+            editInfo (Dict): Dictionary containing the spline formation details
 
         Returns:
             EdgeT: Returns the Edge for which the spline has been defined
         """
         
-        splinePoints = editInfo["spline-point"]
+        if editInfo["method"] == "spline-point":
+            splinePoints = editInfo["spline-point"]
         
-        for ipoint in splinePoints:
-            t.check_coordinate(ipoint)
+        elif editInfo["method"] == "curve":
+            splinePoints = self.curve_points(editInfo)
         
-        self.edge.definition = f"spline {self.edge.start.id} {self.edge.end.id}\n{indent}(\n"
-        if editInfo["method"] == "spline-point":
-            for ipoint in splinePoints:
-                self.edge.definition += f"{indent*2}({ipoint[0]} {ipoint[1]} {ipoint[2]})\n"
-            self.edge.definition += f"{indent})"
-            
+        self.edge.definition = self.point_list_definition(splinePoints)
         self.edge._editPoints = tuple([tuple(j) for j in splinePoints])
         
         return self.edge
+    
+    def make_polyline(
+            self,
+            editInfo: Dict
+        ) -> EdgeT:
+        """
+        make polyline with a given edge
+
+        Args:
+            editInfo (Dict): Dictionary containing the polyline formation details
+
+        Returns:
+            EdgeT: Returns the Edge for which the polyline has been defined
+        """
+        
+        if editInfo["method"] == "polyline-point":
+            polylinePoints = editInfo["polyline-point"]
+        
+        elif editInfo["method"] == "curve":
+            polylinePoints = self.curve_points(editInfo)
+        
+        self.edge.definition = self.point_list_definition(polylinePoints)
+        self.edge._editPoints = tuple([tuple(j) for j in polylinePoints])
+        
+        return self.edge
 
 
 
@@ -7,7 +7,6 @@ from typing import (
 from utility.udtypes import (
     PointValueType
 )
-from utility import tool as t
 
 FaceT = TypeVar("FaceT", bound = "Face")
 
@@ -44,7 +43,12 @@ class FaceAction:
             FaceT: Returns the face which has been scaled.
         """
         
-        center = t.center(self.face.vertices)
+        store = self.face.vertices[0].store
+        if store is not None and all(x.store is store for x in self.face.vertices):
+            store.scale_about_centroids(self.face.vertexIds, ratio)
+            return self.face
+        
+        center = self.face.center
         
         for ivertex in self.face.vertices:
             coordinates = ivertex.coordinates()
@@ -2,6 +2,7 @@
 
 
 import math
+import numpy as np
 
 from typing import (
     TypeVar
@@ -10,11 +11,15 @@ from utility.udtypes import (
     PointValueType
 )
 from utility.define import (
+    blockEdgeDefinition,
+    blockEdgeIndex,
+    circleQuadrantBlockOffset,
     slicePlaneAxisIndex,
     quadrantEdgeRule,
     blockShiftCoefficient,
     angleForQuadrant,
     quadrantCompressionFactor,
+    quadrantShiftFactor,
 )
 from utility import tool as t
 
@@ -277,19 +282,8 @@ class MultiBlockAction:
         to smooth out the quadrant mesh
         """
         
-        if quadrantNumber == 1:
-            shiftFactor1stAxis = -1
-            shiftFactor2ndAxis = -1
-        elif quadrantNumber == 2:
-            shiftFactor1stAxis = 1
-            shiftFactor2ndAxis = -1
-        elif quadrantNumber == 3:
-            shiftFactor1stAxis = 1
-            shiftFactor2ndAxis = 1
-        elif quadrantNumber == 4:
-            shiftFactor1stAxis = -1
-            shiftFactor2ndAxis = 1
-            
+        shiftFactor1stAxis, shiftFactor2ndAxis = quadrantShiftFactor[quadrantNumber]
+        
         if slicePlane == "xy":
             centerBlockInnerEdgeDeltaX = shiftFactor1stAxis * radius/2.0 * quadrantCompressionFactor
             centerBlockInnerEdgeDeltaY = shiftFactor2ndAxis * radius/2.0 * quadrantCompressionFactor
@@ -1050,13 +1044,213 @@ class MultiBlockAction:
             )
         
         return
+    
+    def edge_vertex_ids(
+            self,
+            blockIds: np.ndarray,
+            edgePosition: list
+        ) -> tuple:
+        """
+        Get the start/end vertex ids of an edge of the given blocks
 
+        Args:
+            blockIds (np.ndarray): Ids of the blocks
+            edgePosition (list): Position of the edge in a block, e.g. ["top", "right"]
 
+        Returns:
+            tuple: Start vertex ids, end vertex ids
+        """
+        
+        _, _, startIndex, endIndex = blockEdgeDefinition[blockEdgeIndex[frozenset(edgePosition)]]
+        blockVertexIds = self.multiblock.hexConnectivity[blockIds]
+        
+        return blockVertexIds[:, startIndex], blockVertexIds[:, endIndex]
+    
+    def make_quadrant_array(
+            self,
+            slicePlane: str,
+            quadrantNumber: int,
+            centerBlockIds: np.ndarray,
+            cornerBlockIds: np.ndarray,
+            radius: np.ndarray
+        ) -> None:
+        """
+        Make the same quadrant (slice plane, quadrant number) of many circles at once.
+        
+        Same steps as 'make_four_block_quadrant', each step is applied to
+        all quadrants with array operations on the vertex coordinate store.
+        The quadrants must not share vertices.
 
+        Args:
+            slicePlane (str): Name of the slice plane
+            quadrantNumber (int): Quadrant number (1, 2, 3, 4)
+            centerBlockIds (np.ndarray): Ids of the center blocks (containing the axis of the quadrant)
+            cornerBlockIds (np.ndarray): Ids of the corner blocks (removed)
+            radius (np.ndarray): Radius of each quadrant
+        """
+        
+        mb = self.multiblock
+        vertexStore = mb.vertexStore
+        coordinates = vertexStore.coordinates
+        hexConnectivity = mb.hexConnectivity
+        
+        axisIndex1 = slicePlaneAxisIndex[slicePlane]["index1"]
+        axisIndex2 = slicePlaneAxisIndex[slicePlane]["index2"]
+        edgeRule = quadrantEdgeRule[slicePlane][quadrantNumber]
+        
+        ### Top/side blocks of the quadrants
+        topShift, sideShift = blockShiftCoefficient[quadrantNumber].values()
+        
+        topIndices = mb.multiBlockIndices[centerBlockIds].copy()
+        topIndices[:, axisIndex2] += topShift
+        topBlockIds = mb.blockGrid[tuple(topIndices.T)]
+        
+        sideIndices = mb.multiBlockIndices[centerBlockIds].copy()
+        sideIndices[:, axisIndex1] += sideShift
+        sideBlockIds = mb.blockGrid[tuple(sideIndices.T)]
+        
+        mb.activeMask[cornerBlockIds] = False
+        
+        ### Move edges to the distance of the given radius
+        axisStartIds, axisEndIds = self.edge_vertex_ids(centerBlockIds, edgeRule["axis-edge-location"])
+        topRadialStartIds, topRadialEndIds = self.edge_vertex_ids(topBlockIds, edgeRule["radial-edge-location"]["top-block"])
+        sideRadialStartIds, sideRadialEndIds = self.edge_vertex_ids(sideBlockIds, edgeRule["radial-edge-location"]["side-block"])
+        
+        vertexPairForSettingRadius = [
+                [axisStartIds, topRadialStartIds],
+                [axisEndIds, topRadialEndIds],
+                [axisStartIds, sideRadialStartIds],
+                [axisEndIds, sideRadialEndIds],
+            ]
+        
+        for referenceIds, vertexIds in vertexPairForSettingRadius:
+            reference = coordinates[referenceIds]
+            difference = reference - coordinates[vertexIds]
+            distance = np.sqrt(difference[:, 0]**2 + difference[:, 1]**2 + difference[:, 2]**2)
+            ratio = radius/distance
+            coordinates[vertexIds] = reference + ratio[:, np.newaxis] * (coordinates[vertexIds] - reference)
+        
+        ### Arc points (along the 1st, 2nd axis of the slice plane) and "Delta" for the collapsed edges
+        quadrantCenter = coordinates[axisStartIds]
+        
+        def radial_point(theta: float) -> tuple:
+            return (
+                    radius * math.cos(math.radians(theta)) + quadrantCenter[:, axisIndex1],
+                    radius * math.sin(math.radians(theta)) + quadrantCenter[:, axisIndex2]
+                )
+        
+        thetaCorner, thetaSideArc, thetaTopArc = angleForQuadrant[quadrantNumber].values()
+        radialCorner = radial_point(thetaCorner)
+        radialSideArc = radial_point(thetaSideArc)
+        radialTopArc = radial_point(thetaTopArc)
+        
+        topCollapseStartIds, topCollapseEndIds = self.edge_vertex_ids(topBlockIds, edgeRule["collapse-edge-location"])
+        sideCollapseStartIds, sideCollapseEndIds = self.edge_vertex_ids(sideBlockIds, edgeRule["collapse-edge-location"])
+        
+        delta = np.zeros((len(centerBlockIds), 3))
+        delta[:, axisIndex1] = radialCorner[0] - coordinates[sideCollapseStartIds, axisIndex1]
+        delta[:, axisIndex2] = radialCorner[1] - coordinates[sideCollapseStartIds, axisIndex2]
+        
+        ### Move-Collapse for Quadrant
+        for selectionIds, targetIds in [
+                (topCollapseStartIds, sideCollapseStartIds),
+                (topCollapseEndIds, sideCollapseEndIds),
+            ]:
+            coordinates[targetIds] += delta
+            coordinates[selectionIds] = coordinates[targetIds]
+            for selectionId, targetId in zip(selectionIds.tolist(), targetIds.tolist()):
+                vertexStore.merge(selectionId, targetId)
+        
+        ### Moving the inner corner edge (common to the center, top and side blocks) of the center block
+        edgeStartIndex = [x[2] for x in blockEdgeDefinition]
+        edgeEndIndex = [x[3] for x in blockEdgeDefinition]
+        
+        def edge_keys(blockIds: np.ndarray) -> np.ndarray:
+            blockVertexIds = hexConnectivity[blockIds]
+            return blockVertexIds[:, edgeStartIndex] * len(vertexStore) + blockVertexIds[:, edgeEndIndex]
+        
+        centerEdgeKeys = edge_keys(centerBlockIds)
+        isCommonEdge = (
+                (centerEdgeKeys[:, :, np.newaxis] == edge_keys(topBlockIds)[:, np.newaxis, :]).any(axis = 2)
+                & (centerEdgeKeys[:, :, np.newaxis] == edge_keys(sideBlockIds)[:, np.newaxis, :]).any(axis = 2)
+            )
+        
+        if not isCommonEdge.any(axis = 1).all():
+            raise ValueError("Common edge can not be found among the blocks of the quadrant")
+        
+        commonEdgeIndex = isCommonEdge.argmax(axis = 1)
+        centerBlockVertexIds = hexConnectivity[centerBlockIds]
+        blockRange = np.arange(len(centerBlockIds))
+        
+        shiftFactor1stAxis, shiftFactor2ndAxis = quadrantShiftFactor[quadrantNumber]
+        innerCornerDelta = np.zeros((len(centerBlockIds), 3))
+        innerCornerDelta[:, axisIndex1] = shiftFactor1stAxis * radius/2.0 * quadrantCompressionFactor
+        innerCornerDelta[:, axisIndex2] = shiftFactor2ndAxis * radius/2.0 * quadrantCompressionFactor
+        
+        coordinates[centerBlockVertexIds[blockRange, np.take(edgeStartIndex, commonEdgeIndex)]] += innerCornerDelta
+        coordinates[centerBlockVertexIds[blockRange, np.take(edgeEndIndex, commonEdgeIndex)]] += innerCornerDelta
+        
+        vertexStore.mark_modified(np.concatenate([
+                topRadialStartIds, topRadialEndIds, sideRadialStartIds, sideRadialEndIds,
+                topCollapseStartIds, topCollapseEndIds, sideCollapseStartIds, sideCollapseEndIds,
+                centerBlockVertexIds[blockRange, np.take(edgeStartIndex, commonEdgeIndex)],
+                centerBlockVertexIds[blockRange, np.take(edgeEndIndex, commonEdgeIndex)],
+            ]))
+        
+        ### Adding arc to the edges of the top and side blocks, at the (unchanged) normal coordinate of the edge
+        normalAxisIndex = 3 - axisIndex1 - axisIndex2
+        
+        for blockIds, (arcPoint1, arcPoint2), blockType in [
+                (topBlockIds, radialTopArc, "top-block"),
+                (sideBlockIds, radialSideArc, "side-block"),
+            ]:
+            for edgePosition in edgeRule["arc-edge-location"][blockType]:
+                edgeIndex = blockEdgeIndex[frozenset(edgePosition)]
+                edgeStartIds = self.edge_vertex_ids(blockIds, edgePosition)[0]
+                arcPoints = np.empty((len(blockIds), 3))
+                arcPoints[:, axisIndex1] = arcPoint1
+                arcPoints[:, axisIndex2] = arcPoint2
+                arcPoints[:, normalAxisIndex] = coordinates[edgeStartIds, normalAxisIndex]
+                
+                for blockId, arcPoint in zip(blockIds.tolist(), arcPoints.tolist()):
+                    mb.blocks[blockId].edge(edgeIndex).arc({
+                            "method" : "arc-point",
+                            "arc-point" : arcPoint,
+                        })
+    
+    def make_circle_array(
+            self,
+            slicePlanes: np.ndarray,
+            startingBlockIds: np.ndarray,
+            radius: np.ndarray
+        ) -> None:
+        """
+        Make many (4 x 4 block) circles at once. The circles are made quadrant
+        by quadrant, each quadrant of all circles (in a slice plane) at once.
+        The selections must be checked before ('MultiBlock.check_circle_array').
 
-
-
-
-
-
-
+        Args:
+            slicePlanes (np.ndarray): Slice plane of each circle
+            startingBlockIds (np.ndarray): Id of the starting block (diagonally left-bottom) of each circle
+            radius (np.ndarray): Radius of each circle
+        """
+        
+        mb = self.multiblock
+        
+        for slicePlane in np.unique(slicePlanes).tolist():
+            isInPlane = slicePlanes == slicePlane
+            startingIndices = mb.multiBlockIndices[startingBlockIds[isInPlane]]
+            axisIndices = [slicePlaneAxisIndex[slicePlane]["index1"], slicePlaneAxisIndex[slicePlane]["index2"]]
+            
+            for quadrantNumber, blockOffsets in circleQuadrantBlockOffset.items():
+                centerIndices, cornerIndices = startingIndices.copy(), startingIndices.copy()
+                centerIndices[:, axisIndices] += blockOffsets[0]
+                cornerIndices[:, axisIndices] += blockOffsets[1]
+                
+                self.make_quadrant_array(
+                        slicePlane,
+                        quadrantNumber,
+                        mb.blockGrid[tuple(centerIndices.T)],
+                        mb.blockGrid[tuple(cornerIndices.T)],
+                        radius[isInPlane]
+                    )
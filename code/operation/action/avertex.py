@@ -76,6 +76,10 @@ class VertexAction:
         selection.x = target.x
         selection.y = target.y
         selection.z = target.z
+        
+        ### Record the merge, the vertices are written once in blockMeshDict
+        if selection.store is not None and selection.store is target.store:
+            selection.store.merge(selection.id, target.id)
     
         return selection
     
@@ -1,4 +1,6 @@
 import os
+import json
+import hashlib
 import importlib.util
 import types
 
@@ -7,6 +9,7 @@ from collections import OrderedDict
 from typing import (
     List, 
     Dict,
+    Optional,
 )
 
 from entity.block import *
@@ -15,14 +18,29 @@ from entity.face import *
 from entity.multiblock import *
 from entity.vertex import *
 
+from operation.editanalysis import EditAnalysis
+from operation.editdata import (
+    canonical_task,
+    decode_data,
+    encode_data,
+    is_data_only_code,
+    read_edit_data,
+)
+from operation.editjournal import EditJournal
+from operation.editplan import EditPlan
 
 from utility.define import (
+    editCacheSuffix,
+    editFileSuffix,
     indent,
-    taskTypeCheck
+    taskTypeCheck,
 )
 
 from utility import tool as t
 
+### Increase when the content/layout of the edit cache changes
+editCacheVersion = 2
+
 
 class Edit:
     """ Attributes and methods associated with the multi-block edit operations """
@@ -41,15 +59,23 @@ class Edit:
         self._workingDir = workingDir
         self._filename = None
         self._fileExist = False
+        self._fileSearched = False
         self._task = None
         self._taskExist = False
         self._filePrefix = "block_edit_"
         self._edgeDefinition = []
         self._boundaryDefinition = []
+        self._analysis = None
     
     def __repr__(self):
         return "Class for the edit operation"
     
+    @property
+    def analysis(self) -> Optional[EditAnalysis]:
+        """ Analysis of the last executed edit plan (if requested) """
+        
+        return self._analysis
+    
     @property
     def filename(self) -> str:
         return self._filename
@@ -102,10 +128,15 @@ class Edit:
     
     
     def does_file_exists(self) -> None:
-        """ Check if edit file exists """
-               
+        """ Check if edit file exists (the working directory is searched only once) """
+        
+        if self._fileSearched:
+            return
+        
+        self._fileSearched = True
+        
         p = Path(self._workingDir)
-        result = tuple(p.glob(f"{self._filePrefix}*.py"))
+        result = tuple(x for x in p.glob(f"{self._filePrefix}*") if x.suffix.lower() in editFileSuffix)
         if len(result)> 1:
             raise RuntimeError("\n\nMore than one 'block_edit' file exists!")
         
@@ -118,325 +149,235 @@ class Edit:
             print("Edit file does not exist!")
         
     
+    @property
+    def cacheFile(self) -> str:
+        """ Path of the cache file of the edit file """
+        
+        return self._workingDir + os.sep + "." + self.filename + editCacheSuffix
+    
     def read(self) -> None:
-        """ Read edit definition file """
+        """
+        Read edit definition file.
+        The edit file is either a Python module or a data-only (JSON/TOML)
+        file, see 'operation.editdata.read_edit_data'.
+        
+        The task tables of the edit file are cached (as JSON) next to the
+        edit file, keyed by the hash of the file content. If the cache
+        matches the file, the tables are taken from the cache and the edit
+        file is not compiled/executed. Only edit files whose tables depend
+        on the file content alone are cached: data-only files, and Python
+        files of plain data which don't import modules or read files/the
+        environment (see 'operation.editdata.is_data_only_code').
+        """
         
         moduleName = self.filename.split(".")[0]
         modulePath = self._workingDir + os.sep + self.filename
         t.hl()
         print(f"Module name : {moduleName}")
         
-        spec = importlib.util.spec_from_file_location(
-                                    moduleName,
-                                    modulePath
-                                )
-        self.task = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(self.task)
+        with open(modulePath, "rb") as ef:
+            fileHash = hashlib.sha256(ef.read()).hexdigest()
         
-    
-    def execute_vertex_operation(
-            self,
-            vertices: Dict
-        ) -> None:
-        """
-        Execute user provided vertex edit operations
-
-        Args:
-            vertices (Vertex): Dictionary of the "Vertex" objects defining the multi-block
-        """
+        tables = self.read_cache(fileHash)
         
-        for taskId, task in self.task.vertexEdit.items():
-            
-            ### Moving vertex
-            if task["edit-type"].lower() == "move":
-                
-                if "new-location" in task:
-                    location = task["new-location"]
-                    delta = None
-                elif "delta" in task:
-                    location = None
-                    delta = task["delta"]
-                    
-                vertices[task["id"]].move(
-                        location,
-                        delta 
-                    )
-            
-            ### Collapsing vertices
-            if task["edit-type"].lower() == "collapse":
-                vertices[task["id"]].collapse(
-                        vertices[task["target-vertex"]]
-                    )
-            
-            ### Move_Collapse vertices
-            if task["edit-type"].lower() == "move-collapse":
-                
-                if "new-location" in task:
-                    location = task["new-location"]
-                    delta = None
-                elif "delta" in task:
-                    location = None
-                    delta = task["delta"]
-                
-                vertices[task["id"]].move_collapse(
-                        vertices[task["target-vertex"]],
-                        location,
-                        delta
-                    )
+        if tables is not None:
+            print("Edit tables read from the cache.")
+            self.task = types.ModuleType(moduleName)
+            for taskType, taskEntry in tables.items():
+                setattr(self.task, taskType, taskEntry)
+            return
+        
+        if self.filename.lower().endswith(".py"):
+            spec = importlib.util.spec_from_file_location(
+                                        moduleName,
+                                        modulePath
+                                    )
+            self.task = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self.task)
             
-            ### Scaling vertex
-            if task["edit-type"].lower() == "scale":
-                    
-                vertices[task["id"]].scale(
-                        task["ratio"],
-                        task["reference"]
-                    )
-        
-    def process_edge_edit_input(
+            if not is_data_only_code(spec.loader.get_code(moduleName)):
+                print("Edit tables not cached (the edit file imports modules or reads files).")
+                return
+        else:
+            self.task = types.ModuleType(moduleName)
+            for taskType, taskEntry in read_edit_data(modulePath).items():
+                setattr(self.task, taskType, taskEntry)
+        
+        self.write_cache(fileHash)
+    
+    def read_cache(
             self,
-            blocks: Dict,
-            task: Dict,
-        ) -> Dict:
+            fileHash: str
+        ) -> Optional[Dict]:
         """
-        Identifies required edges and prepares dictionary containing action/operation details.
-
+        Read the task tables from the cache of the edit file.
+        The cache is plain JSON data, it's never executed.
+        
         Args:
-            blocks (Dict): Dictionary of instances of the 'Block' class.
-            task (Dict): Dictionary containing edit operation input from user
-
+            fileHash (str): Hash of the content of the edit file
+        
         Returns:
-            Dict: Returns dictionary containing edge action/operation details
+            Optional[Dict]: Task tables, None if there is no (matching) cache
         """
         
-        editInfo = {}
+        try:
+            with open(self.cacheFile, "r", encoding = "utf-8") as cf:
+                cache = json.load(cf)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            print(f"Edit cache ignored, it can't be read --> {error}")
+            return None
         
-        for key, value in task.items():
-            if "edge" in key:
-                editInfo[key] = blocks[task[key]["block-id"]].find_edge(task[key]["position"])
-            else:
-                editInfo[key] = value
+        if (not isinstance(cache, dict)
+                or cache.get("version") != editCacheVersion
+                or cache.get("hash") != fileHash):
+            return None
         
-        return editInfo
+        try:
+            tables = decode_data(cache.get("tables"))
+        except (ValueError, TypeError) as error:
+            print(f"Edit cache ignored, it can't be read --> {error}")
+            return None
+        
+        if not isinstance(tables, dict) or any(x not in taskTypeCheck for x in tables):
+            return None
+        
+        return tables
     
-    def execute_edge_operation(
+    def write_cache(
             self,
-            blocks: Dict
+            fileHash: str
         ) -> None:
         """
-        Execute user provided edge edit operations
-
-        Args:
-            blocks (dict): Dictionary of the "Blocks" objects defining the multi-block
-
-        Raises:
-            ValueError: For improper edge definitions
-        """
-        
-        for taskId, task in self.task.edgeEdit.items():
-            
-            ### Identify edge
-            editInfo = self.process_edge_edit_input(
-                    blocks,
-                    task
-                )
-            
-            ### Moving edge
-            if task["edit-type"].lower() == "move":
-                editInfo["edge"].move(task["delta"])
-            
-            ### Collapsing edge
-            if task["edit-type"].lower() == "collapse":
-                editInfo["edge"].collapse(editInfo["target-edge"])
-            
-            ### Moving-collapsing edge
-            if task["edit-type"].lower() == "move-collapse":
-                editInfo["edge"].move_collapse(
-                        task["delta"],
-                        editInfo["target-edge"]
-                    )
-            
-            ### Scaling edge
-            if task["edit-type"].lower() == "scale":
-                editInfo["edge"].scale(task["ratio"])
-            
-            
-            
-            ### Create arc definition
-            if task["edit-type"].lower() == "make-arc":
-                editInfo["edge"].arc(editInfo)
-            
-            ### Create spline definition
-            if task["edit-type"].lower() == "make-spline":
-                editInfo["edge"].spline(editInfo)
-    
+        Write the task tables of the (read) edit file into its cache.
+        The cache is skipped if the tables aren't plain data (e.g. functions).
         
-    def process_face_edit_input(
-            self,
-            blocks: Dict,
-            task: Dict,
-        ) -> Dict:
-        """
-        Identifies required edges and prepares dictionary containing action/operation details.
-
         Args:
-            blocks (Dict): Dictionary of instances of the 'Block' class.
-            task (Dict): Dictionary containing edit operation input from user
-
-        Returns:
-            Dict: Returns dictionary containing face action/operation details
+            fileHash (str): Hash of the content of the edit file
+        
+        Raises:
+            RuntimeError: If the cache file can't be written
         """
         
-        editInfo = {}
+        tables = {
+            x : getattr(self.task, x)
+            for x in taskTypeCheck
+            if hasattr(self.task, x)
+        }
         
-        for key, value in task.items():
-            if "face" in key:
-                editInfo[key] = blocks[task[key]["block-id"]].faces[task[key]["side"]]
-            else:
-                editInfo[key] = value
+        try:
+            cacheData = json.dumps({
+                    "version" : editCacheVersion,
+                    "hash" : fileHash,
+                    "tables" : encode_data(tables),
+                })
+        except (TypeError, ValueError) as error:
+            print(f"Edit tables not cached --> {error}")
+            return
         
-        return editInfo
+        ### Write and rename, a partly written cache is never read
+        tempFile = self.cacheFile + f".{os.getpid()}"
+        try:
+            with open(tempFile, "w", encoding = "utf-8") as cf:
+                cf.write(cacheData)
+            os.replace(tempFile, self.cacheFile)
+        except OSError as error:
+            raise RuntimeError(f"\n\nEdit cache can't be written --> {self.cacheFile}\n{indent}{error}") from error
     
-    def execute_face_operation(
+    
+    def override_task(
             self,
-            blocks: Dict
+            taskPath: str,
+            value
         ) -> None:
         """
-        Execute user provided edge edit operations
-
+        Override a value of the edit definition read from the edit file.
+        
+        Example: "blockEdit.0.radius" --> blockEdit[0]["radius"] = value
+                 "vertexEdit.0.delta.1" --> vertexEdit[0]["delta"][1] = value
+        
         Args:
-            blocks (dict): Dictionary of the "Blocks" objects defining the multi-block
-
+            taskPath (str): Dot separated path of the value, starting with the task type
+            value: New value
+        
         Raises:
-            ValueError: For improper edge definitions
+            ValueError: If the path doesn't exist in the edit definition
         """
         
-        for taskId, task in self.task.faceEdit.items():
+        taskType, *keys = taskPath.split(".")
+        
+        if taskType not in taskTypeCheck or not hasattr(self.task, taskType) or len(keys) == 0:
+            raise ValueError(f"Invalid edit override --> {taskPath}")
+        
+        entry = getattr(self.task, taskType)
+        
+        for position, key in enumerate(keys):
+            if isinstance(entry, list):
+                ### List items are indexed by position
+                if not key.isdigit() or int(key) >= len(entry):
+                    raise ValueError(f"Invalid edit override --> {taskPath}")
+                key = int(key)
             
-            ### Identify edge
-            editInfo = self.process_face_edit_input(
-                    blocks,
-                    task
-                )
+            elif isinstance(entry, dict):
+                ### Task ids are integers in the edit file
+                if key not in entry and key.isdigit():
+                    key = int(key)
+                
+                if key not in entry:
+                    raise ValueError(f"Invalid edit override --> {taskPath}")
             
-            ### Moving face
-            if task["edit-type"].lower() == "move":
-                editInfo["face"].move(task["delta"])
+            else:
+                raise ValueError(f"Invalid edit override --> {taskPath}")
             
-            ### Scaling face
-            if task["edit-type"].lower() == "scale":
-                editInfo["face"].scale(task["ratio"])
+            if position == len(keys) - 1:
+                entry[key] = value
+            else:
+                entry = entry[key]
     
-    def execute_block_operation(
+    def task_hash(
             self,
-            mb: MultiBlock
-        ) -> None:
+            taskTypes: List[str]
+        ) -> str:
         """
-        Execute user provided block edit operations
+        Get the hash of the given task types of the edit file.
+        The tasks are hashed in the order they are executed, in their
+        canonical form (see 'operation.editdata.canonical_task'), so the
+        hash is the same in every run for the same task definitions.
 
         Args:
-            mb (MultiBlock): Instance of the "Blocks" class defining the multi-block
-        """
-        for taskId, task in self.task.blockEdit.items():
-            
-            ### Moving block
-            if task["edit-type"].lower() == "move":
-                mb.blocks[task["block-id"]].move(
-                        delta = task["delta"]
-                    )
-            
-            ### scaling-2d block
-            if task["edit-type"].lower() == "scale-2d":
-                if isinstance(task["block-id"], list):
-                    blocks2scale = [mb.blocks[i] for i in task["block-id"]]
-                    mb.scaleSliceBlocks(
-                            blocks2scale,
-                            task["plane"],
-                            task["ratio"],
-                        )
-                    
-                elif isinstance(task["block-id"], int):
-                    mb.blocks[task["block-id"]].scale2d(
-                            task["plane"],
-                            task["ratio"],
-                        )
-            
-            ### scaling-3d block     
-            if task["edit-type"].lower() == "scale-3d":
-                if isinstance(task["block-id"], list):
-                    blocks2scale = [mb.blocks[i] for i in task["block-id"]]
-                    mb.scaleSliceBlocks(
-                            blocks2scale,
-                            task["ratio"],
-                        )
-                    
-                elif isinstance(task["block-id"], int):
-                    mb.blocks[task["block-id"]].scale3d(
-                            task["ratio"],
-                        )
-            
-            ### Making quadrant
-            if task["edit-type"].lower() == "make-quadrant":
-                mb.make_quadrant(
-                        task["starting-block-id"],
-                        task["ending-block-id"],
-                        task["radius"],
-                    )
-            
-            ### Making semicircle
-            if task["edit-type"].lower() == "make-semicircle":
-                mb.make_semicircle(
-                        task["starting-block-id"],
-                        task["ending-block-id"],
-                        task["radius"],
-                    )
-            
-            ### Making circle
-            if task["edit-type"].lower() == "make-circle":
-                mb.make_circle(
-                        task["starting-block-id"],
-                        task["ending-block-id"],
-                        task["radius"],
-                    )
-    
-    def define_boundaries(
-            self,
-            blocks
-        ) -> None:
-        """
-        Define boundary entry for blockMeshDict
+            taskTypes (List[str]): Names of the task types, e.g. ["vertexEdit", "boundary"]
 
-        Args:
-            blocks (Block): Dictionary of the "Vertex" objects defining the multi-block
+        Returns:
+            str: Hexadecimal digest of the task definitions
         """
         
-        for taskId, task in self.task.boundary.items():
-            
-            boundaryDef = (indent * 1) + task["name"] + "\n"
-            boundaryDef += (indent * 1) + "{\n"
-            boundaryDef += (indent *2) + f"type    {task['type']};\n"
-            boundaryDef += (indent *2) + f"faces\n"
-            boundaryDef += (indent *2) + f"(\n"
-            
-            for iface in task['faces']:
-                faceVertices = blocks[iface[0]].faces[iface[1]].vertices
-                orderedVerticesString = "(" + " ".join([str(x.id) for x in faceVertices]) + ")"
-                
-                boundaryDef += (indent *3) + orderedVerticesString + "\n"
-            
-            boundaryDef += (indent *2) + f");\n"
-            boundaryDef += (indent * 1) + "}\n"
-            
-            self.boundaryDefinition.append(boundaryDef)
+        taskHash = hashlib.sha256()
+        
+        for taskType in taskTypes:
+            taskHash.update(taskType.encode())
+            taskHash.update(json.dumps(canonical_task(getattr(self.task, taskType, {}))).encode())
+        
+        return taskHash.hexdigest()
     
     def execute(
             self,
             mb: MultiBlock,
+            applyEdits: bool = True,
+            journal: Optional[EditJournal] = None,
+            analyzeEdits: bool = False,
         ) -> None:
         """
         Execute edits defined in task
 
         Args:
             mb (MultiBlock): Instance of the MultiBlock class.
+            applyEdits (bool, optional): Execute the vertex/edge/face/block edits. Defaults to True.
+            journal (Optional[EditJournal], optional): Journal of the multi-block. If given, the
+                tasks changed since the previous execution (with the same journal) are rolled
+                back and applied again, the unchanged tasks are kept. Defaults to None.
+            analyzeEdits (bool, optional): Analyze the task overlaps of the plan before executing
+                it, see Edit.analysis. Defaults to False.
         """
         
         taskTypes = {
@@ -458,29 +399,35 @@ class Edit:
                 status = False
             print(f"Task type - {taskType:12} exists? - {status}")
         
-        if not any([bool(x) for x in taskTypes]):
+        if not any([bool(x) for x in taskTypes.values()]):
             print("No edit task found!!")
             return
         
-        vertices =  mb.vertices
-        blocks = mb.blocks
+        ### Compile (validate and resolve) all tasks before applying any of them
+        if applyEdits:
+            planTaskTypes = [x for x in taskTypeCheck if taskTypes[x] != []]
+        else:
+            planTaskTypes = ["boundary"] if taskTypes["boundary"] != [] else []
         
-        ### Vertex operations
-        if taskTypes["vertexEdit"] != []:
-            self.execute_vertex_operation(vertices)
+        plan = EditPlan(mb).compile(
+                self.task,
+                planTaskTypes
+            )
         
-        ### Edge operations
-        if taskTypes["edgeEdit"] != []:
-            self.execute_edge_operation(blocks)
+        print(f"Edit steps : {len(plan)}")
         
-        ### Face operations
-        if taskTypes["faceEdit"] != []:
-            self.execute_face_operation(blocks)
+        if analyzeEdits:
+            self._analysis = EditAnalysis(plan)
+            print(f"Independent edit groups : {self._analysis.groupCount}")
         
-        ### Block operations
-        if taskTypes["blockEdit"] != []:
-            self.execute_block_operation(mb)
+        if journal is None:
+            plan.execute()
+        else:
+            print(f"Edit steps applied : {journal.apply(plan, self.task)}")
         
         ## Define boundaries
-        if taskTypes["boundary"] != []:
-            self.define_boundaries(blocks)
\ No newline at end of file
+        if taskTypes["boundary"] != [] and journal is None:
+            self.boundaryDefinition.extend(plan.boundaryDefinition)
+            mb.boundaryDefinition = self.boundaryDefinition
+        elif taskTypes["boundary"] != []:
+            self.boundaryDefinition = journal.boundaryDefinition
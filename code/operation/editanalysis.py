@@ -0,0 +1,254 @@
+import numpy as np
+
+from typing import (
+    Dict,
+    List,
+)
+
+from operation.editplan import (
+    EditPlan,
+    EditStep,
+)
+
+from utility.define import VSEP
+
+
+class EditAnalysis:
+    """
+    Vertex footprint and dependency analysis of a compiled edit plan.
+    
+    The footprint of a task is the set of vertices it reads or moves.
+    Tasks with overlapping footprints depend on each other (their order
+    matters), tasks of different independent groups touch disjoint
+    vertices and can be applied in any order (e.g. in batch or in parallel).
+    
+    The footprint of the quadrant/semicircle/circle tasks is taken as all
+    vertices of the blocks between the starting and the ending block, the
+    boundary tasks have no footprint (they don't depend on the vertex locations).
+    """
+    
+    def __init__(
+            self,
+            plan: EditPlan
+        ) -> None:
+        """
+        Initialize EditAnalysis instance and analyze the plan
+        
+        Args:
+            plan (EditPlan): Compiled edit plan
+        """
+        
+        self._plan = plan
+        self._mb = plan.mb
+        
+        self._footprintRule = {
+            ("vertexEdit", "move") : self.vertex_footprint,
+            ("vertexEdit", "collapse") : self.vertex_footprint,
+            ("vertexEdit", "move-collapse") : self.vertex_footprint,
+            ("vertexEdit", "scale") : self.vertex_footprint,
+            
+            ("edgeEdit", "move") : self.edge_footprint,
+            ("edgeEdit", "collapse") : self.edge_footprint,
+            ("edgeEdit", "move-collapse") : self.edge_footprint,
+            ("edgeEdit", "scale") : self.edge_footprint,
+            ("edgeEdit", "make-arc") : self.edge_footprint,
+            ("edgeEdit", "make-spline") : self.edge_footprint,
+            ("edgeEdit", "make-polyline") : self.edge_footprint,
+            
+            ("faceEdit", "move") : self.face_footprint,
+            ("faceEdit", "scale") : self.face_footprint,
+            
+            ("blockEdit", "move") : self.block_footprint,
+            ("blockEdit", "scale-2d") : self.block_footprint,
+            ("blockEdit", "scale-3d") : self.block_footprint,
+            ("blockEdit", "make-quadrant") : self.block_range_footprint,
+            ("blockEdit", "make-semicircle") : self.block_range_footprint,
+            ("blockEdit", "make-circle") : self.block_range_footprint,
+            ("blockEdit", "make-circle-array") : self.circle_array_footprint,
+            
+            ("boundary", "") : self.boundary_footprint,
+        }
+        
+        self._footprints = [self._footprintRule[x.opCode](x.arguments) for x in plan.steps]
+        self.analyze()
+    
+    def __repr__(self):
+        return f"EditAnalysis : {len(self._plan)} tasks, {self.groupCount} independent groups"
+    
+    @property
+    def footprints(self) -> List[np.ndarray]:
+        return self._footprints
+    
+    @property
+    def groups(self) -> np.ndarray:
+        return self._groups
+    
+    @property
+    def groupCount(self) -> int:
+        return int(np.unique(self._groups).size)
+    
+    ### Footprints (vertex ids read/moved by the task)
+    def vertex_footprint(self, arguments: Dict) -> np.ndarray:
+        vertexIds = [arguments["id"].id]
+        if "target-vertex" in arguments:
+            vertexIds.append(arguments["target-vertex"].id)
+        return np.unique(vertexIds)
+    
+    def edge_footprint(self, arguments: Dict) -> np.ndarray:
+        edges = [arguments["edge"]]
+        if "target-edge" in arguments:
+            edges.append(arguments["target-edge"])
+        return np.unique([x.id for edge in edges for x in (edge.start, edge.end)])
+    
+    def face_footprint(self, arguments: Dict) -> np.ndarray:
+        return np.unique([x.id for x in arguments["face"].vertices])
+    
+    def block_footprint(self, arguments: Dict) -> np.ndarray:
+        blocks = arguments["block-id"]
+        if not isinstance(blocks, list):
+            blocks = [blocks]
+        return np.unique(self._mb.hexConnectivity[[x.id for x in blocks]])
+    
+    def block_range_footprint(self, arguments: Dict) -> np.ndarray:
+        multiBlockIndices = self._mb.multiBlockIndices
+        cornerIndices = multiBlockIndices[[arguments["starting-block-id"], arguments["ending-block-id"]]]
+        isInRange = (
+                (multiBlockIndices >= cornerIndices.min(axis = 0))
+                & (multiBlockIndices <= cornerIndices.max(axis = 0))
+            ).all(axis = 1)
+        return np.unique(self._mb.hexConnectivity[isInRange])
+    
+    def circle_array_footprint(self, arguments: Dict) -> np.ndarray:
+        startingBlockIds, endingBlockIds, _ = arguments["circles"]
+        return np.unique(np.concatenate([
+                self.block_range_footprint({"starting-block-id" : x, "ending-block-id" : y})
+                for x, y in zip(startingBlockIds.tolist(), endingBlockIds.tolist())
+            ]))
+    
+    def boundary_footprint(self, arguments: Dict) -> np.ndarray:
+        ### Boundaries refer to the vertex ids only, the vertex locations don't matter
+        return np.empty(0, dtype = np.int64)
+    
+    def analyze(self) -> None:
+        """
+        Build the vertex --> task index, the direct dependencies and the independent groups
+        """
+        
+        nStep = len(self._footprints)
+        sizes = np.array([x.size for x in self._footprints], dtype = np.int64)
+        
+        vertexIds = np.concatenate(self._footprints + [np.empty(0, dtype = np.int64)]).astype(np.int64)
+        stepIds = np.repeat(np.arange(nStep), sizes)
+        
+        ### Vertex --> task index, tasks of a vertex in execution order
+        order = np.lexsort((stepIds, vertexIds))
+        self._indexVertexIds = vertexIds[order]
+        self._indexStepIds = stepIds[order]
+        
+        ### Previous task on the same vertex
+        isSameVertex = self._indexVertexIds[1:] == self._indexVertexIds[:-1]
+        self._dependentSteps = self._indexStepIds[1:][isSameVertex]
+        self._previousSteps = self._indexStepIds[:-1][isSameVertex]
+        self._sharedVertexIds = self._indexVertexIds[1:][isSameVertex]
+        
+        ### Independent groups --> connected tasks (label propagation)
+        groups = np.arange(nStep)
+        while True:
+            previousGroups = groups.copy()
+            np.minimum.at(groups, self._dependentSteps, groups[self._previousSteps])
+            np.minimum.at(groups, self._previousSteps, groups[self._dependentSteps])
+            groups = groups[groups]
+            if np.array_equal(groups, previousGroups):
+                break
+        
+        self._groups = groups
+    
+    def tasks_of_vertex(
+            self,
+            vertexId: int
+        ) -> List[EditStep]:
+        """
+        Get the tasks touching a vertex, in execution order
+        
+        Args:
+            vertexId (int): Id of the vertex
+        
+        Returns:
+            List[EditStep]: Tasks reading/moving the vertex
+        """
+        
+        start, end = np.searchsorted(self._indexVertexIds, [vertexId, vertexId + 1])
+        
+        return [self._plan.steps[x] for x in self._indexStepIds[start:end].tolist()]
+    
+    def dependencies(self) -> Dict[int, Dict[int, int]]:
+        """
+        Get the direct dependencies of the tasks
+        
+        Returns:
+            Dict[int, Dict[int, int]]: Task position --> {previous task position : number of shared vertices}
+        """
+        
+        dependencies = {}
+        
+        for dependent, previous in zip(self._dependentSteps.tolist(), self._previousSteps.tolist()):
+            sharedCount = dependencies.setdefault(dependent, {})
+            sharedCount[previous] = sharedCount.get(previous, 0) + 1
+        
+        return dependencies
+    
+    def group_steps(self) -> List[List[EditStep]]:
+        """
+        Get the independent groups of tasks
+        
+        Returns:
+            List[List[EditStep]]: Tasks of each group, in execution order
+        """
+        
+        groupSteps = {}
+        
+        for step, group in zip(self._plan.steps, self._groups.tolist()):
+            groupSteps.setdefault(group, []).append(step)
+        
+        return list(groupSteps.values())
+    
+    @staticmethod
+    def task_label(step: EditStep) -> str:
+        return f"{step.taskType}[{step.taskId}]"
+    
+    def report(self) -> str:
+        """
+        Get the analysis report
+        
+        Returns:
+            str: Report (summary, overlapping tasks and independent groups)
+        """
+        
+        steps = self._plan.steps
+        dependencies = self.dependencies()
+        groupSteps = self.group_steps()
+        
+        reportStr = VSEP + "\n"
+        reportStr += "### EDIT ANALYSIS ###\n"
+        reportStr += VSEP + "\n"
+        reportStr += f"Tasks : {len(steps)}\n"
+        reportStr += f"Vertices touched : {np.unique(self._indexVertexIds).size}\n"
+        reportStr += f"Vertices touched by more than one task : {np.unique(self._sharedVertexIds).size}\n"
+        reportStr += f"Independent groups : {len(groupSteps)}\n"
+        reportStr += f"Largest group : {max([len(x) for x in groupSteps], default = 0)} tasks\n"
+        
+        reportStr += VSEP + "\n"
+        reportStr += "OVERLAPPING TASKS --> task <-- previous tasks (shared vertices)\n"
+        reportStr += VSEP + "\n"
+        for dependent, previousCount in sorted(dependencies.items()):
+            previousStr = ", ".join(f"{self.task_label(steps[x])} ({n})" for x, n in previousCount.items())
+            reportStr += f"{self.task_label(steps[dependent])} <-- {previousStr}\n"
+        
+        reportStr += VSEP + "\n"
+        reportStr += "INDEPENDENT GROUPS (more than one task)\n"
+        reportStr += VSEP + "\n"
+        for groupId, group in enumerate(groupSteps):
+            if len(group) > 1:
+                reportStr += f"Group-{groupId} : " + ", ".join(self.task_label(x) for x in group) + "\n"
+        
+        return reportStr
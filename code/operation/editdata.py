@@ -0,0 +1,375 @@
+import os
+import dis
+import json
+import types
+import tomllib
+import functools
+
+import numpy as np
+
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+from operation.editplan import editOperationRequirement
+
+from utility.define import (
+    indent,
+    taskTypeCheck,
+)
+
+
+### Readers of the data-only edit file formats --> suffix : reader
+editDataReader = {
+    ".json" : json.load,
+    ".toml" : tomllib.load,
+}
+
+### Builtins through which a Python edit file can read other files/modules or the environment
+dynamicBuiltin = ["__import__", "open", "exec", "eval", "compile", "input", "breakpoint"]
+
+### Accepted edit types of each task type
+editTypeCheck = {
+    x : sorted(editType for taskType, editType in editOperationRequirement if taskType == x)
+    for x in taskTypeCheck
+}
+
+
+def read_edit_data(
+        filePath: str
+    ) -> Dict:
+    """
+    Read a data-only (JSON/TOML) edit file.
+    
+    The file contains the same task tables as the Python edit file, e.g. (JSON)
+        {
+            "vertexEdit" : {
+                "0" : {"id" : 4, "edit-type" : "move", "delta" : [0.1, 0.0, 0.0]}
+            },
+            "boundary" : {
+                "0" : {"name" : "inlet", "type" : "patch", "faces" : [[0, "left"]]}
+            }
+        }
+    A task table can also be a list of tasks, the position of a task in
+    the list is its id (e.g. an array of tables '[[vertexEdit]]' in TOML).
+    
+    Args:
+        filePath (str): Path of the edit file (.json/.toml)
+    
+    Raises:
+        ValueError: If the file format is not supported or the file can't be parsed
+    
+    Returns:
+        Dict: Task tables --> task type : {task id : task}
+    """
+    
+    suffix = os.path.splitext(filePath)[1].lower()
+    
+    if suffix not in editDataReader:
+        raise ValueError(f"Unsupported edit file format --> {suffix}")
+    
+    with open(filePath, "rb") as ef:
+        try:
+            data = editDataReader[suffix](ef)
+        except (json.JSONDecodeError, tomllib.TOMLDecodeError, UnicodeDecodeError) as error:
+            raise ValueError(f"\n\nEdit file can't be parsed --> {filePath}\n{indent}{error}") from error
+    
+    return check_edit_data(data)
+
+
+def check_edit_data(
+        data: Dict
+    ) -> Dict:
+    """
+    Check the structure of (parsed) edit data and convert it into task tables.
+    The entries of the tasks are checked later, when the edit plan is compiled.
+    
+    Args:
+        data (Dict): Parsed content of a data-only edit file
+    
+    Raises:
+        ValueError: Listing all structural errors of the edit data
+    
+    Returns:
+        Dict: Task tables --> task type : {task id : task}
+    """
+    
+    if not isinstance(data, dict):
+        raise ValueError("\n\nEdit data must be a table/object of task types.")
+    
+    tables = {}
+    errors = []
+    
+    for taskType, taskEntry in data.items():
+        if taskType not in taskTypeCheck:
+            errors.append(f"unknown task type {taskType!r}, expected one of {taskTypeCheck}")
+            continue
+        
+        if isinstance(taskEntry, list):
+            taskEntry = dict(enumerate(taskEntry))
+        
+        if not isinstance(taskEntry, dict):
+            errors.append(f"{taskType} : must be a table/object or a list of tasks")
+            continue
+        
+        tables[taskType] = {}
+        
+        for taskId, task in taskEntry.items():
+            taskLabel = f"{taskType}[{taskId!r}]"
+            
+            ### Task ids are integers in the edit file
+            if isinstance(taskId, str) and taskId.isdigit():
+                taskId = int(taskId)
+            
+            if not isinstance(taskId, int):
+                errors.append(f"{taskLabel} : task id must be a non-negative integer")
+                continue
+            
+            if taskId in tables[taskType]:
+                errors.append(f"{taskLabel} : duplicate task id")
+                continue
+            
+            errors.extend(f"{taskLabel} : {x}" for x in check_task(taskType, task))
+            
+            tables[taskType][taskId] = task
+    
+    if errors:
+        raise ValueError("\n\nInvalid edit data:\n" + "\n".join(indent + x for x in errors))
+    
+    return tables
+
+
+def check_task(
+        taskType: str,
+        task: Dict
+    ) -> List[str]:
+    """
+    Check the structure of a task of the edit data
+    
+    Args:
+        taskType (str): Task type, e.g. "vertexEdit"
+        task (Dict): Task definition
+    
+    Returns:
+        List[str]: Errors of the task, empty if the task is valid
+    """
+    
+    if not isinstance(task, dict):
+        return ["task must be a table/object"]
+    
+    if taskType == "boundary":
+        return []
+    
+    editType = task.get("edit-type")
+    
+    if not isinstance(editType, str):
+        return ["missing entry 'edit-type'"]
+    
+    if editType.lower() not in editTypeCheck[taskType]:
+        return [f"unknown edit type {editType!r}, expected one of {editTypeCheck[taskType]}"]
+    
+    return []
+
+
+def is_data_only_code(
+        code: types.CodeType
+    ) -> bool:
+    """
+    Check if the code of a Python edit file only defines data, i.e. its
+    result depends on the file content alone: no import and no builtin
+    reading other files or the environment (see 'dynamicBuiltin').
+    
+    Args:
+        code (types.CodeType): Compiled code of the edit file
+    
+    Returns:
+        bool: True, if the code doesn't import modules or read files/the environment
+    """
+    
+    if any(x.opname in ("IMPORT_NAME", "IMPORT_FROM") for x in dis.get_instructions(code)):
+        return False
+    
+    if any(x in dynamicBuiltin for x in code.co_names):
+        return False
+    
+    return all(is_data_only_code(x) for x in code.co_consts if isinstance(x, types.CodeType))
+
+
+def encode_data(value):
+    """
+    Encode task tables as JSON, keeping the types JSON doesn't have
+    (dictionaries with integer keys, tuples), see 'decode_data'.
+    
+    Args:
+        value: Task tables/entry of plain data (dict, list, tuple, str, int, float, bool, None)
+    
+    Raises:
+        TypeError: If the value contains other objects (e.g. functions)
+    
+    Returns:
+        JSON serializable form of the value
+    """
+    
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    
+    if isinstance(value, list):
+        return [encode_data(x) for x in value]
+    
+    if isinstance(value, tuple):
+        return {"tuple" : [encode_data(x) for x in value]}
+    
+    if isinstance(value, dict):
+        return {"dict" : [[encode_data(k), encode_data(v)] for k, v in value.items()]}
+    
+    raise TypeError(f"{type(value).__name__} is not plain data --> {value!r}")
+
+
+def decode_data(value):
+    """
+    Decode task tables encoded with 'encode_data'
+    
+    Args:
+        value: Parsed JSON form of the task tables
+    
+    Raises:
+        ValueError: If the value is not in the encoded form
+    
+    Returns:
+        Task tables/entry
+    """
+    
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    
+    if isinstance(value, list):
+        return [decode_data(x) for x in value]
+    
+    if isinstance(value, dict) and list(value) == ["tuple"] and isinstance(value["tuple"], list):
+        return tuple(decode_data(x) for x in value["tuple"])
+    
+    if (isinstance(value, dict) and list(value) == ["dict"] and isinstance(value["dict"], list)
+            and all(isinstance(x, list) and len(x) == 2 for x in value["dict"])):
+        return {decode_data(k) : decode_data(v) for k, v in value["dict"]}
+    
+    raise ValueError(f"Invalid encoded data --> {value!r}")
+
+
+def canonical_task(
+        value,
+        seen: Optional[set] = None
+    ):
+    """
+    Get the canonical (JSON serializable) form of task definitions, used to
+    hash the tasks. The form depends on the meaning of the definitions, not
+    on how the edit file is written or on the run:
+        - dictionaries --> entries sorted by key
+        - numpy arrays/scalars --> Python lists/numbers
+        - functions --> module, qualified name, bytecode, constants, default
+          arguments, closure and referenced global values (no memory address)
+    
+    Args:
+        value: Task definition, e.g. a task table
+        seen (Optional[set], optional): Ids of the functions being converted (recursion guard). Defaults to None.
+    
+    Returns:
+        Canonical form of the value
+    """
+    
+    if seen is None:
+        seen = set()
+    
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    
+    if isinstance(value, (list, tuple)):
+        return [canonical_task(x, seen) for x in value]
+    
+    if isinstance(value, dict):
+        entries = [[canonical_task(k, seen), canonical_task(v, seen)] for k, v in value.items()]
+        return {"dict" : sorted(entries, key = lambda x: json.dumps(x, sort_keys = True))}
+    
+    if isinstance(value, types.ModuleType):
+        return {"module" : value.__name__}
+    
+    if isinstance(value, functools.partial):
+        return {
+            "partial" : canonical_task(value.func, seen),
+            "args" : canonical_task(value.args, seen),
+            "keywords" : canonical_task(value.keywords, seen),
+        }
+    
+    if isinstance(value, types.MethodType):
+        return {"method" : canonical_task(value.__func__, seen)}
+    
+    if isinstance(value, types.FunctionType):
+        function = {
+            "function" : value.__qualname__,
+            "module" : value.__module__,
+        }
+        
+        ### Recursive function --> referenced by its name
+        if id(value) in seen:
+            return function
+        seen.add(id(value))
+        
+        globalValues = {
+            x : canonical_task(value.__globals__[x], seen)
+            for x in code_names(value.__code__)
+            if x in value.__globals__
+        }
+        
+        function.update({
+            "code" : canonical_code(value.__code__),
+            "defaults" : canonical_task(value.__defaults__, seen),
+            "kwdefaults" : canonical_task(value.__kwdefaults__, seen),
+            "closure" : [canonical_task(x.cell_contents, seen) for x in (value.__closure__ or ())],
+            "globals" : globalValues,
+        })
+        seen.discard(id(value))
+        
+        return function
+    
+    if callable(value):
+        ### Built-in functions, numpy ufuncs, ...
+        return {
+            "callable" : getattr(value, "__qualname__", getattr(value, "__name__", type(value).__qualname__)),
+            "module" : getattr(value, "__module__", type(value).__module__),
+        }
+    
+    return {"object" : type(value).__qualname__, "repr" : repr(value)}
+
+
+def canonical_code(
+        code: types.CodeType
+    ) -> Dict:
+    """ Get the canonical form of a code object --> bytecode, constants and names (no line numbers) """
+    
+    return {
+        "bytecode" : code.co_code.hex(),
+        "constants" : [
+            canonical_code(x) if isinstance(x, types.CodeType) else canonical_task(x)
+            for x in code.co_consts
+        ],
+        "names" : list(code.co_names),
+        "variables" : list(code.co_varnames),
+    }
+
+
+def code_names(
+        code: types.CodeType
+    ) -> List[str]:
+    """ Get the (global) names used by a code object and its nested code objects """
+    
+    names = list(code.co_names)
+    
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names.extend(x for x in code_names(constant) if x not in names)
+    
+    return names
@@ -0,0 +1,324 @@
+import numpy as np
+
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+from entity.edge import Edge
+from entity.multiblock import MultiBlock
+
+from operation.editplan import (
+    EditPlan,
+    EditStep,
+)
+
+
+class JournalEntry:
+    """ Changes made by one edit task --> the state before the task """
+    
+    __slots__ = [
+        "taskType",
+        "taskId",
+        "opCode",
+        "taskRepr",
+        "vertexIds",
+        "coordinates",
+        "integerMask",
+        "parent",
+        "activeMask",
+        "edges",
+        "boundaryDefinition",
+    ]
+    
+    def __init__(
+            self,
+            step: EditStep,
+            taskRepr: str
+        ) -> None:
+        """
+        Initialize JournalEntry instance
+        
+        Args:
+            step (EditStep): Edit step of the task
+            taskRepr (str): Definition of the task (repr) when it was applied
+        """
+        
+        self.taskType = step.taskType
+        self.taskId = step.taskId
+        self.opCode = step.opCode
+        self.taskRepr = taskRepr
+        
+        ### Ids, previous coordinates and integer flags of the moved vertices
+        self.vertexIds = None
+        self.coordinates = None
+        self.integerMask = None
+        
+        ### Previous vertex merges/block activity, only if changed by the task
+        self.parent = None
+        self.activeMask = None
+        
+        ### Previous (type, definition) of the changed edges
+        self.edges: Dict[Edge, tuple] = {}
+        
+        ### Boundary definition added by the task
+        self.boundaryDefinition = None
+    
+    def __repr__(self):
+        return f"JournalEntry : {self.taskType}[{self.taskId}] - {len(self.vertexIds)} vertices, {len(self.edges)} edges"
+
+
+class EditJournal:
+    """
+    Journal of the edit tasks applied to a multi-block.
+    
+    Every task records the state it changes (vertex coordinates, vertex
+    merges, block activity, curved edges, boundary definition), so the
+    last tasks can be rolled back and applied again (e.g. with a new
+    radius) without making the multi-block again.
+    
+    Usage:
+        journal = EditJournal(mb)
+        edit.execute(mb, journal = journal)
+        
+        ### Only the tasks from blockEdit[0] onward are rolled back and applied again
+        edit.task.blockEdit[0]["radius"] = 1.2
+        edit.execute(mb, journal = journal)
+    
+    The tasks are applied one by one (no batching of the vertex edits).
+    """
+    
+    def __init__(
+            self,
+            mb: MultiBlock
+        ) -> None:
+        """
+        Initialize EditJournal instance
+        
+        Args:
+            mb (MultiBlock): MultiBlock object to edit
+        """
+        
+        self._mb = mb
+        self._entries: List[JournalEntry] = []
+        
+        ### State after the last journaled task, compared with the current
+        ### state to find the changes of a task
+        self._coordinates = None
+        self._integerMask = None
+        self._parent = None
+        self._activeMask = None
+    
+    def __repr__(self):
+        return f"EditJournal : {len(self._entries)} tasks"
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def entries(self) -> List[JournalEntry]:
+        return self._entries
+    
+    @property
+    def boundaryDefinition(self) -> List[str]:
+        """ Boundary definitions of the journaled tasks """
+        
+        return [x.boundaryDefinition for x in self._entries if x.boundaryDefinition is not None]
+    
+    def sync(self) -> None:
+        """ Take the current state of the multi-block as the state after the last task """
+        
+        self._coordinates = self._mb.vertexStore.coordinates.copy()
+        self._integerMask = self._mb.vertexStore.integerMask.copy()
+        self._parent = self._mb.vertexStore.parent.copy()
+        self._activeMask = self._mb.activeMask.copy()
+    
+    def first_change(
+            self,
+            plan: EditPlan,
+            taskModule
+        ) -> int:
+        """
+        Get the position of the first journaled task which differs from the plan
+        
+        Args:
+            plan (EditPlan): Compiled edit plan
+            taskModule: Edit file module containing the task definitions
+        
+        Returns:
+            int: Number of journaled tasks matching the first steps of the plan
+        """
+        
+        for position, (entry, step) in enumerate(zip(self._entries, plan.steps)):
+            if ((entry.taskType, entry.taskId, entry.opCode) != (step.taskType, step.taskId, step.opCode)
+                    or entry.taskRepr != self.task_repr(step, taskModule)):
+                return position
+        
+        return min(len(self._entries), len(plan))
+    
+    @staticmethod
+    def task_repr(
+            step: EditStep,
+            taskModule
+        ) -> str:
+        """ Get the definition (repr) of the task of an edit step """
+        
+        return repr(getattr(taskModule, step.taskType)[step.taskId])
+    
+    def apply(
+            self,
+            plan: EditPlan,
+            taskModule
+        ) -> int:
+        """
+        Apply an edit plan. Journaled tasks which are unchanged in the plan are
+        kept, the tasks from the first changed one onward are rolled back and
+        the remaining steps of the plan are applied.
+        
+        Args:
+            plan (EditPlan): Compiled edit plan (of the same multi-block)
+            taskModule: Edit file module the plan was compiled from
+        
+        Returns:
+            int: Number of applied steps
+        """
+        
+        self.rollback(self.first_change(plan, taskModule))
+        self.sync()
+        
+        steps = plan.steps[len(self._entries):]
+        
+        for step in steps:
+            self.record(step, plan, self.task_repr(step, taskModule))
+        
+        return len(steps)
+    
+    def record(
+            self,
+            step: EditStep,
+            plan: EditPlan,
+            taskRepr: str
+        ) -> None:
+        """
+        Execute an edit step and record its changes.
+        If the step fails, its changes are rolled back before the error is raised.
+        
+        Args:
+            step (EditStep): Edit step to execute
+            plan (EditPlan): Edit plan of the step
+            taskRepr (str): Definition of the task (repr)
+        """
+        
+        entry = JournalEntry(step, taskRepr)
+        boundaryCount = len(plan.boundaryDefinition)
+        
+        def observe_edge(edge: Edge) -> None:
+            if edge not in entry.edges:
+                entry.edges[edge] = (edge.type, edge.definition)
+        
+        Edge.changeObserver = observe_edge
+        try:
+            step.handler(step.arguments)
+        except Exception:
+            self.collect(entry)
+            self.undo(entry)
+            raise
+        finally:
+            Edge.changeObserver = None
+        
+        self.collect(entry)
+        
+        if len(plan.boundaryDefinition) > boundaryCount:
+            entry.boundaryDefinition = plan.boundaryDefinition[-1]
+        
+        self._entries.append(entry)
+        self._mb.boundaryDefinition = self.boundaryDefinition
+    
+    def collect(
+            self,
+            entry: JournalEntry
+        ) -> None:
+        """
+        Store the previous state of everything changed since the last task in the entry
+        
+        Args:
+            entry (JournalEntry): Entry of the executed task
+        """
+        
+        vertexStore = self._mb.vertexStore
+        
+        coordinates = vertexStore.coordinates
+        integerMask = vertexStore.integerMask
+        entry.vertexIds = np.flatnonzero(
+                ((coordinates != self._coordinates) | (integerMask != self._integerMask)).any(axis = 1)
+            )
+        entry.coordinates = self._coordinates[entry.vertexIds]
+        entry.integerMask = self._integerMask[entry.vertexIds]
+        self._coordinates[entry.vertexIds] = coordinates[entry.vertexIds]
+        self._integerMask[entry.vertexIds] = integerMask[entry.vertexIds]
+        
+        if not np.array_equal(vertexStore.parent, self._parent):
+            entry.parent = self._parent
+            self._parent = vertexStore.parent.copy()
+        
+        if not np.array_equal(self._mb.activeMask, self._activeMask):
+            entry.activeMask = self._activeMask
+            self._activeMask = self._mb.activeMask.copy()
+    
+    def undo(
+            self,
+            entry: JournalEntry
+        ) -> None:
+        """
+        Restore the state before the task of an entry
+        
+        Args:
+            entry (JournalEntry): Entry of the (last) task to undo
+        """
+        
+        vertexStore = self._mb.vertexStore
+        
+        vertexStore.coordinates[entry.vertexIds] = entry.coordinates
+        vertexStore.mark_modified(entry.vertexIds, entry.integerMask)
+        self._coordinates[entry.vertexIds] = entry.coordinates
+        self._integerMask[entry.vertexIds] = entry.integerMask
+        
+        if entry.parent is not None:
+            vertexStore.parent = entry.parent
+            self._parent = entry.parent.copy()
+        
+        if entry.activeMask is not None:
+            self._mb.activeMask[:] = entry.activeMask
+            self._activeMask = entry.activeMask.copy()
+        
+        for edge, (edgeType, edgeDefinition) in entry.edges.items():
+            edge.type = edgeType
+            edge.definition = edgeDefinition
+    
+    def rollback(
+            self,
+            position: Optional[int] = 0
+        ) -> None:
+        """
+        Roll back the journaled tasks after a position, the last task first
+        
+        Args:
+            position (Optional[int], optional): Number of tasks to keep. Defaults to 0 (roll back all tasks).
+        
+        Raises:
+            ValueError: If the position is not between 0 and the number of journaled tasks
+        """
+        
+        if not isinstance(position, int) or not 0 <= position <= len(self._entries):
+            raise ValueError(f"Rollback position must be between 0 and {len(self._entries)} --> {position!r}")
+        
+        if position == len(self._entries):
+            return
+        
+        self.sync()
+        
+        while len(self._entries) > position:
+            self.undo(self._entries.pop())
+        
+        self._mb.boundaryDefinition = self.boundaryDefinition
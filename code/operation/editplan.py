@@ -0,0 +1,794 @@
+import numpy as np
+
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from entity.multiblock import MultiBlock
+from entity.vertexstore import (
+    integer_mask,
+    is_integer,
+)
+
+from utility.define import (
+    blockFaceName,
+    indent,
+    slicePlaneAxisIndex,
+    taskTypeCheck,
+)
+from utility.curve import Curve
+
+
+EditPlanT = TypeVar("EditPlanT", bound = "EditPlan")
+
+### Required entries of the edit operations --> (task type, edit type) : required keys
+### A tuple of keys means that one of the keys is required
+editOperationRequirement = {
+    ("vertexEdit", "move") : ["id", ("new-location", "delta")],
+    ("vertexEdit", "collapse") : ["id", "target-vertex"],
+    ("vertexEdit", "move-collapse") : ["id", "target-vertex", ("new-location", "delta")],
+    ("vertexEdit", "scale") : ["id", "ratio", "reference"],
+    
+    ("edgeEdit", "move") : ["edge", "delta"],
+    ("edgeEdit", "collapse") : ["edge", "target-edge"],
+    ("edgeEdit", "move-collapse") : ["edge", "delta", "target-edge"],
+    ("edgeEdit", "scale") : ["edge", "ratio"],
+    ("edgeEdit", "make-arc") : ["edge", "method"],
+    ("edgeEdit", "make-spline") : ["edge", "method"],
+    ("edgeEdit", "make-polyline") : ["edge", "method"],
+    
+    ("faceEdit", "move") : ["face", "delta"],
+    ("faceEdit", "scale") : ["face", "ratio"],
+    
+    ("blockEdit", "move") : ["block-id", "delta"],
+    ("blockEdit", "scale-2d") : ["block-id", "plane", "ratio"],
+    ("blockEdit", "scale-3d") : ["block-id", "ratio"],
+    ("blockEdit", "make-quadrant") : ["starting-block-id", "ending-block-id", "radius"],
+    ("blockEdit", "make-semicircle") : ["starting-block-id", "ending-block-id", "radius"],
+    ("blockEdit", "make-circle") : ["starting-block-id", "ending-block-id", "radius"],
+    ("blockEdit", "make-circle-array") : [("circles", "starting-block-id")],
+    
+    ("boundary", "") : ["name", "type", "faces"],
+}
+
+### Required entries of the methods of the curved edges --> (task type, edit type) : {method : required keys}
+edgeMethodRequirement = {
+    ("edgeEdit", "make-arc") : {
+        "arc-point" : ["arc-point"],
+        "center-radius" : ["center", "angle"],
+    },
+    ("edgeEdit", "make-spline") : {
+        "spline-point" : ["spline-point"],
+        "curve" : ["curve", "tolerance"],
+    },
+    ("edgeEdit", "make-polyline") : {
+        "polyline-point" : ["polyline-point"],
+        "curve" : ["curve", "tolerance"],
+    },
+}
+
+### Entries (of the edit operations) containing a coordinate/vector
+pointEntry = ["new-location", "delta", "reference", "arc-point", "center"]
+
+### Entries (of the edit operations) containing a number
+numberEntry = ["ratio", "radius", "angle", "tolerance"]
+
+
+def is_number(value) -> bool:
+    """ True for an int/float entry (a bool is not taken as a number) """
+    
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+### Vertex operations applied together as array operations
+vertexBatchOpCode = [
+    ("vertexEdit", "move"),
+    ("vertexEdit", "scale"),
+]
+
+### Edge operations defined by a curve, the edges on the same curve are sampled together
+curveBatchOpCode = {
+    ("edgeEdit", "make-spline") : "spline-point",
+    ("edgeEdit", "make-polyline") : "polyline-point",
+}
+
+
+class EditStep:
+    """ One compiled edit operation --> handler and its resolved arguments """
+    
+    __slots__ = ["taskType", "taskId", "opCode", "handler", "arguments"]
+    
+    def __init__(
+            self,
+            taskType: str,
+            taskId,
+            opCode: tuple,
+            handler: Callable,
+            arguments: Dict
+        ) -> None:
+        """
+        Initialize EditStep instance
+        
+        Args:
+            taskType (str): Type of the task, e.g. "vertexEdit"
+            taskId: Id of the task in the edit file
+            opCode (tuple): (task type, edit type) of the operation
+            handler (Callable): Method executing the operation
+            arguments (Dict): Task entries, with the ids resolved to the Vertex/Edge/Face/Block objects
+        """
+        
+        self.taskType = taskType
+        self.taskId = taskId
+        self.opCode = opCode
+        self.handler = handler
+        self.arguments = arguments
+    
+    def __repr__(self):
+        return f"EditStep : {self.taskType}[{self.taskId}] - {self.opCode[1]}"
+
+
+class EditPlan:
+    """
+    Edit operations of an edit file, compiled for a multi-block.
+    
+    All tasks are validated and their vertex/edge/face/block references
+    are resolved before any operation is executed. Invalid tasks are
+    reported together, the multi-block is left unchanged in that case.
+    The operations are executed in one pass, in the order of the task
+    types (vertex, edge, face, block, boundary) and the task ids.
+    """
+    
+    def __init__(
+            self,
+            mb: MultiBlock,
+        ) -> None:
+        """
+        Initialize EditPlan instance
+        
+        Args:
+            mb (MultiBlock): MultiBlock object to edit
+        """
+        
+        self._mb = mb
+        self._steps: List[EditStep] = []
+        self._boundaryDefinition = []
+        self._curves: Dict[str, Curve] = {}
+        
+        self._handlers = {
+            ("vertexEdit", "move") : self.vertex_move,
+            ("vertexEdit", "collapse") : self.vertex_collapse,
+            ("vertexEdit", "move-collapse") : self.vertex_move_collapse,
+            ("vertexEdit", "scale") : self.vertex_scale,
+            
+            ("edgeEdit", "move") : self.edge_move,
+            ("edgeEdit", "collapse") : self.edge_collapse,
+            ("edgeEdit", "move-collapse") : self.edge_move_collapse,
+            ("edgeEdit", "scale") : self.edge_scale,
+            ("edgeEdit", "make-arc") : self.edge_arc,
+            ("edgeEdit", "make-spline") : self.edge_spline,
+            ("edgeEdit", "make-polyline") : self.edge_polyline,
+            
+            ("faceEdit", "move") : self.face_move,
+            ("faceEdit", "scale") : self.face_scale,
+            
+            ("blockEdit", "move") : self.block_move,
+            ("blockEdit", "scale-2d") : self.block_scale2d,
+            ("blockEdit", "scale-3d") : self.block_scale3d,
+            ("blockEdit", "make-quadrant") : self.block_quadrant,
+            ("blockEdit", "make-semicircle") : self.block_semicircle,
+            ("blockEdit", "make-circle") : self.block_circle,
+            ("blockEdit", "make-circle-array") : self.block_circle_array,
+            
+            ("boundary", "") : self.boundary,
+        }
+    
+    def __repr__(self):
+        return f"EditPlan : {len(self._steps)} steps"
+    
+    def __len__(self) -> int:
+        return len(self._steps)
+    
+    @property
+    def mb(self) -> MultiBlock:
+        return self._mb
+    
+    @property
+    def steps(self) -> List[EditStep]:
+        return self._steps
+    
+    @property
+    def boundaryDefinition(self) -> List[str]:
+        return self._boundaryDefinition
+    
+    def resolve_vertex(
+            self,
+            vertexId
+        ):
+        """ Get the Vertex object of a vertex id """
+        
+        if not isinstance(vertexId, int) or isinstance(vertexId, bool) or vertexId not in self._mb.vertices:
+            raise ValueError(f"vertex id {vertexId!r} is not in the multi-block")
+        
+        return self._mb.vertices[vertexId]
+    
+    def resolve_block(
+            self,
+            blockId
+        ):
+        """ Get the Block object of a block id """
+        
+        if not isinstance(blockId, int) or isinstance(blockId, bool) or blockId not in self._mb.blocks:
+            raise ValueError(f"block id {blockId!r} is not in the multi-block")
+        
+        return self._mb.blocks[blockId]
+    
+    def resolve_blocks(
+            self,
+            blockEntry
+        ) -> List:
+        """ Get the Block objects of a list of block ids or of a block selection, e.g. "2:5, :, 0" """
+        
+        if isinstance(blockEntry, str):
+            blockIds = self._mb.select[blockEntry].tolist()
+            if not blockIds:
+                raise ValueError(f"block selection {blockEntry!r} is empty")
+            return [self._mb.blocks[x] for x in blockIds]
+        
+        return [self.resolve_block(x) for x in blockEntry]
+    
+    def resolve_edge(
+            self,
+            edgeEntry: Dict
+        ):
+        """ Get the Edge object of an edge entry --> {"block-id" : #, "position" : [#, #]} """
+        
+        if not isinstance(edgeEntry, dict) or "block-id" not in edgeEntry or "position" not in edgeEntry:
+            raise ValueError(f"edge must be defined by 'block-id' and 'position' --> {edgeEntry!r}")
+        
+        return self.resolve_block(edgeEntry["block-id"]).find_edge(edgeEntry["position"])
+    
+    def resolve_face(
+            self,
+            faceEntry: Dict
+        ):
+        """ Get the Face object of a face entry --> {"block-id" : #, "side" : #} """
+        
+        if not isinstance(faceEntry, dict) or "block-id" not in faceEntry or "side" not in faceEntry:
+            raise ValueError(f"face must be defined by 'block-id' and 'side' --> {faceEntry!r}")
+        
+        if faceEntry["side"] not in blockFaceName:
+            raise ValueError(f"face side {faceEntry['side']!r} must be any of {blockFaceName}")
+        
+        return self.resolve_block(faceEntry["block-id"]).faces[faceEntry["side"]]
+    
+    def resolve_curve(
+            self,
+            curveEntry
+        ) -> Curve:
+        """
+        Get the Curve object of a curve entry (a definition dictionary or a function).
+        Tasks with the same curve definition share one Curve object.
+        """
+        
+        curveKey = repr(curveEntry)
+        
+        if curveKey not in self._curves:
+            self._curves[curveKey] = Curve.from_definition(curveEntry)
+        
+        return self._curves[curveKey]
+    
+    def resolve_circles(
+            self,
+            task: Dict
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the block selections of a circle array task and check them against the block grid.
+        The circles are defined either
+            - one by one --> "circles" : [[starting-block-id, ending-block-id, radius], ...]
+            - by a pattern --> "starting-block-id", "ending-block-id" (first circle), "radius",
+              "pitch" (blocks between the circles along x, y, z), "count" (circles along x, y, z)
+        """
+        
+        if "circles" in task:
+            circles = task["circles"]
+            if (not isinstance(circles, Sequence) or len(circles) == 0
+                    or not all(isinstance(x, Sequence) and len(x) == 3 and isinstance(x[0], int)
+                               and isinstance(x[1], int) and is_number(x[2]) for x in circles)):
+                raise ValueError("'circles' must be a list of [starting-block-id, ending-block-id, radius]")
+            
+            startingBlockIds, endingBlockIds, radius = (np.array(x) for x in zip(*circles))
+        
+        else:
+            for key in ["ending-block-id", "radius", "pitch", "count"]:
+                if key not in task:
+                    raise ValueError(f"missing entry '{key}'")
+            
+            for key, minimum in [("pitch", 0), ("count", 1)]:
+                if (not isinstance(task[key], Sequence) or len(task[key]) != 3
+                        or not all(isinstance(x, int) and x >= minimum for x in task[key])):
+                    raise ValueError(f"'{key}' must be a list of 3 integers (>= {minimum}) --> {task[key]!r}")
+            
+            startingBlockIds, endingBlockIds = self._mb.circle_pattern(
+                    task["starting-block-id"],
+                    task["ending-block-id"],
+                    task["pitch"],
+                    task["count"]
+                )
+            radius = np.full(len(startingBlockIds), float(task["radius"]))
+        
+        self._mb.check_circle_array(
+                startingBlockIds,
+                endingBlockIds
+            )
+        
+        return startingBlockIds, endingBlockIds, radius
+    
+    def resolve_task(
+            self,
+            opCode: tuple,
+            task: Dict
+        ) -> Dict:
+        """
+        Check the entries of a task and resolve the references
+        
+        Args:
+            opCode (tuple): (task type, edit type) of the operation
+            task (Dict): Task definition from the edit file
+        
+        Raises:
+            ValueError: For a missing entry or an invalid reference
+        
+        Returns:
+            Dict: Task entries with the references resolved
+        """
+        
+        for requirement in editOperationRequirement[opCode]:
+            keys = requirement if isinstance(requirement, tuple) else (requirement,)
+            if not any(x in task for x in keys):
+                raise ValueError("missing entry " + " or ".join(f"'{x}'" for x in keys))
+        
+        for key in pointEntry:
+            if key in task:
+                if (not isinstance(task[key], Sequence) or len(task[key]) != 3
+                        or not all(is_number(x) for x in task[key])):
+                    raise ValueError(f"'{key}' must be a list of 3 numbers --> {task[key]!r}")
+        
+        for key in numberEntry:
+            if key in task and not is_number(task[key]):
+                raise ValueError(f"'{key}' must be a number --> {task[key]!r}")
+        
+        arguments = dict(task)
+        taskType = opCode[0]
+        
+        if taskType == "vertexEdit":
+            arguments["id"] = self.resolve_vertex(task["id"])
+            if "target-vertex" in task:
+                arguments["target-vertex"] = self.resolve_vertex(task["target-vertex"])
+        
+        elif taskType == "edgeEdit":
+            for key in task:
+                if "edge" in key:
+                    arguments[key] = self.resolve_edge(task[key])
+            
+            if opCode in edgeMethodRequirement:
+                methodRequirement = edgeMethodRequirement[opCode]
+                if not isinstance(task["method"], str) or task["method"] not in methodRequirement:
+                    raise ValueError(f"'method' must be any of {list(methodRequirement)} --> {task['method']!r}")
+                
+                for key in methodRequirement[task["method"]]:
+                    if key not in task:
+                        raise ValueError(f"missing entry '{key}'")
+            
+            if "tolerance" in task and not task["tolerance"] > 0:
+                raise ValueError(f"'tolerance' must be positive --> {task['tolerance']!r}")
+            
+            if "parameter-range" in task:
+                if (not isinstance(task["parameter-range"], Sequence) or len(task["parameter-range"]) != 2
+                        or not all(is_number(x) for x in task["parameter-range"])):
+                    raise ValueError(f"'parameter-range' must be a list of 2 numbers --> {task['parameter-range']!r}")
+            
+            if task.get("method") == "curve":
+                arguments["curve"] = self.resolve_curve(task["curve"])
+        
+        elif taskType == "faceEdit":
+            arguments["face"] = self.resolve_face(task["face"])
+        
+        elif taskType == "blockEdit":
+            if "block-id" in task:
+                if isinstance(task["block-id"], (list, str)):
+                    arguments["block-id"] = self.resolve_blocks(task["block-id"])
+                else:
+                    arguments["block-id"] = self.resolve_block(task["block-id"])
+            
+            if "plane" in task and (not isinstance(task["plane"], str) or task["plane"] not in slicePlaneAxisIndex):
+                raise ValueError(f"'plane' must be any of {list(slicePlaneAxisIndex)} --> {task['plane']!r}")
+            
+            for key in ["starting-block-id", "ending-block-id"]:
+                if key in task:
+                    self.resolve_block(task[key])
+            
+            if opCode == ("blockEdit", "make-circle-array"):
+                arguments["circles"] = self.resolve_circles(task)
+        
+        elif taskType == "boundary":
+            if not isinstance(task["faces"], list):
+                raise ValueError(f"'faces' must be a list of [block-id, face-name] --> {task['faces']!r}")
+            
+            for iface in task["faces"]:
+                if not isinstance(iface, Sequence) or isinstance(iface, str) or len(iface) != 2:
+                    raise ValueError(f"boundary face must be [block-id, face-name] --> {iface!r}")
+            arguments["faces"] = [
+                    self.resolve_face({"block-id" : x[0], "side" : x[1]})
+                    for x in task["faces"]
+                ]
+        
+        return arguments
+    
+    def compile(
+            self,
+            taskModule,
+            taskTypes: List[str]
+        ) -> EditPlanT:
+        """
+        Compile the tasks of an edit file into edit steps
+        
+        Args:
+            taskModule: Edit file module containing the task definitions
+            taskTypes (List[str]): Task types to compile, e.g. ["vertexEdit", "boundary"]
+        
+        Raises:
+            ValueError: Listing all invalid tasks
+        
+        Returns:
+            EditPlanT: The compiled plan (self)
+        """
+        
+        self._steps = []
+        errors = []
+        
+        for taskType in [x for x in taskTypeCheck if x in taskTypes]:
+            for taskId, task in getattr(taskModule, taskType, {}).items():
+                taskLabel = f"{taskType}[{taskId!r}]"
+                
+                if not isinstance(task, dict):
+                    errors.append(f"{taskLabel} : task must be a dictionary")
+                    continue
+                
+                if taskType == "boundary":
+                    opCode = (taskType, "")
+                elif isinstance(task.get("edit-type"), str):
+                    opCode = (taskType, task["edit-type"].lower())
+                else:
+                    errors.append(f"{taskLabel} : missing entry 'edit-type'")
+                    continue
+                
+                if opCode not in self._handlers:
+                    errors.append(f"{taskLabel} : unknown edit type {task['edit-type']!r}")
+                    continue
+                
+                try:
+                    arguments = self.resolve_task(opCode, task)
+                except ValueError as error:
+                    errors.append(f"{taskLabel} : {error}")
+                    continue
+                
+                self._steps.append(EditStep(
+                        taskType,
+                        taskId,
+                        opCode,
+                        self._handlers[opCode],
+                        arguments
+                    ))
+        
+        if errors:
+            raise ValueError("\n\nInvalid edit task(s):\n" + "\n".join(indent + x for x in errors))
+        
+        return self
+    
+    def batch_handler(
+            self,
+            step: EditStep
+        ) -> Optional[Callable]:
+        """ Get the handler applying the step together with the consecutive steps of the same kind """
+        
+        if step.opCode in vertexBatchOpCode:
+            return self.vertex_batch
+        
+        if step.opCode in curveBatchOpCode and step.arguments["method"] == "curve":
+            return self.curve_batch
+        
+        return None
+    
+    def execute(self) -> None:
+        """
+        Execute the compiled edit steps.
+        Consecutive vertex move/scale steps are applied together
+        (see 'EditPlan.vertex_batch'), as well as consecutive curve
+        edges (see 'EditPlan.curve_batch'), all other steps one by one.
+        """
+        
+        batch = []
+        batchHandler = None
+        
+        for step in self._steps:
+            handler = self.batch_handler(step)
+            
+            if handler != batchHandler:
+                if batch:
+                    batchHandler(batch)
+                batch = []
+                batchHandler = handler
+            
+            if handler is None:
+                step.handler(step.arguments)
+            else:
+                batch.append(step)
+        
+        if batch:
+            batchHandler(batch)
+    
+    def curve_batch(
+            self,
+            steps: List[EditStep]
+        ) -> None:
+        """
+        Define the spline/polyline edges of curve steps.
+        The edges on the same curve (and with the same tolerance) are
+        sampled together (see 'Curve.sample'), the edge definitions are
+        set in the order of the steps.
+        
+        Args:
+            steps (List[EditStep]): Spline/polyline steps with the "curve" method, in execution order
+        """
+        
+        curveGroups = {}
+        for position, step in enumerate(steps):
+            curveKey = (id(step.arguments["curve"]), step.arguments["tolerance"])
+            curveGroups.setdefault(curveKey, []).append(position)
+        
+        coordinates = self._mb.vertexStore.coordinates
+        curvePoints = [None] * len(steps)
+        
+        for positions in curveGroups.values():
+            groupArguments = [steps[x].arguments for x in positions]
+            
+            groupPoints = groupArguments[0]["curve"].sample(
+                    coordinates[[x["edge"].start.id for x in groupArguments]],
+                    coordinates[[x["edge"].end.id for x in groupArguments]],
+                    groupArguments[0]["tolerance"],
+                    [x.get("parameter-range", [np.nan, np.nan]) for x in groupArguments]
+                )
+            
+            for position, points in zip(positions, groupPoints):
+                curvePoints[position] = tuple(tuple(x) for x in points.tolist())
+        
+        for step, points in zip(steps, curvePoints):
+            pointKey = curveBatchOpCode[step.opCode]
+            
+            ### Same as the point list method, with the sampled points
+            step.handler({
+                    **step.arguments,
+                    "method" : pointKey,
+                    pointKey : points,
+                })
+    
+    def vertex_batch(
+            self,
+            steps: List[EditStep]
+        ) -> None:
+        """
+        Apply vertex move (new location/delta) and scale steps directly
+        on the coordinate array.
+        
+        The steps are grouped by the number of earlier steps on the same
+        vertex. Each group touches every vertex at most once and is applied
+        with one array operation per edit type, the groups are applied in
+        order. The result is identical to applying the steps one by one,
+        including the integer flags of the coordinates (an integer stays an
+        integer if moved/scaled by integers, see 'VertexStore').
+        
+        Args:
+            steps (List[EditStep]): Vertex move/scale steps, in execution order
+        """
+        
+        if len(steps) == 0:
+            return
+        
+        nStep = len(steps)
+        vertexIds = np.array([x.arguments["id"].id for x in steps], dtype = np.int64)
+        
+        ### 0 --> new location, 1 --> delta, 2 --> scale
+        editType = np.empty(nStep, dtype = np.int8)
+        value = np.empty((nStep, 3), dtype = np.float64)
+        ratio = np.ones(nStep, dtype = np.float64)
+        isInteger = np.empty((nStep, 3), dtype = bool)
+        
+        for i, step in enumerate(steps):
+            arguments = step.arguments
+            if step.opCode[1] == "scale":
+                editType[i] = 2
+                value[i] = arguments["reference"]
+                ratio[i] = arguments["ratio"]
+                isInteger[i] = integer_mask(arguments["reference"]) & is_integer(arguments["ratio"])
+            elif "new-location" in arguments:
+                editType[i] = 0
+                value[i] = arguments["new-location"]
+                isInteger[i] = integer_mask(arguments["new-location"])
+            else:
+                editType[i] = 1
+                value[i] = arguments["delta"]
+                isInteger[i] = integer_mask(arguments["delta"])
+        
+        ### Number of earlier steps on the same vertex
+        order = np.argsort(vertexIds, kind = "stable")
+        sortedIds = vertexIds[order]
+        isFirst = np.ones(nStep, dtype = bool)
+        isFirst[1:] = sortedIds[1:] != sortedIds[:-1]
+        firstPosition = np.maximum.accumulate(np.where(isFirst, np.arange(nStep), 0))
+        rank = np.empty(nStep, dtype = np.int64)
+        rank[order] = np.arange(nStep) - firstPosition
+        
+        ### Steps ordered by level, then by edit type
+        order = np.lexsort((editType, rank))
+        vertexIds = vertexIds[order]
+        editType = editType[order]
+        value = value[order]
+        ratio = ratio[order]
+        isInteger = isInteger[order]
+        bounds = np.flatnonzero(np.diff(rank[order] * 3 + editType, prepend = -1, append = -1))
+        
+        coordinates = self._mb.vertexStore.coordinates
+        integerMask = self._mb.vertexStore.integerMask
+        
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            ids = vertexIds[start:end]
+            
+            if editType[start] == 0:
+                coordinates[ids] = value[start:end]
+                integerMask[ids] = isInteger[start:end]
+            else:
+                if editType[start] == 1:
+                    coordinates[ids] += value[start:end]
+                else:
+                    reference = value[start:end]
+                    coordinates[ids] = reference + ratio[start:end, np.newaxis] * (coordinates[ids] - reference)
+                integerMask[ids] &= isInteger[start:end]
+        
+        self._mb.vertexStore.mark_modified(vertexIds, integerMask[vertexIds])
+    
+    ### Vertex operations
+    def vertex_move(self, arguments: Dict) -> None:
+        arguments["id"].move(
+                arguments.get("new-location"),
+                None if "new-location" in arguments else arguments["delta"]
+            )
+    
+    def vertex_collapse(self, arguments: Dict) -> None:
+        arguments["id"].collapse(arguments["target-vertex"])
+    
+    def vertex_move_collapse(self, arguments: Dict) -> None:
+        arguments["id"].move_collapse(
+                arguments["target-vertex"],
+                arguments.get("new-location"),
+                None if "new-location" in arguments else arguments["delta"]
+            )
+    
+    def vertex_scale(self, arguments: Dict) -> None:
+        arguments["id"].scale(
+                arguments["ratio"],
+                arguments["reference"]
+            )
+    
+    ### Edge operations
+    def edge_move(self, arguments: Dict) -> None:
+        arguments["edge"].move(arguments["delta"])
+    
+    def edge_collapse(self, arguments: Dict) -> None:
+        arguments["edge"].collapse(arguments["target-edge"])
+    
+    def edge_move_collapse(self, arguments: Dict) -> None:
+        arguments["edge"].move_collapse(
+                arguments["delta"],
+                arguments["target-edge"]
+            )
+    
+    def edge_scale(self, arguments: Dict) -> None:
+        arguments["edge"].scale(arguments["ratio"])
+    
+    def edge_arc(self, arguments: Dict) -> None:
+        arguments["edge"].arc(arguments)
+    
+    def edge_spline(self, arguments: Dict) -> None:
+        arguments["edge"].spline(arguments)
+    
+    def edge_polyline(self, arguments: Dict) -> None:
+        arguments["edge"].polyline(arguments)
+    
+    ### Face operations
+    def face_move(self, arguments: Dict) -> None:
+        arguments["face"].move(arguments["delta"])
+    
+    def face_scale(self, arguments: Dict) -> None:
+        arguments["face"].scale(arguments["ratio"])
+    
+    ### Block operations
+    def block_move(self, arguments: Dict) -> None:
+        if isinstance(arguments["block-id"], list):
+            ### Vertices shared by the blocks are moved once
+            vertexIds = np.unique(self._mb.hexConnectivity[[x.id for x in arguments["block-id"]]])
+            vertexStore = self._mb.vertexStore
+            vertexStore.coordinates[vertexIds] += np.asarray(arguments["delta"], dtype = np.float64)
+            vertexStore.mark_modified(vertexIds, vertexStore.integerMask[vertexIds] & integer_mask(arguments["delta"]))
+        else:
+            arguments["block-id"].move(delta = arguments["delta"])
+    
+    def block_scale2d(self, arguments: Dict) -> None:
+        self._mb.scale_blocks(
+                self.block_ids(arguments["block-id"]),
+                arguments["ratio"],
+                arguments["plane"],
+                arguments.get("reference"),
+            )
+    
+    def block_scale3d(self, arguments: Dict) -> None:
+        self._mb.scale_blocks(
+                self.block_ids(arguments["block-id"]),
+                arguments["ratio"],
+                reference = arguments.get("reference"),
+            )
+    
+    @staticmethod
+    def block_ids(blockEntry) -> List[int]:
+        """ Get the ids of a (resolved) block or list of blocks """
+        
+        return [x.id for x in blockEntry] if isinstance(blockEntry, list) else [blockEntry.id]
+    
+    def block_quadrant(self, arguments: Dict) -> None:
+        self._mb.make_quadrant(
+                arguments["starting-block-id"],
+                arguments["ending-block-id"],
+                arguments["radius"],
+            )
+    
+    def block_semicircle(self, arguments: Dict) -> None:
+        self._mb.make_semicircle(
+                arguments["starting-block-id"],
+                arguments["ending-block-id"],
+                arguments["radius"],
+            )
+    
+    def block_circle(self, arguments: Dict) -> None:
+        self._mb.make_circle(
+                arguments["starting-block-id"],
+                arguments["ending-block-id"],
+                arguments["radius"],
+            )
+    
+    def block_circle_array(self, arguments: Dict) -> None:
+        self._mb.make_circle_array(*arguments["circles"])
+    
+    ### Boundary definition
+    def boundary(self, arguments: Dict) -> None:
+        ### Boundaries are the last steps, the vertex merges are final
+        labels = self._mb.vertexStore.compact_labels()[0]
+        
+        boundaryDef = (indent * 1) + arguments["name"] + "\n"
+        boundaryDef += (indent * 1) + "{\n"
+        boundaryDef += (indent *2) + f"type    {arguments['type']};\n"
+        boundaryDef += (indent *2) + f"faces\n"
+        boundaryDef += (indent *2) + f"(\n"
+        
+        for iface in arguments["faces"]:
+            orderedVerticesString = "(" + " ".join([str(labels[x.id]) for x in iface.vertices]) + ")"
+            boundaryDef += (indent *3) + orderedVerticesString + "\n"
+        
+        boundaryDef += (indent *2) + f");\n"
+        boundaryDef += (indent * 1) + "}\n"
+        
+        self._boundaryDefinition.append(boundaryDef)
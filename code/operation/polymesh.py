@@ -0,0 +1,659 @@
+import os
+import re
+import numpy as np
+
+from typing import (
+    List,
+    Tuple,
+    TypeVar,
+)
+
+from entity.multiblock import MultiBlock
+from operation.setup import foamFileHeader
+from utility.define import blockFaceDefinition
+
+
+PolyMeshT = TypeVar("PolyMeshT", bound = "PolyMesh")
+
+### Local (x, y, z) corner bits of the block vertices, in the order of the block vertex tuple
+blockCornerBits = np.array([
+        (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+        (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1),
+    ])
+
+### Relative volume at a block corner, below which the corner is taken as flat
+cornerVolumeTolerance = 1e-9
+
+### Block faces, in the order of the face side ids
+blockSideName = ["left", "right", "bottom", "top", "back", "front"]
+
+### Patch written by blockMesh for the boundary faces not in any boundary definition
+defaultPatch = ("defaultFaces", "empty")
+
+### Patch types written with their group (as blockMesh does)
+groupedPatchType = ["wall", "empty", "symmetry", "symmetryPlane", "wedge", "cyclic", "cyclicAMI"]
+
+
+def unique_rows(
+        rows: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get the unique rows of an integer array, as np.unique(rows, axis = 0)
+    but sorted column by column (much faster for millions of rows)
+    
+    Args:
+        rows (np.ndarray): (nRows, nColumns) integer array
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            First row of each unique row, unique row index of each row, number of each unique row
+    """
+    
+    order = np.lexsort(rows.T[::-1])
+    sortedRows = rows[order]
+    
+    isFirst = np.ones(len(rows), dtype = bool)
+    isFirst[1:] = (sortedRows[1:] != sortedRows[:-1]).any(axis = 1)
+    
+    inverse = np.empty(len(rows), dtype = np.int64)
+    inverse[order] = np.cumsum(isFirst) - 1
+    
+    firstRows = np.flatnonzero(isFirst)
+    counts = np.diff(np.append(firstRows, len(rows)))
+    
+    return order[firstRows], inverse, counts
+
+
+def block_face_nodes(
+        nodeIds: np.ndarray
+    ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    """
+    Get the faces of the cells of blocks with the same cell counts.
+    The nodes of a face are ordered so that its normal points
+    from the owner cell to the neighbour cell (out of the block
+    for the faces on the block sides).
+    
+    Args:
+        nodeIds (np.ndarray): (nBlocks, nz + 1, ny + 1, nx + 1) point ids of the block nodes
+    
+    Returns:
+        Tuple[List[np.ndarray], List[np.ndarray]]:
+            (..., 4) internal faces along x, y, z and (..., 4) faces of the 6 block sides (see 'blockSideName')
+    """
+    
+    N = nodeIds
+    
+    internalFaces = [
+            ### Normal along +x
+            np.stack((N[:, :-1, :-1, 1:-1], N[:, :-1, 1:, 1:-1], N[:, 1:, 1:, 1:-1], N[:, 1:, :-1, 1:-1]), axis = -1),
+            ### Normal along +y
+            np.stack((N[:, :-1, 1:-1, :-1], N[:, 1:, 1:-1, :-1], N[:, 1:, 1:-1, 1:], N[:, :-1, 1:-1, 1:]), axis = -1),
+            ### Normal along +z
+            np.stack((N[:, 1:-1, :-1, :-1], N[:, 1:-1, :-1, 1:], N[:, 1:-1, 1:, 1:], N[:, 1:-1, 1:, :-1]), axis = -1),
+        ]
+    
+    sideFaces = [
+            np.stack((N[:, :-1, :-1, 0], N[:, 1:, :-1, 0], N[:, 1:, 1:, 0], N[:, :-1, 1:, 0]), axis = -1),
+            np.stack((N[:, :-1, :-1, -1], N[:, :-1, 1:, -1], N[:, 1:, 1:, -1], N[:, 1:, :-1, -1]), axis = -1),
+            np.stack((N[:, :-1, 0, :-1], N[:, :-1, 0, 1:], N[:, 1:, 0, 1:], N[:, 1:, 0, :-1]), axis = -1),
+            np.stack((N[:, :-1, -1, :-1], N[:, 1:, -1, :-1], N[:, 1:, -1, 1:], N[:, :-1, -1, 1:]), axis = -1),
+            np.stack((N[:, 0, :-1, :-1], N[:, 0, 1:, :-1], N[:, 0, 1:, 1:], N[:, 0, :-1, 1:]), axis = -1),
+            np.stack((N[:, -1, :-1, :-1], N[:, -1, :-1, 1:], N[:, -1, 1:, 1:], N[:, -1, 1:, :-1]), axis = -1),
+        ]
+    
+    return internalFaces, sideFaces
+
+
+def block_side_cells(
+        cellIds: np.ndarray
+    ) -> List[np.ndarray]:
+    """ Get the cells next to the 6 block sides (see 'blockSideName'), cellIds --> (nBlocks, nz, ny, nx) """
+    
+    return [
+            cellIds[:, :, :, 0], cellIds[:, :, :, -1],
+            cellIds[:, :, 0, :], cellIds[:, :, -1, :],
+            cellIds[:, 0, :, :], cellIds[:, -1, :, :],
+        ]
+
+
+class PolyMesh:
+    """
+    OpenFOAM polyMesh (points, faces, owner, neighbour, boundary) of a
+    multi-block, generated without blockMesh.
+    
+    The points of a block are interpolated (trilinear) from its corners,
+    which is what blockMesh does for straight edges with uniform grading.
+    Points on the block sides are identified by the vertex labels of the
+    side/edge/corner they lie on and their index along it, so the points
+    and faces shared by neighbouring blocks are merged without any
+    geometric search. Blocks with the same cell counts are processed
+    together.
+    
+    The cell counts of the blocks are the ones written in blockMeshDict
+    (see 'BlockGeometry.cell_count'): every block gets the counts of the
+    last block of the lattice, also for non-uniform split planes. The
+    polyMesh is the mesh blockMesh makes from the written blockMeshDict.
+    
+    Curved edges and collapsed (degenerate) blocks are not supported,
+    blockMesh has to be used for those.
+    
+    Usage:
+        polyMesh = PolyMesh(mb, edit.boundaryDefinition, convertToMeters).build()
+        polyMesh.write(caseDir + "/constant/polyMesh")
+    """
+    
+    def __init__(
+            self,
+            mb: MultiBlock,
+            boundaryDefinition: List[str],
+            convertToMeters: float = 1.0
+        ) -> None:
+        """
+        Initialize PolyMesh instance
+        
+        Args:
+            mb (MultiBlock): MultiBlock object (edits applied)
+            boundaryDefinition (List[str]): Boundary definitions of blockMeshDict
+            convertToMeters (float, optional): Scaling factor of the point coordinates. Defaults to 1.0.
+        """
+        
+        self._mb = mb
+        self._boundaryDefinition = boundaryDefinition
+        self._convertToMeters = float(convertToMeters)
+        
+        self._points = None
+        self._faces = None
+        self._owner = None
+        self._neighbour = None
+        self._patches = []
+    
+    def __repr__(self):
+        if self._points is None:
+            return "PolyMesh : not built"
+        return (
+                f"PolyMesh : {self.nPoints} points, {self.nCells} cells, "
+                f"{self.nFaces} faces ({self.nInternalFaces} internal), {len(self._patches)} patches"
+            )
+    
+    @property
+    def points(self) -> np.ndarray:
+        return self._points
+    
+    @property
+    def faces(self) -> np.ndarray:
+        return self._faces
+    
+    @property
+    def owner(self) -> np.ndarray:
+        return self._owner
+    
+    @property
+    def neighbour(self) -> np.ndarray:
+        return self._neighbour
+    
+    @property
+    def patches(self) -> List[Tuple[str, str, int, int]]:
+        """ (name, type, number of faces, start face) of the patches """
+        return self._patches
+    
+    @property
+    def nPoints(self) -> int:
+        return len(self._points)
+    
+    @property
+    def nCells(self) -> int:
+        return self._nCells
+    
+    @property
+    def nFaces(self) -> int:
+        return len(self._faces)
+    
+    @property
+    def nInternalFaces(self) -> int:
+        return len(self._neighbour)
+    
+    def check(
+            self,
+            blockIds: np.ndarray,
+            cornerLabels: np.ndarray,
+            cornerGrid: np.ndarray
+        ) -> None:
+        """
+        Check that the active blocks can be meshed without blockMesh
+        
+        Args:
+            blockIds (np.ndarray): Ids of the active blocks
+            cornerLabels (np.ndarray): (nBlocks, 8) vertex labels of the blocks
+            cornerGrid (np.ndarray): (nBlocks, 2, 2, 2, 3) vertex coordinates of the blocks at the (x, y, z) corner bits
+        
+        Raises:
+            ValueError: For curved edges, collapsed, flat or inside-out blocks
+        """
+        
+        if blockIds.size == 0:
+            raise ValueError("polyMesh can't be written, there is no active block.")
+        
+        activeVertices = np.zeros(len(self._mb.vertexStore), dtype = bool)
+        activeVertices[self._mb.hexConnectivity[blockIds]] = True
+        
+        curvedEdges = [
+                x for x in self._mb.edgeRegistry.values()
+                if x.type in ["arc", "spline", "polyline"] and activeVertices[[x.start.id, x.end.id]].all()
+            ]
+        if curvedEdges:
+            raise ValueError(f"polyMesh can't be written for curved edges, use blockMesh --> {curvedEdges[0]}")
+        
+        sortedLabels = np.sort(cornerLabels, axis = 1)
+        isCollapsed = (sortedLabels[:, 1:] == sortedLabels[:, :-1]).any(axis = 1)
+        if isCollapsed.any():
+            raise ValueError(f"polyMesh can't be written for collapsed blocks, use blockMesh --> block {blockIds[isCollapsed][0]}")
+        
+        ### Volume sign at the 8 corners --> edges along x, y, z from each corner
+        ### A flat corner (e.g. a triangular block face) is accepted, as in blockMesh
+        xEdges = (cornerGrid[:, 1] - cornerGrid[:, 0])[:, np.newaxis]
+        yEdges = (cornerGrid[:, :, 1] - cornerGrid[:, :, 0])[:, :, np.newaxis]
+        zEdges = (cornerGrid[:, :, :, 1] - cornerGrid[:, :, :, 0])[:, :, :, np.newaxis]
+        volume = np.einsum("...i,...i->...", xEdges, np.cross(yEdges, zEdges)).reshape(len(blockIds), -1)
+        tolerance = cornerVolumeTolerance * (
+                np.linalg.norm(xEdges, axis = -1)
+                * np.linalg.norm(yEdges, axis = -1)
+                * np.linalg.norm(zEdges, axis = -1)
+            ).reshape(len(blockIds), -1)
+        isInverted = (volume < -tolerance).any(axis = 1) | (volume <= tolerance).all(axis = 1)
+        if isInverted.any():
+            raise ValueError(f"polyMesh can't be written, block {blockIds[isInverted][0]} is flat or inside-out")
+    
+    @staticmethod
+    def node_keys(
+            cellCount: np.ndarray,
+            cornerLabels: np.ndarray
+        ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the keys identifying the nodes on the sides of blocks with the same cell counts.
+        
+        A node key is independent of the block it's computed from:
+            corner --> (0, vertex label)
+            edge --> (1, end labels (ascending), index from the first end)
+            side --> (2, corner label with the smallest label, labels of its neighbours
+                     (ascending), indices from the corner along the neighbours)
+        
+        Args:
+            cellCount (np.ndarray): (nx, ny, nz) cell count of the blocks
+            cornerLabels (np.ndarray): (nBlocks, 2, 2, 2) vertex labels at the (x, y, z) corner bits
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]:
+                Flat local indices of the nodes on the block sides, (nBlocks, nNodes, 6) node keys
+        """
+        
+        nx, ny, nz = cellCount.tolist()
+        k, j, i = np.indices((nz + 1, ny + 1, nx + 1)).reshape(3, -1)
+        
+        index = np.stack((i, j, k))
+        count = cellCount[:, np.newaxis]
+        isOnSide = (index == 0) | (index == count)
+        
+        sideNodes = np.flatnonzero(isOnSide.any(axis = 0))
+        index, isOnSide = index[:, sideNodes], isOnSide[:, sideNodes]
+        bits = (index == count).astype(np.int64)
+        nodeRange = np.arange(len(sideNodes))
+        
+        def labels_at(cornerBits: np.ndarray) -> np.ndarray:
+            return cornerLabels[:, cornerBits[0], cornerBits[1], cornerBits[2]]
+        
+        nBlocks = cornerLabels.shape[0]
+        keys = np.full((nBlocks, len(sideNodes), 6), -1, dtype = np.int64)
+        keys[:, :, 4:] = 0
+        dimension = isOnSide.sum(axis = 0)
+        
+        ### Corners
+        isCorner = dimension == 3
+        keys[:, isCorner, 0] = 0
+        keys[:, isCorner, 1] = labels_at(bits[:, isCorner])
+        
+        ### Edges --> along the axis not on a side
+        isEdge = dimension == 2
+        freeAxis = np.argmin(isOnSide[:, isEdge], axis = 0)
+        edgeRange = nodeRange[:np.count_nonzero(isEdge)]
+        startBits, endBits = bits[:, isEdge].copy(), bits[:, isEdge].copy()
+        startBits[freeAxis, edgeRange] = 0
+        endBits[freeAxis, edgeRange] = 1
+        startLabels, endLabels = labels_at(startBits), labels_at(endBits)
+        step = index[freeAxis, np.flatnonzero(isEdge)]
+        isSwapped = startLabels > endLabels
+        keys[:, isEdge, 0] = 1
+        keys[:, isEdge, 1] = np.minimum(startLabels, endLabels)
+        keys[:, isEdge, 2] = np.maximum(startLabels, endLabels)
+        keys[:, isEdge, 4] = np.where(isSwapped, cellCount[freeAxis] - step, step)
+        
+        ### Sides --> along the two axes not on a side
+        isFace = dimension == 1
+        faceNodes = np.flatnonzero(isFace)
+        faceRange = nodeRange[:faceNodes.size]
+        normalAxis = np.argmax(isOnSide[:, isFace], axis = 0)
+        firstAxis = np.where(normalAxis == 0, 1, 0)
+        secondAxis = np.where(normalAxis == 2, 1, 2)
+        
+        ### Side corners in the order (0, 0), (1, 0), (0, 1), (1, 1) along the (first, second) axis
+        sideLabels = []
+        for firstBit, secondBit in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+            cornerBits = bits[:, isFace].copy()
+            cornerBits[firstAxis, faceRange] = firstBit
+            cornerBits[secondAxis, faceRange] = secondBit
+            sideLabels.append(labels_at(cornerBits))
+        sideLabels = np.stack(sideLabels, axis = -1)
+        
+        origin = np.argmin(sideLabels, axis = -1)
+        firstBit, secondBit = origin % 2, origin // 2
+        
+        def label_of(position: np.ndarray) -> np.ndarray:
+            return np.take_along_axis(sideLabels, position[..., np.newaxis], axis = -1)[..., 0]
+        
+        firstNeighbour = label_of((1 - firstBit) + 2 * secondBit)
+        secondNeighbour = label_of(firstBit + 2 * (1 - secondBit))
+        
+        firstStep = index[firstAxis, faceNodes]
+        secondStep = index[secondAxis, faceNodes]
+        firstStep = np.where(firstBit == 0, firstStep, cellCount[firstAxis] - firstStep)
+        secondStep = np.where(secondBit == 0, secondStep, cellCount[secondAxis] - secondStep)
+        
+        isFirst = firstNeighbour < secondNeighbour
+        keys[:, isFace, 0] = 2
+        keys[:, isFace, 1] = label_of(origin)
+        keys[:, isFace, 2] = np.where(isFirst, firstNeighbour, secondNeighbour)
+        keys[:, isFace, 3] = np.where(isFirst, secondNeighbour, firstNeighbour)
+        keys[:, isFace, 4] = np.where(isFirst, firstStep, secondStep)
+        keys[:, isFace, 5] = np.where(isFirst, secondStep, firstStep)
+        
+        return sideNodes, keys
+    
+    def parse_boundary(
+            self,
+            sideLabels: np.ndarray
+        ) -> Tuple[np.ndarray, List[Tuple[str, str]]]:
+        """
+        Get the patch of the block sides from the boundary definitions of blockMeshDict
+        
+        Args:
+            sideLabels (np.ndarray): (nBlocks * 6, 4) vertex labels of the block sides
+        
+        Raises:
+            ValueError: If a boundary face isn't a side of an active block
+        
+        Returns:
+            Tuple[np.ndarray, List[Tuple[str, str]]]:
+                Patch index of each block side (-1 --> no patch), (name, type) of the patches
+        """
+        
+        sideKeys = {}
+        for sideId, labels in enumerate(np.sort(sideLabels, axis = 1).tolist()):
+            sideKeys.setdefault(tuple(labels), []).append(sideId)
+        
+        sidePatch = np.full(len(sideLabels), -1, dtype = np.int64)
+        patches = []
+        
+        for definition in self._boundaryDefinition:
+            name = definition.strip().split()[0]
+            patchType = re.search(r"type\s+(\w+)\s*;", definition).group(1)
+            
+            for quad in re.findall(r"\((\d+) (\d+) (\d+) (\d+)\)", definition):
+                sideIds = sideKeys.get(tuple(sorted(int(x) for x in quad)), [])
+                if len(sideIds) != 1:
+                    raise ValueError(f"Boundary face ({' '.join(quad)}) of '{name}' isn't on the boundary of the active blocks.")
+                sidePatch[sideIds[0]] = len(patches)
+            
+            patches.append((name, patchType))
+        
+        return sidePatch, patches
+    
+    def build(self) -> PolyMeshT:
+        """
+        Generate the points, faces, owner, neighbour and patches
+        
+        Raises:
+            ValueError: If the multi-block can't be meshed without blockMesh (see 'PolyMesh.check')
+        
+        Returns:
+            PolyMeshT: The built polyMesh (self)
+        """
+        
+        mb = self._mb
+        labels = mb.vertexStore.compact_labels()[0]
+        blockIds = np.flatnonzero(mb.activeMask)
+        
+        blockVertexIds = mb.hexConnectivity[blockIds]
+        cornerLabels = labels[blockVertexIds]
+        cornerCoordinates = mb.vertexStore.coordinates[blockVertexIds]
+        
+        nBlocks = len(blockIds)
+        cellCount = mb.geometry.cell_count()[blockIds]
+        blockCells = cellCount.prod(axis = 1)
+        cellOffset = np.concatenate(([0], np.cumsum(blockCells)[:-1]))
+        self._nCells = int(blockCells.sum())
+        
+        ### Corners indexed by their (x, y, z) bits
+        cornerLabelGrid = np.empty((nBlocks, 2, 2, 2), dtype = np.int64)
+        cornerLabelGrid[:, blockCornerBits[:, 0], blockCornerBits[:, 1], blockCornerBits[:, 2]] = cornerLabels
+        cornerGrid = np.empty((nBlocks, 2, 2, 2, 3), dtype = np.float64)
+        cornerGrid[:, blockCornerBits[:, 0], blockCornerBits[:, 1], blockCornerBits[:, 2]] = cornerCoordinates
+        
+        self.check(blockIds, cornerLabels, cornerGrid)
+        
+        ### Blocks with the same cell counts are processed together
+        shapes, shapeGroup = np.unique(cellCount, axis = 0, return_inverse = True)
+        groups = [np.flatnonzero(shapeGroup.ravel() == x) for x in range(len(shapes))]
+        
+        maxPoints = int(((cellCount + 1).prod(axis = 1)).sum())
+        labelType = np.int32 if max(maxPoints, 3 * self._nCells + 6 * nBlocks) < 2**31 else np.int64
+        
+        ### Pass 1 --> node coordinates, keys of the nodes on the block sides
+        groupNodes = []
+        sideKeys, sidePoints, innerPoints = [], [], []
+        
+        for shape, members in zip(shapes, groups):
+            nx, ny, nz = shape.tolist()
+            weights = [np.stack((1.0 - x, x)) for x in (np.linspace(0.0, 1.0, n + 1) for n in (nx, ny, nz))]
+            
+            ### (nBlocks, nz + 1, ny + 1, nx + 1, 3) trilinear interpolation of the corners
+            nodePoints = np.einsum("xi,yj,zk,bxyzd->bkjid", *weights, cornerGrid[members], optimize = True)
+            nodePoints = nodePoints.reshape(len(members), -1, 3)
+            
+            sideNodes, keys = self.node_keys(shape, cornerLabelGrid[members])
+            isInner = np.ones(nodePoints.shape[1], dtype = bool)
+            isInner[sideNodes] = False
+            
+            groupNodes.append((sideNodes, isInner))
+            sideKeys.append(keys.reshape(-1, 6))
+            sidePoints.append(nodePoints[:, sideNodes].reshape(-1, 3))
+            innerPoints.append(nodePoints[:, isInner].reshape(-1, 3))
+        
+        ### Nodes shared by blocks get one point id
+        firstNode, sidePointIds, _ = unique_rows(np.concatenate(sideKeys))
+        nSidePoints = len(firstNode)
+        
+        points = np.concatenate([np.concatenate(sidePoints)[firstNode]] + innerPoints)
+        
+        ### Pass 2 --> point ids of the nodes, faces of the cells
+        internalFaces, internalOwner, internalNeighbour = [], [], []
+        boundaryFaces, boundaryOwner, boundarySide = [], [], []
+        sideOffset, innerOffset = 0, nSidePoints
+        
+        for shape, members, (sideNodes, isInner) in zip(shapes, groups, groupNodes):
+            nx, ny, nz = shape.tolist()
+            nMembers = len(members)
+            
+            nodeIds = np.empty((nMembers, (nx + 1) * (ny + 1) * (nz + 1)), dtype = labelType)
+            nodeIds[:, sideNodes] = sidePointIds[sideOffset:sideOffset + nMembers * len(sideNodes)].reshape(nMembers, -1)
+            nInner = np.count_nonzero(isInner)
+            nodeIds[:, isInner] = (innerOffset + np.arange(nMembers * nInner)).reshape(nMembers, -1)
+            sideOffset += nMembers * len(sideNodes)
+            innerOffset += nMembers * nInner
+            
+            nodeIds = nodeIds.reshape(nMembers, nz + 1, ny + 1, nx + 1)
+            cellIds = (
+                    cellOffset[members, np.newaxis]
+                    + np.arange(nx * ny * nz)
+                ).astype(labelType).reshape(nMembers, nz, ny, nx)
+            
+            faces, sideFaces = block_face_nodes(nodeIds)
+            
+            internalFaces.extend(x.reshape(-1, 4) for x in faces)
+            internalOwner.extend([cellIds[:, :, :, :-1].ravel(), cellIds[:, :, :-1, :].ravel(), cellIds[:, :-1].ravel()])
+            internalNeighbour.extend([cellIds[:, :, :, 1:].ravel(), cellIds[:, :, 1:, :].ravel(), cellIds[:, 1:].ravel()])
+            
+            for sideId, (nodes, cells) in enumerate(zip(sideFaces, block_side_cells(cellIds))):
+                boundaryFaces.append(nodes.reshape(-1, 4))
+                boundaryOwner.append(cells.ravel())
+                boundarySide.append(np.repeat(members * 6 + sideId, cells[0].size))
+        
+        boundaryFaces = np.concatenate(boundaryFaces)
+        boundaryOwner = np.concatenate(boundaryOwner)
+        boundarySide = np.concatenate(boundarySide)
+        
+        ### Faces on the block sides --> shared by two blocks (internal) or boundary
+        _, faceGroup, faceCount = unique_rows(np.sort(boundaryFaces, axis = 1))
+        
+        if (faceCount > 2).any():
+            raise ValueError("polyMesh can't be written, a face is shared by more than two blocks.")
+        
+        order = np.argsort(faceGroup, kind = "stable")
+        isPair = np.flatnonzero(faceGroup[order][1:] == faceGroup[order][:-1])
+        first, second = order[isPair], order[isPair + 1]
+        isFirstOwner = boundaryOwner[first] < boundaryOwner[second]
+        ownerSide = np.where(isFirstOwner, first, second)
+        neighbourSide = np.where(isFirstOwner, second, first)
+        
+        internalFaces.append(boundaryFaces[ownerSide])
+        internalOwner.append(boundaryOwner[ownerSide])
+        internalNeighbour.append(boundaryOwner[neighbourSide])
+        
+        ### Internal faces in upper triangular order
+        internalFaces = np.concatenate(internalFaces)
+        internalOwner = np.concatenate(internalOwner)
+        internalNeighbour = np.concatenate(internalNeighbour)
+        order = np.argsort(internalOwner.astype(np.int64) * self._nCells + internalNeighbour)
+        
+        ### Boundary faces grouped by patch
+        isBoundary = faceCount[faceGroup] == 1
+        sideLabels = cornerLabels[:, [[blockFaceDefinition[x][i] for i in range(4)] for x in blockSideName]].reshape(-1, 4)
+        sidePatch, patches = self.parse_boundary(sideLabels)
+        
+        facePatch = sidePatch[boundarySide[isBoundary]]
+        if (facePatch < 0).any():
+            facePatch[facePatch < 0] = len(patches)
+            patches.append(defaultPatch)
+        
+        boundaryOrder = np.flatnonzero(isBoundary)[np.argsort(facePatch, kind = "stable")]
+        
+        self._points = points * self._convertToMeters
+        self._faces = np.concatenate((internalFaces[order], boundaryFaces[boundaryOrder]))
+        self._owner = np.concatenate((internalOwner[order], boundaryOwner[boundaryOrder]))
+        self._neighbour = internalNeighbour[order]
+        
+        patchFaces = np.bincount(facePatch, minlength = len(patches))
+        startFace = len(self._neighbour) + np.concatenate(([0], np.cumsum(patchFaces)[:-1]))
+        self._patches = [
+                (name, patchType, int(nFaces), int(start))
+                for (name, patchType), nFaces, start in zip(patches, patchFaces, startFace)
+            ]
+        
+        return self
+    
+    def header(
+            self,
+            className: str,
+            objectName: str,
+            binary: bool,
+            note: str = ""
+        ) -> bytes:
+        """ FoamFile header of a polyMesh file """
+        
+        labelBits = 8 * self._faces.dtype.itemsize
+        
+        return foamFileHeader.format(
+                format = "binary" if binary else "ascii",
+                arch = f'\n    arch        "LSB;label={labelBits};scalar=64";' if binary else "",
+                className = className,
+                note = f'\n    note        "{note}";' if note else "",
+                location = "constant/polyMesh",
+                objectName = objectName,
+            ).encode()
+    
+    @staticmethod
+    def write_list(
+            pf,
+            values: np.ndarray,
+            binary: bool,
+            asciiFormat: str
+        ) -> None:
+        """ Write a list (labels, vectors, faces) in the OpenFOAM list format """
+        
+        pf.write(f"{len(values)}\n(".encode())
+        
+        if binary:
+            pf.write(np.ascontiguousarray(values).tobytes())
+        else:
+            pf.write(b"\n")
+            np.savetxt(pf, values, fmt = asciiFormat)
+        
+        pf.write(b")\n\n")
+    
+    def write(
+            self,
+            polyMeshDir: str,
+            binary: bool = True
+        ) -> None:
+        """
+        Write the polyMesh files
+        
+        Args:
+            polyMeshDir (str): Path of the "constant/polyMesh" directory
+            binary (bool, optional): True, to write the lists in binary format. Defaults to True.
+        """
+        
+        os.makedirs(polyMeshDir, exist_ok = True)
+        
+        ### Binary data are written little-endian
+        points = self._points.astype("<f8")
+        faces = self._faces.astype(self._faces.dtype.newbyteorder("<"))
+        owner = self._owner.astype(faces.dtype)
+        neighbour = self._neighbour.astype(faces.dtype)
+        
+        note = f"nPoints:{self.nPoints}  nCells:{self.nCells}  nFaces:{self.nFaces}  nInternalFaces:{self.nInternalFaces}"
+        
+        with open(polyMeshDir + os.sep + "points", "wb") as pf:
+            pf.write(self.header("vectorField", "points", binary))
+            self.write_list(pf, points, binary, "(%.12g %.12g %.12g)")
+        
+        with open(polyMeshDir + os.sep + "faces", "wb") as pf:
+            if binary:
+                pf.write(self.header("faceCompactList", "faces", binary))
+                self.write_list(pf, np.arange(0, 4 * self.nFaces + 1, 4, dtype = faces.dtype), binary, "%d")
+                self.write_list(pf, faces.ravel(), binary, "%d")
+            else:
+                pf.write(self.header("faceList", "faces", binary))
+                self.write_list(pf, faces, binary, "4(%d %d %d %d)")
+        
+        with open(polyMeshDir + os.sep + "owner", "wb") as pf:
+            pf.write(self.header("labelList", "owner", binary, note))
+            self.write_list(pf, owner, binary, "%d")
+        
+        with open(polyMeshDir + os.sep + "neighbour", "wb") as pf:
+            pf.write(self.header("labelList", "neighbour", binary, note))
+            self.write_list(pf, neighbour, binary, "%d")
+        
+        with open(polyMeshDir + os.sep + "boundary", "wb") as pf:
+            pf.write(self.header("polyBoundaryMesh", "boundary", False))
+            
+            boundaryStr = f"{len(self._patches)}\n(\n"
+            for name, patchType, nFaces, startFace in self._patches:
+                boundaryStr += f"    {name}\n    {{\n"
+                boundaryStr += f"        type            {patchType};\n"
+                if patchType in groupedPatchType:
+                    boundaryStr += f"        inGroups        1({patchType});\n"
+                boundaryStr += f"        nFaces          {nFaces};\n"
+                boundaryStr += f"        startFace       {startFace};\n"
+                boundaryStr += "    }\n"
+            boundaryStr += ")\n"
+            
+            pf.write(boundaryStr.encode())
@@ -1,9 +1,12 @@
 
 import os
 import shutil
+import itertools
+import numpy as np
 
 from typing import (
-    List
+    Iterator,
+    List,
 )
 
 
@@ -19,7 +22,8 @@ from utility import tool as t
 
 
 
-blockMeshDictHeader = """/*--------------------------------*- C++ -*----------------------------------*\\
+### FoamFile header of the written OpenFOAM files (blockMeshDict, polyMesh)
+foamFileHeader = """/*--------------------------------*- C++ -*----------------------------------*\\
 | =========                 |                                                 |
 | \\\\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
 |  \\\\    /   O peration     | Version:  v2412                                 |
@@ -28,17 +32,42 @@ blockMeshDictHeader = """/*--------------------------------*- C++ -*------------
 \\*---------------------------------------------------------------------------*/
 
 FoamFile
-{
+{{
     version     2.0;
-    format      ascii;
-    class       dictionary;
-    location    "system";
-    object      blockMeshDict;
-}
+    format      {format};{arch}
+    class       {className};{note}
+    location    "{location}";
+    object      {objectName};
+}}
 
 // * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //
 \n"""
 
+blockMeshDictHeader = foamFileHeader.format(
+        format = "ascii",
+        arch = "",
+        className = "dictionary",
+        note = "",
+        location = "system",
+        objectName = "blockMeshDict",
+    )
+
+blockMeshDictFooter = """mergePatchPair
+(
+);
+// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //
+// Comments/Notes
+// Prepared by "Simply multiBlockMesh" (SimBloM)
+// - https://github.com/noman-mnhasan/simply_multiBlockMesh
+//
+//
+// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //
+
+"""
+
+### Buffer size (bytes) for streaming the dictionary to the disk
+writeBufferSize = 1024 * 1024
+
 
 class Setup:
     """ Setup case directory to run blockMesh """
@@ -150,26 +179,23 @@ class Setup:
         self.create_foam_file()
         self.copy_template_files()
     
-    def blockmeshdict(
+    def vertices_section(
             self,
-            convertToMeters: float,
-            mb: MultiBlock,
-            boundaryDefinition: List
-        ) -> None:
+            mb: MultiBlock
+        ) -> Iterator[str]:
         """
-        Generate the content of blockMeshDict and write in file
+        Generate the "vertices" section of blockMeshDict line by line.
+        Merged (collapsed) vertices are written once, the vertices are
+        renumbered accordingly (see 'VertexStore.compact_labels').
 
         Args:
-            convertToMeters (float): "convertToMeter" value for blockMeshDict
-            mb (mbc.MultiBlock): MultiBlock object
-            edgeDefinition (List): Definition of edge modifications to add to blockMeshDict
-            boundaryDefinition (List): Definition of boundary to add to blockMeshDict
+            mb (MultiBlock): MultiBlock object
         """
         
-        dictContent = blockMeshDictHeader
-        dictContent +="\nconvertToMeters=" + str(convertToMeters) + ";\n"
-        dictContent += "vertices\n"
-        dictContent += "(\n"
+        yield "vertices\n"
+        yield "(\n"
+        
+        labels, isKept = mb.vertexStore.compact_labels()
         
         count = 0
         yCount = 0
@@ -177,69 +203,162 @@ class Setup:
         xCountLen = len(mb.xVertices)
         yCountLen = len(mb.yVertices)
         
-        dictContent += (indent * 1) + "// ==== y-" + str(yCount) + ", z-" + str(zCount) + " ==== //\n\n"
-        for k, v in mb.vertices.items():        
+        yield (indent * 1) + "// ==== y-" + str(yCount) + ", z-" + str(zCount) + " ==== //\n\n"
+        for k, v in mb.vertices.items():
             if count >= xCountLen and count%xCountLen == 0:
                 yCount += 1
                 if yCount%yCountLen == 0:
                     yCount = 1
-                    zCount += 1            
-                dictContent += "\n" + (indent * 1) + "// ==== y-" + str(yCount) + ", z-" + str(zCount) + " ==== //\n\n"        
-            dictContent += (indent * 1) + "(" + " ".join([str(i) for i in [v.x, v.y, v.z]]) + ")    // vertex-" + str(k) + "\n"
+                    zCount += 1
+                yield "\n" + (indent * 1) + "// ==== y-" + str(yCount) + ", z-" + str(zCount) + " ==== //\n\n"
             count += 1
-        
-        dictContent += ");\n"
-        dictContent += "\n"
-        dictContent += "blocks\n"
-        dictContent += "(\n"
-        
-        for k, iblock in mb.blocks.items():
             
-            if iblock.isActive == False:
+            if not isKept[k]:
                 continue
             
-            nx, ny, nz = mb.blocks[k].get_spacing()
+            vertexLabel = "vertex-" + str(labels[k]) + ("" if labels[k] == k else f" (id-{k})")
+            yield (indent * 1) + "(" + " ".join([str(i) for i in [v.x, v.y, v.z]]) + ")    // " + vertexLabel + "\n"
+        
+        yield ");\n"
+        yield "\n"
+    
+    def blocks_section(
+            self,
+            mb: MultiBlock
+        ) -> Iterator[str]:
+        """
+        Generate the "blocks" section of blockMeshDict line by line
+
+        Args:
+            mb (MultiBlock): MultiBlock object
+        """
+        
+        yield "blocks\n"
+        yield "(\n"
+        
+        labels = mb.vertexStore.compact_labels()[0]
+        
+        ### Only the included/active blocks are written
+        for k in np.flatnonzero(mb.activeMask).tolist():
+            iblock = mb.blocks[k]
             
-            nxs = f"{nx}"
-            nys = f"{ny}"
-            nzs = f"{nz}"
+            nx, ny, nz = iblock.get_spacing()
             
-            dictContent += (indent * 1) + "// ==== Block-" + str(k) + ", Index : "  +  str(iblock.index) + " ==== //\n"
-            dictContent += (indent * 1) + "hex (" + " ".join([f"{x:3}" for x in [v.id for v in iblock.vertices]]) + ") (" + nxs + " " + nys + " " + nzs + ") simpleGrading (1 1 1)" + "\n\n"
+            yield (indent * 1) + "// ==== Block-" + str(k) + ", Index : "  +  str(iblock.index) + " ==== //\n"
+            yield (indent * 1) + "hex (" + " ".join([f"{labels[v.id]:3}" for v in iblock.vertices]) + f") ({nx} {ny} {nz}) simpleGrading (1 1 1)" + "\n\n"
         
-        dictContent += ");\n"
-        dictContent += "\n"
-        dictContent += "edges\n"
-        dictContent += "(\n"
+        yield ");\n"
+        yield "\n"
+    
+    def edges_section(
+            self,
+            mb: MultiBlock
+        ) -> Iterator[str]:
+        """
+        Generate the "edges" section of blockMeshDict line by line.
+        The vertices of the edges are written with their compacted labels,
+        a curved edge between merged vertices is written once (the first one).
+
+        Args:
+            mb (MultiBlock): MultiBlock object
+        """
+        
+        yield "edges\n"
+        yield "(\n"
+        
+        labels = mb.vertexStore.compact_labels()[0]
+        writtenEdges = set()
         
         for iedge in mb.edges:
-            if iedge.type in ["arc", "spline", "polyline"]:
-                dictContent += indent + iedge.definition + "\n\n"
+            if iedge.type not in ["arc", "spline", "polyline"]:
+                continue
+            
+            startLabel = int(labels[iedge.start.id])
+            endLabel = int(labels[iedge.end.id])
+            edgeKey = frozenset((startLabel, endLabel))
+            
+            if startLabel == endLabel or edgeKey in writtenEdges:
+                continue
+            
+            writtenEdges.add(edgeKey)
+            
+            ### Definition starts with --> <type> <start id> <end id>
+            definition = iedge.definition.replace(
+                    f"{iedge.type} {iedge.start.id} {iedge.end.id}",
+                    f"{iedge.type} {startLabel} {endLabel}",
+                    1
+                )
+            
+            yield indent + definition + "\n\n"
+        
+        yield ");\n"
+        yield "\n"
+    
+    def boundary_section(
+            self,
+            boundaryDefinition: List
+        ) -> Iterator[str]:
+        """
+        Generate the "boundary" section of blockMeshDict
+
+        Args:
+            boundaryDefinition (List): Definition of boundary to add to blockMeshDict
+        """
         
-        dictContent += ");\n"
-        dictContent += "\n"
-        dictContent += "boundary\n"
-        dictContent += "(\n"
+        yield "boundary\n"
+        yield "(\n"
         
         for entry in boundaryDefinition:
-            dictContent += entry + "\n\n"
-        
-        dictContent += ");\n"
-        dictContent += "\n"
-        dictContent += "mergePatchPair\n"
-        dictContent += "(\n"
-        dictContent += ");\n"
-        dictContent += "// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //\n"
-        dictContent += "// Comments/Notes\n"
-        dictContent += "// Prepared by \"Simply multiBlockMesh\" (SimBloM)\n"
-        dictContent += "// - https://github.com/noman-mnhasan/simply_multiBlockMesh\n"
-        dictContent += "//\n"
-        dictContent += "//\n"
-        dictContent += "// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //\n"
-        dictContent += "\n"    
-        
-        ### Write blockMeshDict
+            yield entry + "\n\n"
+        
+        yield ");\n"
+        yield "\n"
+    
+    def write_blockmeshdict(
+            self,
+            convertToMeters: float,
+            sectionLines: Iterator[str]
+        ) -> None:
+        """
+        Write blockMeshDict from the lines of its sections.
+        The lines are streamed to the (buffered) file, the
+        whole dictionary is never held in memory.
+
+        Args:
+            convertToMeters (float): "convertToMeter" value for blockMeshDict
+            sectionLines (Iterator[str]): Lines of the vertices, blocks, edges and boundary sections
+        """
+        
         exportFile = self._caseDir + os.sep + "system" + os.sep + "blockMeshDict"
-        with open(exportFile, "w") as bmd:
-            bmd.write(dictContent)
-        
\ No newline at end of file
+        
+        with open(exportFile, "w", buffering = writeBufferSize) as bmd:
+            bmd.write(blockMeshDictHeader)
+            bmd.write("\nconvertToMeters=" + str(convertToMeters) + ";\n")
+            bmd.writelines(sectionLines)
+            bmd.write(blockMeshDictFooter)
+    
+    def blockmeshdict(
+            self,
+            convertToMeters: float,
+            mb: MultiBlock,
+            boundaryDefinition: List
+        ) -> None:
+        """
+        Generate the content of blockMeshDict and write in file.
+        The sections are streamed to the file one after the other.
+
+        Args:
+            convertToMeters (float): "convertToMeter" value for blockMeshDict
+            mb (mbc.MultiBlock): MultiBlock object
+            boundaryDefinition (List): Definition of boundary to add to blockMeshDict
+        """
+        
+        self.write_blockmeshdict(
+                convertToMeters,
+                itertools.chain(
+                        self.vertices_section(mb),
+                        self.blocks_section(mb),
+                        self.edges_section(mb),
+                        self.boundary_section(boundaryDefinition),
+                    )
+            )
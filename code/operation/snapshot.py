@@ -0,0 +1,208 @@
+import os
+import json
+import hashlib
+
+from typing import (
+    Dict,
+    Iterator,
+)
+
+from entity.multiblock import MultiBlock
+
+from utility.define import snapshotDirName
+
+
+### Increase when the content/layout of the snapshot changes
+snapshotVersion = 3
+
+### Sections of blockMeshDict, in the order they are written
+blockMeshDictSection = ["vertices", "blocks", "edges", "boundary"]
+
+
+class Snapshot:
+    """
+    On-disk state of a built multi-block, used by the incremental build.
+    
+    The snapshot directory (inside the working directory) contains:
+        - state.json      --> hash keys of the inputs the snapshot was built from
+        - multiblock.npz  --> multi-block saved with 'MultiBlock.save'
+        - <section>.txt   --> generated blockMeshDict sections
+    
+    Comparing the stored keys with the keys of the current inputs tells
+    which parts of the multi-block/blockMeshDict need to be rebuilt.
+    """
+    
+    def __init__(
+            self,
+            workingDir: str
+        ) -> None:
+        """
+        Initialize Snapshot instance
+        
+        Args:
+            workingDir (str): Path string of the working directory
+        """
+        
+        self._workingDir = workingDir
+        self._snapshotDir = workingDir + os.sep + snapshotDirName
+        self._keys = {}
+    
+    def __repr__(self):
+        return f"Snapshot : {self._snapshotDir}"
+    
+    @property
+    def snapshotDir(self) -> str:
+        return self._snapshotDir
+    
+    @property
+    def keys(self) -> Dict:
+        return self._keys
+    
+    @keys.setter
+    def keys(self, value: Dict) -> None:
+        """ Check, raise error and assign value of Snapshot.keys """
+        
+        if not isinstance(value, dict):
+            raise ValueError("Value of 'Snapshot.keys' must be a dictionary.")
+        
+        self._keys = value
+    
+    @staticmethod
+    def hash_input(*inputs) -> str:
+        """
+        Get the hash of (JSON serializable) user inputs
+        
+        Returns:
+            str: Hexadecimal digest of the inputs
+        """
+        
+        inputHash = hashlib.sha256()
+        inputHash.update(str(snapshotVersion).encode())
+        
+        for value in inputs:
+            inputHash.update(json.dumps(value, sort_keys = True, default = str).encode())
+        
+        return inputHash.hexdigest()
+    
+    def section_file(
+            self,
+            name: str
+        ) -> str:
+        """
+        Get the path of the file containing a blockMeshDict section
+        
+        Args:
+            name (str): Name of the section
+        
+        Returns:
+            str: Path of the section file
+        """
+        
+        return self._snapshotDir + os.sep + name + ".txt"
+    
+    def load(self) -> Dict:
+        """
+        Read the keys of the stored snapshot.
+        An incomplete snapshot is treated as missing.
+        
+        Returns:
+            Dict: Keys of the stored snapshot, empty if there is no (valid) snapshot
+        """
+        
+        stateFile = self._snapshotDir + os.sep + "state.json"
+        requiredFiles = [stateFile, self._snapshotDir + os.sep + "multiblock.npz"]
+        requiredFiles.extend(self.section_file(x) for x in blockMeshDictSection)
+        
+        if not all(os.path.isfile(x) for x in requiredFiles):
+            return {}
+        
+        with open(stateFile, "r") as sf:
+            state = json.load(sf)
+        
+        if state.get("version") != snapshotVersion:
+            return {}
+        
+        return state["keys"]
+    
+    def changes(self) -> Dict:
+        """
+        Compare the current keys with the keys of the stored snapshot
+        
+        Returns:
+            Dict: True for each key which differs from the stored snapshot
+        """
+        
+        storedKeys = self.load()
+        
+        return {
+                name : storedKeys.get(name) != value
+                for name, value in self._keys.items()
+            }
+    
+    def write_section(
+            self,
+            name: str,
+            lines: Iterator[str]
+        ) -> None:
+        """
+        Write a (generated) blockMeshDict section into its section file
+        
+        Args:
+            name (str): Name of the section
+            lines (Iterator[str]): Lines of the section
+        """
+        
+        os.makedirs(self._snapshotDir, exist_ok = True)
+        
+        with open(self.section_file(name), "w") as sf:
+            sf.writelines(lines)
+    
+    def read_sections(self) -> Iterator[str]:
+        """
+        Stream the stored blockMeshDict sections, in the order they are written
+        
+        Returns:
+            Iterator[str]: Lines of the sections
+        """
+        
+        for name in blockMeshDictSection:
+            with open(self.section_file(name), "r") as sf:
+                yield from sf
+    
+    def save(
+            self,
+            mb: MultiBlock
+        ) -> None:
+        """
+        Store the multi-block state and the current keys
+        
+        Args:
+            mb (MultiBlock): MultiBlock object, after the edits are applied
+        """
+        
+        os.makedirs(self._snapshotDir, exist_ok = True)
+        
+        mb.save(self._snapshotDir + os.sep + "multiblock.npz")
+        
+        with open(self._snapshotDir + os.sep + "state.json", "w") as sf:
+            json.dump(
+                    {
+                        "version" : snapshotVersion,
+                        "keys" : self._keys,
+                    },
+                    sf,
+                    indent = 4
+                )
+    
+    def restore(
+            self,
+            mb: MultiBlock
+        ) -> None:
+        """
+        Restore the stored state (edits applied) into a freshly made multi-block
+        
+        Args:
+            mb (MultiBlock): MultiBlock object, made from the same inputs as the snapshot
+        """
+        
+        mb.restore(self._snapshotDir + os.sep + "multiblock.npz")
@@ -17,11 +17,16 @@ import operation as op
 
 from entity.multiblock import MultiBlock
 from operation.edit import Edit
+from operation.polymesh import PolyMesh
 from operation.setup import Setup
+from operation.snapshot import Snapshot
 
 from utility.define import (
     VSEP,
     indent,
+    blockEdgeDefinition,
+    blockFaceDefinition,
+    geometryTaskType,
     templateDirName,
     templateFilenameBlockEdit,
 )
@@ -44,7 +49,11 @@ def make_multi_block_blockmeshdict(
         hex2exclude,
         workingDir,
         caseDir,
-        need2modify
+        need2modify,
+        incremental = False,
+        editOverride = None,
+        editAnalysis = False,
+        polyMeshFormat = None
     ):
     """
         Calculated the dimensions of the blocks of the final "multi-block".
@@ -58,6 +67,16 @@ def make_multi_block_blockmeshdict(
             - text files containing the face, slice, edge information for the blocks of the "multi-block"
             - the "blockMeshDict" file
                 - there is not auto generated boundary information
+            - the "constant/polyMesh" files, if requested (straight-edged multi-blocks only, blockMesh isn't needed)
+        
+        Incremental build:
+            - The built multi-block and the generated sections are stored in a snapshot,
+              keyed by a hash of the inputs and the edit file.
+            - Unchanged inputs --> the snapshot is reused
+            - Changed geometry edits --> the edits are re-applied, all sections are rewritten
+              (the boundary faces refer to the vertex labels, which depend on the collapses)
+            - Changed boundaries --> only the boundary section is rewritten
+            - Changed bounding box/split planes/grid spacing/exclusions --> full rebuild
         
         Remarks:
             - The resultant multi-block is a brick-like object. 
@@ -73,6 +92,10 @@ def make_multi_block_blockmeshdict(
         workingDir (str): Location/path of the working directory
         caseDir (str): Location/path of the Openfoam case directory
         need2modify (bool): True, it edits needs to be applied in the multi-block
+        incremental (bool, optional): True, to reuse the unchanged parts of the previous run. Defaults to False.
+        editOverride (dict, optional): Values replacing the entries of the edit file, e.g. {"blockEdit.0.radius" : 1.2}. Defaults to None.
+        editAnalysis (bool, optional): True, to write the overlaps/independent groups of the edit tasks in "edit_analysis.txt". Defaults to False.
+        polyMeshFormat (str, optional): "binary" or "ascii", to write the polyMesh directly (without blockMesh). Defaults to None (not written).
     """
     
     t.hl()
@@ -107,100 +130,199 @@ def make_multi_block_blockmeshdict(
         
     
     
-    ### Run blockMesh setup
-    setup.run()
+    ### Read edit entries
+    edit.does_file_exists()
+    if not edit.fileExist:
+        t.hl()
+        print("File 'block_edit_*.py' doesn't exist")
+    
+    applyEdit = edit.fileExist and need2modify
     
+    if applyEdit:
+        edit.read()
+        
+        for taskPath, value in (editOverride or {}).items():
+            edit.override_task(taskPath, value)
     
-    ### Get split location information
-    splitLocationInfo = VSEP + "\n"
-    splitLocationInfo += "Split location information\n"
+    elif edit.fileExist:
+        t.hl()
+        print(f"Execute multi-block edit? - {need2modify}")
+        print("No multi-block edits will be applied.")
     
-    splitLocationInfo = VSEP + "\n"
-    splitLocationInfo += "[*] Split plane(s) along X:"
-    splitLocationInfo += indent + ", ".join([str(i) for i in mb.xVertices]) + "\n"
-    splitLocationInfo += "[*] Split plane(s) along Y:"
-    splitLocationInfo += indent + ", ".join([str(i) for i in mb.yVertices]) + "\n"
-    splitLocationInfo += "[*] Split plane(s) along Z:"
-    splitLocationInfo += indent + ", ".join([str(i) for i in mb.zVertices]) + "\n"
     
-    print(splitLocationInfo)
+    ### Find the parts changed since the previous (incremental) run
+    snapshot = Snapshot(workingDir)
+    snapshot.keys = {
+            "multiblock" : Snapshot.hash_input(boundingBox, splitPlanes, gridSpacing, hex2exclude),
+            "edit" : edit.task_hash(geometryTaskType) if applyEdit else Snapshot.hash_input(None),
+            "boundary" : edit.task_hash(["boundary"]) if applyEdit else Snapshot.hash_input(None),
+        }
     
-    ### Write the x/y/z coordinates of the (bounding ox & split/cut locations)
-    locationFile = os.path.dirname(caseDir) + os.sep + "xyz_locations.txt"
+    if incremental:
+        changed = snapshot.changes()
+        changed["multiblock"] |= not os.path.isfile(caseDir + os.sep + "system" + os.sep + "blockMeshDict")
+    else:
+        changed = {x : True for x in snapshot.keys}
     
-    with open(locationFile, "w") as lf:
-        lf.write(splitLocationInfo)
+    ### Edits are applied to and boundaries refer to the (new) multi-block
+    changed["edit"] |= changed["multiblock"]
+    changed["boundary"] |= changed["multiblock"]
     
+    ### Boundary faces are written with the compacted vertex labels, which depend on the collapse edits
+    changed["boundary"] |= changed["edit"]
     
-    ### Update multi-block based on "edit task(s)"
-    ### Read edit entries
-    edit.does_file_exists()
-    if not edit.fileExist:
+    if incremental:
         t.hl()
-        print("File 'block_edit_*.py' doesn't exist")
+        print("Incremental build - changes since the previous run:")
+        for name, status in changed.items():
+            print(f"{indent}{name:10} : {status}")
     
-    if edit.fileExist:
-        if need2modify:
-            edit.read()
-            ### Performing edits
-            edit.execute(mb)
-        else:
-            t.hl()
-            print(f"Execute multi-block edit? - {need2modify}")
-            print("No multi-block edits will be applied.")
     
+    if changed["multiblock"]:
+        ### Run blockMesh setup
+        setup.run()
+        
+        
+        ### Get split location information
+        splitLocationInfo = VSEP + "\n"
+        splitLocationInfo += "Split location information\n"
+        
+        splitLocationInfo = VSEP + "\n"
+        splitLocationInfo += "[*] Split plane(s) along X:"
+        splitLocationInfo += indent + ", ".join([str(i) for i in mb.xVertices]) + "\n"
+        splitLocationInfo += "[*] Split plane(s) along Y:"
+        splitLocationInfo += indent + ", ".join([str(i) for i in mb.yVertices]) + "\n"
+        splitLocationInfo += "[*] Split plane(s) along Z:"
+        splitLocationInfo += indent + ", ".join([str(i) for i in mb.zVertices]) + "\n"
+        
+        print(splitLocationInfo)
+        
+        ### Write the x/y/z coordinates of the (bounding ox & split/cut locations)
+        locationFile = os.path.dirname(caseDir) + os.sep + "xyz_locations.txt"
+        
+        with open(locationFile, "w") as lf:
+            lf.write(splitLocationInfo)
     
-    ### Create blockMesh dictionary
-    setup.blockmeshdict(
-            convertToMeters,
-            mb,
-            edit.boundaryDefinition
-        )
     
+    ### Update multi-block based on "edit task(s)"
+    if not changed["edit"]:
+        ### Edits applied in the previous run
+        snapshot.restore(mb)
+    
+    if applyEdit:
+        ### Performing edits
+        edit.execute(
+                mb,
+                applyEdits = changed["edit"],
+                analyzeEdits = editAnalysis and changed["edit"]
+            )
+        
+        if edit.analysis is not None:
+            ### Write the edit analysis in a file
+            editAnalysisFile = os.path.dirname(caseDir) + os.sep + "edit_analysis.txt"
+            with open(editAnalysisFile, "w") as eaf:
+                eaf.write(edit.analysis.report())
     
-    ### Get face information
-    faceInfoStr = "FACE INFO\n" 
-    faceInfoStr += VSEP + "\n\n"
     
-    for k,v in mb.blocks.items():
-        faceInfoStr += "Block-" + str(k) + " : " + str(v.index) + "\n\n"
-        for faceName, faces in v.faces.items():
-            faceInfoStr += indent + f"{faceName:6} : (" + " ".join(str(x) for x in faces.vertices) + ")\n"
-        faceInfoStr += "\n\n"
+    ### Create blockMesh dictionary
+    if incremental:
+        ### Only the changed sections are regenerated
+        sections = {
+                "vertices" : (changed["edit"], setup.vertices_section(mb)),
+                "blocks" : (changed["edit"], setup.blocks_section(mb)),
+                "edges" : (changed["edit"], setup.edges_section(mb)),
+                "boundary" : (changed["boundary"], setup.boundary_section(edit.boundaryDefinition)),
+            }
+        
+        for name, (isChanged, sectionLines) in sections.items():
+            if isChanged:
+                snapshot.write_section(name, sectionLines)
+        
+        setup.write_blockmeshdict(
+                convertToMeters,
+                snapshot.read_sections()
+            )
+        
+        snapshot.save(mb)
     
-    ### Write the face information in a file
-    faceInfoFile = os.path.dirname(caseDir) + os.sep + "face_information.txt"
-    with open(faceInfoFile, "w") as fif:
-        fif.write(faceInfoStr)
+    else:
+        setup.blockmeshdict(
+                convertToMeters,
+                mb,
+                edit.boundaryDefinition
+            )
     
     
-    ### Get slice Information
-    sliceInfoStr = mb.slice_info()
+    ### Write polyMesh directly (instead of running blockMesh)
+    if polyMeshFormat is not None:
+        if polyMeshFormat not in ["binary", "ascii"]:
+            raise ValueError(f"polyMesh format must be 'binary' or 'ascii' --> {polyMeshFormat!r}")
         
-    ### Write the slice information in a file
-    sliceInfoFile = os.path.dirname(caseDir) + os.sep + "slice_information.txt"
-    with open(sliceInfoFile, "w") as sif:
-        sif.write(sliceInfoStr)
-    
+        polyMesh = PolyMesh(
+                mb,
+                edit.boundaryDefinition,
+                convertToMeters
+            ).build()
+        
+        polyMesh.write(
+                caseDir + os.sep + "constant" + os.sep + "polyMesh",
+                polyMeshFormat == "binary"
+            )
+        
+        t.hl()
+        print(f"polyMesh written ({polyMeshFormat}) --> {polyMesh.nCells} cells, {polyMesh.nPoints} points, {polyMesh.nFaces} faces")
+        for name, patchType, nFaces, startFace in polyMesh.patches:
+            print(f"{indent}{name:20} {patchType:15} {nFaces} faces")
     
-    ### Get edge Information
-    edgeInfoStr = "### EDGE INFO ###\n"
-    edgeInfoStr += VSEP + "\n"
     
-    for blockId, iblock in mb.blocks.items():
-        edgeInfoStr += f"\n\n{VSEP}\nBlock ID - {blockId}\n"
-        edgeInfoStr += VSEP + "\n"
-        edgeInfoStr += "Index | ->  - Position     - Definition\n"
+    ### Information files refer to the vertex coordinates (edits applied)
+    if changed["edit"]:
+        ### Get face information
+        faceInfoStr = "FACE INFO\n" 
+        faceInfoStr += VSEP + "\n\n"
+        
+        for k,v in mb.blocks.items():
+            faceInfoStr += "Block-" + str(k) + " : " + str(v.index) + "\n\n"
+            ### Written from the block vertices, faces are only created when needed
+            for faceName, vertexPosition in blockFaceDefinition.items():
+                faceInfoStr += indent + f"{faceName:6} : (" + " ".join(str(v.vertices[i]) for i in vertexPosition) + ")\n"
+            faceInfoStr += "\n\n"
+        
+        ### Write the face information in a file
+        faceInfoFile = os.path.dirname(caseDir) + os.sep + "face_information.txt"
+        with open(faceInfoFile, "w") as fif:
+            fif.write(faceInfoStr)
+        
+        
+        ### Get slice Information
+        sliceInfoStr = mb.slice_info()
+            
+        ### Write the slice information in a file
+        sliceInfoFile = os.path.dirname(caseDir) + os.sep + "slice_information.txt"
+        with open(sliceInfoFile, "w") as sif:
+            sif.write(sliceInfoStr)
+        
+        
+        ### Get edge Information
+        edgeInfoStr = "### EDGE INFO ###\n"
         edgeInfoStr += VSEP + "\n"
         
-        for iedge in iblock.edges:
-            edgeInfoStr += f"{iedge.id:5} | {iedge}\n"
-    
+        for blockId, iblock in mb.blocks.items():
+            edgeInfoStr += f"\n\n{VSEP}\nBlock ID - {blockId}\n"
+            edgeInfoStr += VSEP + "\n"
+            edgeInfoStr += "Index | ->  - Position     - Definition\n"
+            edgeInfoStr += VSEP + "\n"
+            
+            ### Written from the block vertices, edges are only created when needed
+            for edgeId, (direction, position, startIndex, endIndex) in enumerate(blockEdgeDefinition):
+                edgeInfoStr += f"{edgeId:5} | {direction:3} - {position:12} - ({iblock.vertices[startIndex]}, {iblock.vertices[endIndex]})\n"
+        
+        
+        ### Write the slice information in a file
+        edgeInfoFile = os.path.dirname(caseDir) + os.sep + "edge_information.txt"
+        with open(edgeInfoFile, "w") as eif:
+            eif.write(edgeInfoStr)
     
-    ### Write the slice information in a file
-    edgeInfoFile = os.path.dirname(caseDir) + os.sep + "edge_information.txt"
-    with open(edgeInfoFile, "w") as eif:
-        eif.write(edgeInfoStr)
     
     ### Create edit-input file if doesn't exist
     if not edit.fileExist:
@@ -253,6 +375,17 @@ if __name__ == "__main__":
     else:
         raise ValueError("Missing user input - 'read_edit_file?'")
     
+    ### Optional input, full rebuild by default
+    incremental = os.environ.get("incremental_build", "no").lower() == "yes"
+    
+    ### Optional input, no edit analysis by default
+    editAnalysis = os.environ.get("edit_analysis", "no").lower() == "yes"
+    
+    ### Optional input, polyMesh is generated by blockMesh by default
+    polyMeshFormat = None
+    if os.environ.get("write_polymesh", "no").lower() == "yes":
+        polyMeshFormat = os.environ.get("polymesh_format", "binary").lower()
+    
     make_multi_block_blockmeshdict(
             boundingBox,
             convertToMeters,
@@ -261,7 +394,10 @@ if __name__ == "__main__":
             hex2exclude,
             workingDir,
             caseDir,
-            need2modify
+            need2modify,
+            incremental,
+            editAnalysis = editAnalysis,
+            polyMeshFormat = polyMeshFormat
         )
 
 
@@ -0,0 +1,290 @@
+"""
+Parameter sweep driver for Simply MultiBlockMesh
+
+Generates one blockMeshDict per combination of the parameter values
+given in a sweep file (JSON). The variants are distributed over a
+pool of worker processes, each worker imports the code once and
+builds the variants in their own directories.
+
+Usage:
+    python simply_multiblockmesh_sweep.py /path/to/sweep.json
+
+Sweep file:
+    {
+        "sweep_directory" : "/path/to/the/sweep/directory",
+        "workers" : 4,
+        "base" : {
+            "bounding_box" : {...},
+            "convert_to_meters" : 1,
+            "split_plane_list" : {...},
+            "gid_spacing" : {...},
+            "hex2exclude" : {"exclude-list" : []},
+            "read_edit_file" : "yes",
+            "edit_file" : "/path/to/block_edit_*.py (or .json/.toml)"
+        },
+        "parameters" : {
+            "gid_spacing.x" : [0.01, 0.02],
+            "split_plane_list.x" : [[0.25, 0.75], [0.4, 0.6]],
+            "edit.blockEdit.0.radius" : [1.0, 1.5]
+        }
+    }
+    
+    Parameter names are dot separated paths into the "base" inputs.
+    Names starting with "edit." override entries of the edit file.
+    The edit file is read once, the variants share its cached edit tables.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import copy
+import shutil
+import itertools
+import contextlib
+import traceback
+
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    as_completed,
+)
+from typing import (
+    Dict,
+    List,
+)
+
+import simply_multiblockmesh as smm
+
+from operation.edit import Edit
+
+from utility.define import VSEP
+
+from utility import tool as t
+
+
+def source_edit(
+        editFile: str
+    ) -> Edit:
+    """
+    Get the edit instance of the edit file of the sweep
+    
+    Args:
+        editFile (str): Path of the edit file
+    
+    Returns:
+        Edit: Edit instance of the edit file (not read)
+    """
+    
+    edit = Edit(os.path.dirname(os.path.abspath(editFile)))
+    edit.filename = os.path.basename(editFile)
+    edit.fileExist = True
+    
+    return edit
+
+
+def set_input(
+        inputs: Dict,
+        name: str,
+        value
+    ) -> None:
+    """
+    Set a value of the (nested) user inputs
+    
+    Args:
+        inputs (Dict): User inputs
+        name (str): Dot separated path of the value, e.g. "gid_spacing.x"
+        value: New value
+    
+    Raises:
+        ValueError: If the path doesn't exist in the inputs
+    """
+    
+    *keys, lastKey = name.split(".")
+    entry = inputs
+    
+    for key in keys:
+        if key not in entry:
+            raise ValueError(f"Invalid sweep parameter --> {name}")
+        entry = entry[key]
+    
+    if lastKey not in entry:
+        raise ValueError(f"Invalid sweep parameter --> {name}")
+    
+    entry[lastKey] = value
+
+
+def create_variants(
+        base: Dict,
+        parameters: Dict
+    ) -> List[Dict]:
+    """
+    Create the variants for all combinations of the parameter values
+    
+    Args:
+        base (Dict): Base user inputs
+        parameters (Dict): List of values for each parameter
+    
+    Returns:
+        List[Dict]: Parameter values, inputs and edit overrides of the variants
+    """
+    
+    names = list(parameters.keys())
+    variants = []
+    
+    for values in itertools.product(*[parameters[x] for x in names]):
+        inputs = copy.deepcopy(base)
+        editOverride = {}
+        
+        for name, value in zip(names, values):
+            if name.startswith("edit."):
+                editOverride[name[len("edit."):]] = value
+            else:
+                set_input(inputs, name, value)
+        
+        variants.append({
+                "parameters" : dict(zip(names, values)),
+                "inputs" : inputs,
+                "editOverride" : editOverride,
+            })
+    
+    return variants
+
+
+def run_variant(
+        variantId: int,
+        workingDir: str,
+        inputs: Dict,
+        editOverride: Dict
+    ) -> Dict:
+    """
+    Build one variant in its working directory (runs in a worker process).
+    The output of the build is written in "run.log" of the working directory.
+    
+    Args:
+        variantId (int): Id of the variant
+        workingDir (str): Working directory of the variant
+        inputs (Dict): User inputs of the variant
+        editOverride (Dict): Values replacing the entries of the edit file
+    
+    Returns:
+        Dict: Id, status and run time of the variant
+    """
+    
+    os.makedirs(workingDir, exist_ok = True)
+    
+    if inputs.get("edit_file"):
+        shutil.copy(inputs["edit_file"], workingDir)
+        
+        ### The cached edit tables save reading the edit file again
+        cacheFile = source_edit(inputs["edit_file"]).cacheFile
+        if os.path.isfile(cacheFile):
+            shutil.copy(cacheFile, workingDir)
+    
+    status = "done"
+    startTime = time.perf_counter()
+    
+    with open(workingDir + os.sep + "run.log", "w") as lf, contextlib.redirect_stdout(lf):
+        try:
+            smm.make_multi_block_blockmeshdict(
+                    inputs["bounding_box"],
+                    inputs["convert_to_meters"],
+                    inputs["split_plane_list"],
+                    inputs["gid_spacing"],
+                    inputs["hex2exclude"]["exclude-list"],
+                    workingDir,
+                    workingDir + os.sep + "case",
+                    inputs.get("read_edit_file", "yes").lower() == "yes",
+                    editOverride = editOverride
+                )
+        
+        except Exception as error:
+            traceback.print_exc(file = lf)
+            status = f"failed - {error!r}"
+    
+    return {
+            "variant" : variantId,
+            "status" : status,
+            "time" : time.perf_counter() - startTime,
+        }
+
+
+def sweep(
+        sweepFile: str
+    ) -> List[Dict]:
+    """
+    Run the parameter sweep defined in a sweep file
+    
+    Args:
+        sweepFile (str): Path of the sweep file (JSON)
+    
+    Returns:
+        List[Dict]: Summary of the variants
+    """
+    
+    with open(sweepFile, "r") as sf:
+        sweepInput = json.load(sf)
+    
+    sweepDir = sweepInput["sweep_directory"]
+    workers = sweepInput.get("workers", os.cpu_count())
+    variants = create_variants(
+            sweepInput["base"],
+            sweepInput.get("parameters", {})
+        )
+    
+    ### Read the edit file once (creates the cache shared by the variants)
+    if sweepInput["base"].get("edit_file"):
+        with contextlib.redirect_stdout(io.StringIO()):
+            source_edit(sweepInput["base"]["edit_file"]).read()
+    
+    t.hl()
+    print(f"Sweep directory : {sweepDir}")
+    print(f"Variants : {len(variants)} | Workers : {workers}")
+    t.hl()
+    
+    summary = []
+    startTime = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        futures = {
+            executor.submit(
+                    run_variant,
+                    variantId,
+                    sweepDir + os.sep + f"variant_{variantId:04}",
+                    variant["inputs"],
+                    variant["editOverride"],
+                ) : variant
+            for variantId, variant in enumerate(variants)
+        }
+        
+        for future in as_completed(futures):
+            result = future.result()
+            result["parameters"] = futures[future]["parameters"]
+            summary.append(result)
+            print(f"Variant-{result['variant']:04} | {result['time']:8.3f} s | {result['status']}")
+    
+    summary.sort(key = lambda x: x["variant"])
+    
+    ### Write the sweep summary
+    with open(sweepDir + os.sep + "sweep_summary.json", "w") as sf:
+        json.dump(summary, sf, indent = 4)
+    
+    summaryStr = VSEP + "\n"
+    summaryStr += "Variant |     Time | Parameters\n"
+    summaryStr += VSEP + "\n"
+    for result in summary:
+        summaryStr += f"{result['variant']:7} | {result['time']:6.3f} s | {json.dumps(result['parameters'])}\n"
+    summaryStr += VSEP + "\n"
+    summaryStr += f"Total time : {time.perf_counter() - startTime:.3f} s\n"
+    summaryStr += f"Failed variants : {sum(x['status'] != 'done' for x in summary)}\n"
+    
+    print(summaryStr)
+    
+    return summary
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        raise ValueError("Missing user input - path of the sweep file")
+    
+    sweep(sys.argv[1])
@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+
+import pytest
+
+### The modules are imported from the code directory (as in simply_multiblockmesh.py)
+codeDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if codeDir not in sys.path:
+    sys.path.insert(0, codeDir)
+
+from entity.multiblock import MultiBlock
+from operation.edit import Edit
+
+
+### 3 x 3 x 2 blocks of 1 x 1 x 1, 4 x 4 x 4 cells each
+boundingBox = {"x-min" : 0.0, "x-max" : 3.0, "y-min" : 0.0, "y-max" : 3.0, "z-min" : 0.0, "z-max" : 2.0}
+splitPlanes = {"x" : [1.0, 2.0], "y" : [1.0, 2.0], "z" : [1.0]}
+gridSpacing = {"x" : 0.25, "y" : 0.25, "z" : 0.25}
+
+
+@pytest.fixture
+def make_multiblock():
+    """ Make a multi-block of 3 x 3 x 2 blocks, without the excluded blocks """
+    
+    def make(hex2exclude = []):
+        mb = MultiBlock(
+                boundingBox,
+                splitPlanes,
+                gridSpacing,
+                hex2exclude
+            )
+        mb.make()
+        
+        return mb
+    
+    return make
+
+
+@pytest.fixture
+def write_edit(tmp_path):
+    """ Write the task tables in a (JSON) edit file and read it """
+    
+    def write(tables, workingDir = tmp_path):
+        for editFile in workingDir.glob("block_edit_*"):
+            editFile.unlink()
+        
+        with open(workingDir / "block_edit_test.json", "w") as ef:
+            json.dump(tables, ef)
+        
+        edit = Edit(str(workingDir))
+        edit.does_file_exists()
+        edit.read()
+        
+        return edit
+    
+    return write
@@ -0,0 +1,25 @@
+import numpy as np
+
+
+def test_bounds_follow_edits(make_multiblock):
+    mb = make_multiblock()
+    bounds = mb.geometry.bounds().copy()
+    
+    ### Vertex 21 (1, 1, 1) is a corner of the blocks 0, 1, 3, 4, 9, 10, 12, 13
+    mb.vertices[21].move(delta = [0.5, 0.0, 0.0])
+    
+    expected = bounds.copy()
+    expected[[0, 3, 9, 12], 1] = 1.5
+    
+    np.testing.assert_array_equal(mb.geometry.bounds(), expected)
+    
+    mb.geometry.invalidate()
+    np.testing.assert_array_equal(mb.geometry.bounds(), expected)
+
+
+def test_cell_count_of_lattice(make_multiblock):
+    mb = make_multiblock()
+    mb.vertices[21].move(delta = [0.5, 0.0, 0.0])
+    
+    ### Counts of the last block (before the edits) for every block
+    np.testing.assert_array_equal(mb.geometry.cell_count(), np.full((18, 3), 4))
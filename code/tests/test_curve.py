@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from utility.curve import Curve
+
+
+def circle_point(angle):
+    return [np.cos(np.radians(angle)), np.sin(np.radians(angle)), 0.0]
+
+
+@pytest.fixture
+def circle():
+    return Curve.from_definition({"type" : "ellipse", "center" : [0, 0, 0], "major-axis" : [1, 0, 0], "minor-axis" : [0, 1, 0]})
+
+
+@pytest.mark.parametrize("startAngle, endAngle", [(-45, 45), (45, -45), (-10, 10), (350, 370), (10, 100)])
+def test_closed_curve_shorter_way(circle, startAngle, endAngle):
+    ### Edge across the start/end (0 degree) of the curve --> sampled the shorter way round
+    points = circle.sample([circle_point(startAngle)], [circle_point(endAngle)], 1e-4)[0]
+    angles = np.degrees(np.arctan2(points[:, 1], points[:, 0]))
+    
+    assert len(points) > 0
+    assert np.allclose(np.linalg.norm(points, axis = 1), 1.0)
+    assert ((np.mod(angles - min(startAngle, endAngle), 360.0)) < abs(endAngle - startAngle)).all()
+
+
+def test_closed_curve_given_range(circle):
+    ### Given parameters are kept --> the longer way round
+    points = circle.sample([circle_point(-45)], [circle_point(45)], 1e-4, [[315, 45]])[0]
+    
+    assert points[:, 0].min() == pytest.approx(-1.0, abs = 1e-3)
+
+
+def test_open_curve():
+    helix = Curve.from_definition({"type" : "helix", "origin" : [0, 0, 0], "axis" : [0, 0, 1], "radius-vector" : [1, 0, 0], "pitch" : 1.0, "angle-range" : [0, 360]})
+    
+    assert not helix.is_closed()
@@ -0,0 +1,224 @@
+import os
+import re
+import json
+import pickle
+
+import pytest
+
+from operation.edit import Edit
+from operation.editdata import read_edit_data
+from simply_multiblockmesh import make_multi_block_blockmeshdict
+
+from utility.define import taskTypeCheck
+
+from conftest import codeDir, boundingBox, splitPlanes, gridSpacing
+
+
+### Spline of an edge on a curve given by a function (of a global amplitude)
+curveEditFile = """
+import numpy as np
+
+edgeEdit = {}
+edgeEdit[0] = {
+    "edit-type" : "make-spline",
+    "edge" : {"block-id" : 0, "position" : ["back", "bottom"]},
+    "method" : "curve",
+    "curve" : lambda s: np.stack([s, AMPLITUDE * np.sin(np.pi * s), 0.0 * s], axis = 1),
+    "tolerance" : 1e-3,
+}
+
+AMPLITUDE = 0.1
+"""
+
+
+def read_edit_file(workingDir, content, name = "block_edit_test.py"):
+    for editFile in workingDir.glob("block_edit_*"):
+        editFile.unlink()
+    (workingDir / name).write_text(content)
+    
+    edit = Edit(str(workingDir))
+    edit.does_file_exists()
+    edit.read()
+    
+    return edit
+
+
+def test_task_hash_canonical(tmp_path):
+    ### Same tasks read twice --> new function objects, same hash
+    taskHash = read_edit_file(tmp_path, curveEditFile).task_hash(["edgeEdit"])
+    
+    assert read_edit_file(tmp_path, curveEditFile).task_hash(["edgeEdit"]) == taskHash
+    assert read_edit_file(tmp_path, "\n\n" + curveEditFile).task_hash(["edgeEdit"]) == taskHash
+    
+    ### Changed global value/bytecode of the function --> new hash
+    assert read_edit_file(tmp_path, curveEditFile.replace("0.1", "0.2")).task_hash(["edgeEdit"]) != taskHash
+    assert read_edit_file(tmp_path, curveEditFile.replace("np.sin", "np.cos")).task_hash(["edgeEdit"]) != taskHash
+
+
+def test_task_hash_order(tmp_path):
+    tasks = [
+        '"0" : {"edit-type" : "move", "id" : 5, "delta" : [0.1, 0, 0]}',
+        '"1" : {"id" : 6, "edit-type" : "move", "delta" : [0.1, 0, 0]}',
+    ]
+    
+    ### Order of the tasks/entries in the file doesn't matter, the values do
+    taskHash = read_edit_file(tmp_path, "{\"vertexEdit\" : {" + ", ".join(tasks) + "}}", "block_edit_test.json").task_hash(["vertexEdit"])
+    
+    assert read_edit_file(tmp_path, "{\"vertexEdit\" : {" + ", ".join(tasks[::-1]) + "}}", "block_edit_test.json").task_hash(["vertexEdit"]) == taskHash
+    assert read_edit_file(tmp_path, "{\"vertexEdit\" : {" + ", ".join(tasks).replace("0.1", "1e-1") + "}}", "block_edit_test.json").task_hash(["vertexEdit"]) == taskHash
+    assert read_edit_file(tmp_path, "{\"vertexEdit\" : {" + ", ".join(tasks).replace("0.1", "0.15") + "}}", "block_edit_test.json").task_hash(["vertexEdit"]) != taskHash
+
+
+def test_incremental_build_reused(tmp_path, capsys):
+    (tmp_path / "block_edit_test.py").write_text(curveEditFile)
+    
+    for run in range(2):
+        make_multi_block_blockmeshdict(
+                boundingBox,
+                1.0,
+                splitPlanes,
+                gridSpacing,
+                [],
+                str(tmp_path),
+                str(tmp_path / "case"),
+                True,
+                True
+            )
+    
+    ### Second run --> nothing changed, the snapshot is reused
+    changes = re.findall(r"(\w+)\s+: (True|False)", capsys.readouterr().out.split("changes since the previous run")[-1])
+    
+    assert dict(changes[:3]) == {"multiblock" : "False", "edit" : "False", "boundary" : "False"}
+    assert "spline" in (tmp_path / "case" / "system" / "blockMeshDict").read_text()
+
+
+### Generated (data-only) edit file
+dataEditFile = """
+vertexEdit = {}
+for vertexId in [5, 6, 9, 10]:
+    vertexEdit[len(vertexEdit)] = {"edit-type" : "move", "id" : vertexId, "delta" : (0.1, 0, 0)}
+
+boundary = {0 : {"name" : "inlet", "type" : "patch", "faces" : [[0, "left"], [3, "left"]]}}
+"""
+
+
+class PlantedCache:
+    """ Pickle creating a file when it's loaded """
+    
+    def __init__(self, path):
+        self.path = path
+    
+    def __reduce__(self):
+        return (open, (self.path, "w"))
+
+
+def test_edit_cache(tmp_path, capsys):
+    tables = read_edit_file(tmp_path, dataEditFile).task
+    
+    assert json.loads((tmp_path / ".block_edit_test.py.cache").read_text())["version"] == 2
+    
+    ### Same tables (integer keys, tuples) from the cache
+    edit = Edit(str(tmp_path))
+    edit.does_file_exists()
+    edit.read()
+    
+    assert "Edit tables read from the cache." in capsys.readouterr().out
+    assert edit.task.vertexEdit == tables.vertexEdit
+    assert edit.task.boundary == tables.boundary
+    assert edit.task.vertexEdit[3]["delta"] == (0.1, 0, 0)
+
+
+def test_edit_cache_planted(tmp_path):
+    (tmp_path / "block_edit_test.py").write_text(dataEditFile)
+    (tmp_path / ".block_edit_test.py.cache").write_bytes(pickle.dumps(PlantedCache(str(tmp_path / "planted"))))
+    
+    ### The cache is never unpickled, the edit file is read and cached again
+    edit = read_edit_file(tmp_path, dataEditFile)
+    
+    assert not (tmp_path / "planted").exists()
+    assert len(edit.task.vertexEdit) == 4
+    assert json.loads((tmp_path / ".block_edit_test.py.cache").read_text())["tables"] is not None
+
+
+def test_edit_cache_environment(tmp_path, monkeypatch):
+    ### Tables depending on the environment --> not cached
+    environmentEditFile = dataEditFile.replace("0.1", "float(os.environ['EDIT_DELTA'])")
+    
+    monkeypatch.setenv("EDIT_DELTA", "0.1")
+    assert read_edit_file(tmp_path, "import os\n" + environmentEditFile).task.vertexEdit[0]["delta"][0] == 0.1
+    assert not (tmp_path / ".block_edit_test.py.cache").exists()
+    
+    monkeypatch.setenv("EDIT_DELTA", "0.2")
+    assert read_edit_file(tmp_path, "import os\n" + environmentEditFile).task.vertexEdit[0]["delta"][0] == 0.2
+    
+    ### Functions in the tables --> not cached
+    read_edit_file(tmp_path, dataEditFile + "\nedgeEdit = {0 : {'curve' : lambda s: s}}\n")
+    assert not (tmp_path / ".block_edit_test.py.cache").exists()
+
+
+### Same tasks in the Python, JSON and TOML edit files
+pythonTasks = """
+vertexEdit = {0 : {"edit-type" : "move", "id" : 5, "delta" : [0.1, 0.0, 0.0]}}
+boundary = {0 : {"name" : "inlet", "type" : "patch", "faces" : [[0, "left"], [3, "left"]]}}
+"""
+
+jsonTasks = """
+{
+    "vertexEdit" : {"0" : {"edit-type" : "move", "id" : 5, "delta" : [0.1, 0.0, 0.0]}},
+    "boundary" : [{"name" : "inlet", "type" : "patch", "faces" : [[0, "left"], [3, "left"]]}]
+}
+"""
+
+tomlTasks = """
+[vertexEdit.0]
+edit-type = "move"
+id = 5
+delta = [0.1, 0.0, 0.0]
+
+[[boundary]]
+name = "inlet"
+type = "patch"
+faces = [[0, "left"], [3, "left"]]
+"""
+
+
+@pytest.mark.parametrize("name, content", [
+        ("block_edit_test.json", jsonTasks),
+        ("block_edit_test.toml", tomlTasks),
+    ])
+def test_edit_data_file(tmp_path, name, content):
+    python = read_edit_file(tmp_path, pythonTasks).task
+    data = read_edit_file(tmp_path, content, name).task
+    
+    assert data.vertexEdit == python.vertexEdit
+    assert data.boundary == python.boundary
+    assert read_edit_file(tmp_path, content, name).task_hash(["vertexEdit", "boundary"]) == read_edit_file(tmp_path, pythonTasks).task_hash(["vertexEdit", "boundary"])
+
+
+def test_edit_data_errors(tmp_path):
+    content = """
+    {
+        "vertexEdits" : {},
+        "edgeEdit" : {"a" : {"edit-type" : "make-arc"}},
+        "faceEdit" : {"0" : {"edit-type" : "rotate"}},
+        "blockEdit" : {"0" : {"block-id" : 4}}
+    }
+    """
+    
+    ### All structural errors are reported together
+    with pytest.raises(ValueError) as error:
+        read_edit_file(tmp_path, content, "block_edit_test.json")
+    
+    assert "unknown task type 'vertexEdits'" in str(error.value)
+    assert "edgeEdit['a'] : task id must be a non-negative integer" in str(error.value)
+    assert "faceEdit['0'] : unknown edit type 'rotate'" in str(error.value)
+    assert "blockEdit['0'] : missing entry 'edit-type'" in str(error.value)
+    
+    with pytest.raises(ValueError, match = "can't be parsed"):
+        read_edit_file(tmp_path, "{", "block_edit_test.json")
+
+
+def test_sample_edit_data():
+    sampleFile = os.path.join(os.path.dirname(codeDir), "input_template", "sample_edit_commands.json")
+    
+    assert set(read_edit_data(sampleFile)) <= set(taskTypeCheck)
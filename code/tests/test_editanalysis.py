@@ -0,0 +1,58 @@
+from operation.editanalysis import EditAnalysis
+from operation.editplan import EditPlan
+
+
+### Vertex 5 is moved, collapsed to and moved with block 0, block 17 is edited apart
+overlapTasks = {
+    "vertexEdit" : {
+        "0" : {"edit-type" : "move", "id" : 5, "delta" : [0.1, 0.0, 0.0]},
+        "1" : {"edit-type" : "move", "id" : 6, "delta" : [0.0, 0.1, 0.0]},
+        "2" : {"edit-type" : "collapse", "id" : 6, "target-vertex" : 5},
+    },
+    "faceEdit" : {
+        "0" : {"edit-type" : "move", "face" : {"block-id" : 17, "side" : "top"}, "delta" : [0.0, 0.1, 0.0]},
+    },
+    "blockEdit" : {
+        "0" : {"edit-type" : "move", "block-id" : 0, "delta" : [0.0, 0.0, 0.1]},
+    },
+    "boundary" : {
+        "0" : {"name" : "inlet", "type" : "patch", "faces" : [[0, "left"]]},
+    },
+}
+
+taskTypes = ["vertexEdit", "faceEdit", "blockEdit", "boundary"]
+
+
+def test_overlaps(make_multiblock, write_edit):
+    mb = make_multiblock()
+    plan = EditPlan(mb).compile(write_edit(overlapTasks).task, taskTypes)
+    analysis = EditAnalysis(plan)
+    
+    labels = [[EditAnalysis.task_label(x) for x in group] for group in analysis.group_steps()]
+    
+    assert analysis.groupCount == 3
+    assert labels == [
+        ["vertexEdit[0]", "vertexEdit[1]", "vertexEdit[2]", "blockEdit[0]"],
+        ["faceEdit[0]"],
+        ["boundary[0]"],
+    ]
+    
+    ### Direct dependencies --> previous task on the same vertex
+    positions = {EditAnalysis.task_label(x) : i for i, x in enumerate(plan.steps)}
+    assert analysis.dependencies() == {
+        positions["vertexEdit[2]"] : {positions["vertexEdit[0]"] : 1, positions["vertexEdit[1]"] : 1},
+        positions["blockEdit[0]"] : {positions["vertexEdit[2]"] : 1},
+    }
+    assert [EditAnalysis.task_label(x) for x in analysis.tasks_of_vertex(5)] == ["vertexEdit[0]", "vertexEdit[2]", "blockEdit[0]"]
+
+
+def test_report(make_multiblock, write_edit):
+    mb = make_multiblock()
+    edit = write_edit(overlapTasks)
+    edit.execute(mb, analyzeEdits = True)
+    
+    report = edit.analysis.report()
+    
+    assert "Independent groups : 3" in report
+    assert "Vertices touched by more than one task : 2" in report
+    assert "blockEdit[0] <-- vertexEdit[2] (1)" in report
@@ -0,0 +1,100 @@
+import copy
+
+import numpy as np
+import pytest
+
+from operation.editjournal import EditJournal
+from operation.setup import Setup
+
+
+editTasks = {
+    "vertexEdit" : {
+        "0" : {"edit-type" : "move", "id" : 21, "delta" : [0.1, 0.1, 0.0]},
+        "1" : {"edit-type" : "scale", "id" : 26, "ratio" : 0.8, "reference" : [1.5, 1.5, 1.0]},
+        "2" : {"edit-type" : "collapse", "id" : 15, "target-vertex" : 14},
+    },
+    "edgeEdit" : {
+        "0" : {"edit-type" : "make-arc", "edge" : {"block-id" : 1, "position" : ["back", "bottom"]}, "method" : "arc-point", "arc-point" : [1.5, -0.2, 0.0]},
+    },
+    "blockEdit" : {
+        "0" : {"edit-type" : "move", "block-id" : [13], "delta" : [0.0, 0.0, 0.1]},
+    },
+    "boundary" : {
+        "0" : {"name" : "inlet", "type" : "patch", "faces" : [[0, "left"], [3, "left"]]},
+    },
+}
+
+
+def state(mb):
+    """ Edited state of a multi-block --> coordinates, merges, block activity, blockMeshDict sections """
+    
+    setup = Setup("", "")
+    
+    return (
+            mb.vertexStore.coordinates.copy(),
+            mb.vertexStore.roots(),
+            mb.activeMask.copy(),
+            ["".join(x) for x in [setup.vertices_section(mb), setup.blocks_section(mb), setup.edges_section(mb), setup.boundary_section(mb.boundaryDefinition)]],
+        )
+
+
+def assert_same_state(state, expectedState):
+    for value, expectedValue in zip(state[:3], expectedState[:3]):
+        np.testing.assert_array_equal(value, expectedValue)
+    
+    assert state[3] == expectedState[3]
+
+
+def changed_tasks(change):
+    """ Edit tasks with a change --> changed, removed or added tasks """
+    
+    tasks = copy.deepcopy(editTasks)
+    
+    if change == "vertex":
+        tasks["vertexEdit"]["1"]["ratio"] = 1.2
+    elif change == "edge":
+        tasks["edgeEdit"]["0"]["arc-point"] = [1.5, -0.4, 0.0]
+    elif change == "collapse":
+        del tasks["vertexEdit"]["2"]
+    elif change == "block":
+        tasks["blockEdit"]["1"] = {"edit-type" : "scale-3d", "block-id" : [13], "ratio" : 0.5}
+    elif change == "boundary":
+        tasks["boundary"]["0"]["faces"] = [[6, "left"]]
+    
+    return tasks
+
+
+def test_journal_build(make_multiblock, write_edit):
+    journaled = make_multiblock([4])
+    write_edit(editTasks).execute(journaled, journal = EditJournal(journaled))
+    
+    fresh = make_multiblock([4])
+    write_edit(editTasks).execute(fresh)
+    
+    assert_same_state(state(journaled), state(fresh))
+
+
+@pytest.mark.parametrize("change", ["vertex", "edge", "collapse", "block", "boundary"])
+def test_reapply(make_multiblock, write_edit, change):
+    ### Journaled build, then the changed tasks are rolled back and applied again
+    journaled = make_multiblock([4])
+    journal = EditJournal(journaled)
+    write_edit(editTasks).execute(journaled, journal = journal)
+    write_edit(changed_tasks(change)).execute(journaled, journal = journal)
+    
+    fresh = make_multiblock([4])
+    write_edit(changed_tasks(change)).execute(fresh)
+    
+    assert_same_state(state(journaled), state(fresh))
+
+
+def test_rollback(make_multiblock, write_edit):
+    mb = make_multiblock([4])
+    initialState = state(mb)
+    
+    journal = EditJournal(mb)
+    write_edit(editTasks).execute(mb, journal = journal)
+    journal.rollback()
+    
+    assert len(journal) == 0
+    assert_same_state(state(mb), initialState)
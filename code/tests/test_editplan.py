@@ -0,0 +1,61 @@
+import types
+
+import numpy as np
+import pytest
+
+from operation.editplan import EditPlan
+
+
+def random_vertex_tasks(count, vertexIds, seed = 0):
+    """ Vertex move (new location/delta) and scale tasks, several on the same vertices """
+    
+    rng = np.random.default_rng(seed)
+    tasks = {}
+    
+    for taskId in range(count):
+        vertexId = int(rng.choice(vertexIds))
+        editType = ["new-location", "delta", "scale"][rng.integers(3)]
+        
+        if editType == "scale":
+            tasks[taskId] = {"edit-type" : "scale", "id" : vertexId, "ratio" : float(rng.uniform(0.5, 1.5)), "reference" : rng.uniform(0.0, 2.0, 3).tolist()}
+        else:
+            tasks[taskId] = {"edit-type" : "move", "id" : vertexId, editType : rng.uniform(-0.3, 0.3, 3).tolist()}
+    
+    return tasks
+
+
+def execute_sequential(plan):
+    """ Execute the steps of a plan one by one (no batches) """
+    
+    for step in plan.steps:
+        step.handler(step.arguments)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_vertex_batch(make_multiblock, seed):
+    vertexTasks = random_vertex_tasks(200, [5, 6, 9, 10, 21, 22, 25, 26], seed)
+    
+    ### A collapse in between --> the batch is applied in two parts
+    vertexTasks[80] = {"edit-type" : "collapse", "id" : 22, "target-vertex" : 21}
+    taskModule = types.SimpleNamespace(
+            vertexEdit = vertexTasks,
+            faceEdit = {0 : {"edit-type" : "move", "face" : {"block-id" : 4, "side" : "top"}, "delta" : [0.0, 0.1, 0.0]}},
+        )
+    
+    batched = make_multiblock()
+    EditPlan(batched).compile(taskModule, ["vertexEdit", "faceEdit"]).execute()
+    
+    sequential = make_multiblock()
+    execute_sequential(EditPlan(sequential).compile(taskModule, ["vertexEdit", "faceEdit"]))
+    
+    ### Same arithmetic --> bit-identical coordinates
+    np.testing.assert_array_equal(batched.vertexStore.coordinates, sequential.vertexStore.coordinates)
+    np.testing.assert_array_equal(batched.vertexStore.parent, sequential.vertexStore.parent)
+    assert not np.array_equal(batched.vertexStore.coordinates, make_multiblock().vertexStore.coordinates)
+
+
+def test_vertex_batch_invalid_ratio(make_multiblock):
+    taskModule = types.SimpleNamespace(vertexEdit = {0 : {"edit-type" : "scale", "id" : 5, "ratio" : "2", "reference" : [0.0, 0.0, 0.0]}})
+    
+    with pytest.raises(ValueError, match = "'ratio' must be a number"):
+        EditPlan(make_multiblock()).compile(taskModule, ["vertexEdit"])
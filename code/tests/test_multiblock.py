@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from entity.multiblock import MultiBlock
+from operation.setup import Setup
+
+from conftest import boundingBox, splitPlanes, gridSpacing
+
+
+def test_edges_order_kept(make_multiblock):
+    mb = make_multiblock()
+    
+    mb.blocks[4].edges
+    firstEdges = mb.edges
+    
+    ### Edges registered after the first call are merged in block order
+    for blockId in (17, 0, 9):
+        mb.blocks[blockId].edges
+    
+    expected = sorted(mb.edgeRegistry.values(), key = mb._edge_order)
+    
+    assert firstEdges == sorted(firstEdges, key = mb._edge_order)
+    assert mb.edges == expected
+    assert mb.get_edges() == expected
+
+
+def test_edges_not_sorted_again(make_multiblock, monkeypatch):
+    mb = make_multiblock()
+    
+    for blockId in range(len(mb.blocks)):
+        mb.blocks[blockId].edges
+    
+    mb.edges
+    
+    ### No new edge --> the ordered edges are reused
+    calls = []
+    edgeOrder = mb._edge_order
+    monkeypatch.setattr(mb, "_edge_order", lambda edge: calls.append(edge) or edgeOrder(edge))
+    
+    mb.edges
+    mb.edges
+    
+    assert calls == []
+
+
+### Collapse, curved edge, block grading and boundary to save
+savedTasks = {
+    "vertexEdit" : {
+        "0" : {"edit-type" : "collapse", "id" : 15, "target-vertex" : 14},
+        "1" : {"edit-type" : "move", "id" : 21, "delta" : [0.1, 0.2, 0]},
+    },
+    "edgeEdit" : {
+        "0" : {"edit-type" : "make-arc", "edge" : {"block-id" : 0, "position" : ["back", "bottom"]}, "method" : "arc-point", "arc-point" : [0.5, -0.1, 0.0]},
+    },
+    "boundary" : {
+        "0" : {"name" : "inlet", "type" : "patch", "faces" : [[0, "left"], [3, "left"]]},
+    },
+}
+
+
+def blockmeshdict_sections(mb):
+    setup = Setup("", "")
+    
+    return (
+        list(setup.vertices_section(mb)),
+        list(setup.blocks_section(mb)),
+        list(setup.edges_section(mb)),
+        list(setup.boundary_section(mb.boundaryDefinition)),
+    )
+
+
+def test_save_load(make_multiblock, write_edit, tmp_path):
+    mb = make_multiblock([4])
+    edit = write_edit(savedTasks)
+    edit.execute(mb)
+    mb.blocks[0].grading = {"x" : 2.0, "y" : 1, "z" : 1}
+    
+    mb.save(str(tmp_path / "mb.npz"))
+    
+    ### Loaded from the arrays, restored into a made multi-block --> same blockMeshDict
+    restored = make_multiblock([4])
+    restored.restore(str(tmp_path / "mb.npz"))
+    
+    assert blockmeshdict_sections(MultiBlock.load(str(tmp_path / "mb.npz"))) == blockmeshdict_sections(mb)
+    assert blockmeshdict_sections(restored) == blockmeshdict_sections(mb)
+    assert any("arc" in x for x in blockmeshdict_sections(mb)[2])
+    
+    ### Different lattice (2 x 3 x 2 blocks)
+    other = MultiBlock(boundingBox, splitPlanes | {"x" : [1.0]}, gridSpacing, [])
+    other.make()
+    
+    with pytest.raises(ValueError, match = "doesn't match"):
+        other.restore(str(tmp_path / "mb.npz"))
+
+
+def test_load_version(make_multiblock, tmp_path):
+    make_multiblock().save(str(tmp_path / "mb.npz"))
+    
+    with np.load(tmp_path / "mb.npz") as data:
+        content = dict(data)
+    content["version"] = np.array(0)
+    np.savez(tmp_path / "old.npz", **content)
+    
+    with pytest.raises(ValueError, match = "Unsupported multi-block file version"):
+        MultiBlock.load(str(tmp_path / "old.npz"))
+
+
+def test_circle_array_span(make_multiblock):
+    mb = make_multiblock()
+    
+    ### No circle spans 4 x 4 blocks --> the collected span errors are raised
+    with pytest.raises(ValueError, match = "circle 0 : blocks 0 - 8 must span 4 x 4 blocks.*circle 1 : blocks 0 - 4"):
+        mb.check_circle_array([0, 0], [8, 4])
+
+
+def test_circle_array_outside(make_multiblock):
+    mb = make_multiblock()
+    
+    with pytest.raises(ValueError, match = "outside of the multi-block"):
+        mb.check_circle_array([0], [18])
@@ -0,0 +1,274 @@
+import re
+
+import numpy as np
+import pytest
+
+from entity.multiblock import MultiBlock
+from operation.polymesh import PolyMesh
+from operation.setup import Setup, blockMeshDictHeader
+from simply_multiblockmesh import make_multi_block_blockmeshdict
+
+from conftest import boundingBox, gridSpacing
+
+
+convertToMeters = 2.0
+
+
+def vertex_id(mb, location):
+    """ Id of the vertex at a location """
+    
+    return int(np.flatnonzero((mb.vertexStore.coordinates == location).all(axis = 1))[0])
+
+
+def side_blocks(mb, axis, index):
+    """ Ids of the active blocks at a block index along an axis """
+    
+    return np.flatnonzero((mb.multiBlockIndices[:, axis] == index) & mb.activeMask).tolist()
+
+
+def face_geometry(points, faces):
+    """ Center and area vector of the faces """
+    
+    facePoints = points[faces]
+    area = 0.5 * np.cross(facePoints[:, 2] - facePoints[:, 0], facePoints[:, 3] - facePoints[:, 1])
+    
+    return facePoints.mean(axis = 1), area
+
+
+def read_polymesh_list(data, position, dtype, binary):
+    """ Read an OpenFOAM list (after a position of a file) --> values, position after the list """
+    
+    match = re.compile(rb"(\d+)\s*\(").search(data, position)
+    size, start = int(match.group(1)), match.end()
+    
+    if binary:
+        values = np.frombuffer(data, dtype = dtype, count = size * (3 if dtype == np.float64 else 1), offset = start)
+        return values, start + values.nbytes + 1
+    
+    end = data.index(b"\n)", start)
+    body = re.sub(rb"\b4\(", b" ", data[start:end]) if dtype != np.float64 else data[start:end]
+    
+    return np.array(body.replace(b"(", b" ").replace(b")", b" ").split(), dtype = dtype), end + 2
+
+
+def read_polymesh(polyMeshDir):
+    """ Read the points, faces, owner and neighbour files """
+    
+    polyMesh = {}
+    for name in ["points", "faces", "owner", "neighbour"]:
+        data = (polyMeshDir / name).read_bytes()
+        binary = b"format      binary" in data
+        labelType = np.int32 if b"label=32" in data or not binary else np.int64
+        dtype = np.float64 if name == "points" else labelType
+        position = data.index(b"// * * ")
+        
+        if name == "faces" and binary:
+            offsets, position = read_polymesh_list(data, position, dtype, binary)
+            assert (np.diff(offsets) == 4).all()
+        
+        polyMesh[name] = read_polymesh_list(data, position, dtype, binary)[0]
+    
+    polyMesh["points"] = polyMesh["points"].reshape(-1, 3)
+    polyMesh["faces"] = polyMesh["faces"].reshape(-1, 4)
+    
+    return polyMesh
+
+
+@pytest.fixture
+def deformed_polymesh(make_multiblock, write_edit):
+    """
+    3 x 3 x 2 blocks, the corner block at the origin excluded, an inner vertex
+    moved (off the block planes), a vertex on the left side moved in the side
+    plane, patches on the left (x-min, inlet) and back (z-min, walls) sides
+    """
+    
+    mb = make_multiblock([0])
+    
+    edit = write_edit({
+            "vertexEdit" : {
+                "0" : {"edit-type" : "move", "id" : vertex_id(mb, [2.0, 2.0, 1.0]), "delta" : [0.2, 0.1, -0.1]},
+                "1" : {"edit-type" : "move", "id" : vertex_id(mb, [0.0, 2.0, 1.0]), "delta" : [0.0, 0.2, 0.1]},
+            },
+            "boundary" : {
+                "0" : {"name" : "inlet", "type" : "patch", "faces" : [[x, "left"] for x in side_blocks(mb, 0, 0)]},
+                "1" : {"name" : "walls", "type" : "wall", "faces" : [[x, "back"] for x in side_blocks(mb, 2, 0)]},
+            },
+        })
+    edit.execute(mb)
+    
+    return PolyMesh(mb, edit.boundaryDefinition, convertToMeters).build()
+
+
+def test_counts(deformed_polymesh):
+    pm = deformed_polymesh
+    
+    ### 17 blocks of 4 x 4 x 4 cells, the nodes inside of the excluded block aren't used
+    assert pm.nCells == 17 * 64
+    assert pm.nPoints == 13 * 13 * 9 - 4 * 4 * 4
+    assert np.unique(pm.faces).size == pm.nPoints
+    assert pm.nFaces == (6 * pm.nCells + sum(x[2] for x in pm.patches)) // 2
+    
+    ### Every cell is a hexahedron
+    assert (np.bincount(np.concatenate((pm.owner, pm.neighbour)), minlength = pm.nCells) == 6).all()
+    
+    ### No face is written twice
+    assert len(np.unique(np.sort(pm.faces, axis = 1), axis = 0)) == pm.nFaces
+
+
+def test_upper_triangular(deformed_polymesh):
+    pm = deformed_polymesh
+    internalOwner = pm.owner[:pm.nInternalFaces]
+    
+    assert (internalOwner < pm.neighbour).all()
+    assert (np.diff(internalOwner.astype(np.int64) * pm.nCells + pm.neighbour) > 0).all()
+    
+    ### Boundary faces of a patch are consecutive, after the internal faces
+    startFace = pm.nInternalFaces
+    for name, patchType, nFaces, patchStart in pm.patches:
+        assert patchStart == startFace
+        startFace += nFaces
+    assert startFace == pm.nFaces
+
+
+def test_closed_cells(deformed_polymesh):
+    pm = deformed_polymesh
+    area = face_geometry(pm.points, pm.faces)[1]
+    
+    ### Area vectors of the faces of a cell (outward) add up to zero
+    cellArea = np.zeros((pm.nCells, 3))
+    np.add.at(cellArea, pm.owner, area)
+    np.add.at(cellArea, pm.neighbour, -area[:pm.nInternalFaces])
+    
+    assert np.abs(cellArea).max() < 1e-12
+
+
+def test_positive_volume(deformed_polymesh):
+    pm = deformed_polymesh
+    faceCenter, area = face_geometry(pm.points, pm.faces)
+    
+    ### Divergence theorem
+    faceVolume = (faceCenter * area).sum(axis = 1) / 3.0
+    cellVolume = np.zeros(pm.nCells)
+    np.add.at(cellVolume, pm.owner, faceVolume)
+    np.add.at(cellVolume, pm.neighbour, -faceVolume[:pm.nInternalFaces])
+    
+    assert (cellVolume > 0.0).all()
+    assert cellVolume.sum() == pytest.approx(17 * convertToMeters**3)
+
+
+def test_outward_faces(deformed_polymesh):
+    pm = deformed_polymesh
+    faceCenter, area = face_geometry(pm.points, pm.faces)
+    
+    cellCenter = np.zeros((pm.nCells, 3))
+    np.add.at(cellCenter, pm.owner, faceCenter)
+    np.add.at(cellCenter, pm.neighbour, faceCenter[:pm.nInternalFaces])
+    cellCenter /= 6.0
+    
+    ### Faces point from the owner to the neighbour, boundary faces out of the domain
+    assert ((cellCenter[pm.neighbour] - cellCenter[pm.owner[:pm.nInternalFaces]]) * area[:pm.nInternalFaces]).sum(axis = 1).min() > 0.0
+    assert ((faceCenter - cellCenter[pm.owner]) * area).sum(axis = 1)[pm.nInternalFaces:].min() > 0.0
+
+
+def test_patches(deformed_polymesh):
+    pm = deformed_polymesh
+    area = face_geometry(pm.points, pm.faces)[1]
+    
+    assert [x[:2] for x in pm.patches] == [("inlet", "patch"), ("walls", "wall"), ("defaultFaces", "empty")]
+    
+    patchArea = {name : area[start:start + nFaces].sum(axis = 0) for name, patchType, nFaces, start in pm.patches}
+    
+    ### Sides of the active blocks --> 5 on the left (x = 0), 8 on the back (z = 0)
+    assert patchArea["inlet"] == pytest.approx([-5.0 * convertToMeters**2, 0.0, 0.0], abs = 1e-12)
+    assert patchArea["walls"] == pytest.approx([0.0, 0.0, -8.0 * convertToMeters**2], abs = 1e-12)
+    
+    ### The boundary is closed
+    assert np.abs(area[pm.nInternalFaces:].sum(axis = 0)).max() < 1e-12
+
+
+@pytest.mark.parametrize("binary", [True, False])
+def test_write(deformed_polymesh, tmp_path, binary):
+    pm = deformed_polymesh
+    pm.write(str(tmp_path), binary)
+    written = read_polymesh(tmp_path)
+    
+    np.testing.assert_allclose(written["points"], pm.points, rtol = 1e-11, atol = 1e-12)
+    np.testing.assert_array_equal(written["faces"], pm.faces)
+    np.testing.assert_array_equal(written["owner"], pm.owner)
+    np.testing.assert_array_equal(written["neighbour"], pm.neighbour)
+    
+    boundary = (tmp_path / "boundary").read_text()
+    for name, patchType, nFaces, startFace in pm.patches:
+        assert re.search(rf"{name}\s*{{\s*type\s+{patchType};[^}}]*nFaces\s+{nFaces};\s*startFace\s+{startFace};", boundary)
+
+
+def test_curved_edge(make_multiblock, write_edit):
+    mb = make_multiblock()
+    edit = write_edit({
+            "edgeEdit" : {
+                "0" : {
+                    "edit-type" : "make-arc",
+                    "edge" : {"block-id" : 1, "position" : ["back", "bottom"]},
+                    "method" : "arc-point",
+                    "arc-point" : [1.5, -0.2, 0.0],
+                },
+            },
+        })
+    edit.execute(mb)
+    
+    with pytest.raises(ValueError, match = "curved edges"):
+        PolyMesh(mb, []).build()
+
+
+def test_boundary_face_inside(make_multiblock, write_edit):
+    mb = make_multiblock()
+    edit = write_edit({"boundary" : {"0" : {"name" : "inside", "type" : "patch", "faces" : [[0, "right"]]}}})
+    edit.execute(mb)
+    
+    with pytest.raises(ValueError, match = "isn't on the boundary"):
+        PolyMesh(mb, edit.boundaryDefinition).build()
+
+
+def test_header(deformed_polymesh, tmp_path):
+    deformed_polymesh.write(str(tmp_path), False)
+    
+    ### Same banner/layout as blockMeshDict
+    header = (tmp_path / "points").read_text().split("FoamFile")[0]
+    
+    assert header == blockMeshDictHeader.split("FoamFile")[0]
+    assert 'location    "constant/polyMesh";' in (tmp_path / "points").read_text()
+
+
+def test_cell_count_non_uniform():
+    ### Blocks of different sizes --> the hex counts written in blockMeshDict
+    mb = MultiBlock(boundingBox, {"x" : [0.5, 2.0], "y" : [1.0], "z" : [1.5]}, gridSpacing, [])
+    mb.make()
+    
+    hexCounts = [
+            [int(x) for x in re.search(r"\) \((\d+) (\d+) (\d+)\)", x).groups()]
+            for x in Setup("", "").blocks_section(mb) if "hex (" in x
+        ]
+    pm = PolyMesh(mb, [], 1.0).build()
+    
+    assert pm.nCells == np.prod(hexCounts, axis = 1).sum()
+    assert pm.nCells == 12 * np.prod(mb.geometry.cell_count()[-1])
+
+
+def test_write_case(tmp_path):
+    ### polyMesh written by the run, next to the blockMeshDict
+    make_multi_block_blockmeshdict(
+            boundingBox,
+            1.0,
+            {"x" : [1.0, 2.0], "y" : [1.0, 2.0], "z" : [1.0]},
+            gridSpacing,
+            [],
+            str(tmp_path),
+            str(tmp_path / "case"),
+            False,
+            polyMeshFormat = "ascii"
+        )
+    
+    written = read_polymesh(tmp_path / "case" / "constant" / "polyMesh")
+    
+    assert len(np.unique(np.concatenate((written["owner"], written["neighbour"])))) == 18 * 64
+    assert (tmp_path / "case" / "system" / "blockMeshDict").is_file()
@@ -0,0 +1,113 @@
+import re
+import json
+
+import numpy as np
+import pytest
+
+from operation.setup import Setup
+from simply_multiblockmesh import make_multi_block_blockmeshdict
+from utility.define import blockFaceDefinition
+
+from conftest import boundingBox, splitPlanes, gridSpacing
+
+
+### Collapses --> a vertex to its neighbour, an edge to the edge next to it
+collapseTasks = {
+    "vertexEdit" : {
+        "0" : {"edit-type" : "collapse", "id" : 15, "target-vertex" : 14},
+    },
+    "edgeEdit" : {
+        "0" : {"edit-type" : "collapse", "edge" : {"block-id" : 17, "position" : ["front", "top"]}, "target-edge" : {"block-id" : 17, "position" : ["front", "bottom"]}},
+    },
+}
+
+### Sides of the collapsed blocks
+boundaryTasks = {
+    "boundary" : {
+        "0" : {"name" : "outlet", "type" : "patch", "faces" : [[8, "right"], [17, "right"], [17, "front"]]},
+        "1" : {"name" : "walls", "type" : "wall", "faces" : [[8, "top"], [2, "right"], [8, "back"]]},
+    },
+}
+
+
+def written_sections(mb, boundaryDefinition):
+    """ Vertex coordinates, hex labels of the blocks and quad labels of the boundary written in blockMeshDict """
+    
+    setup = Setup("", "")
+    
+    vertices = np.array(
+            [re.match(r"\s*\((\S+) (\S+) (\S+)\)", x).groups() for x in setup.vertices_section(mb) if "// vertex-" in x],
+            dtype = np.float64
+        )
+    hexLabels = np.array(
+            [re.search(r"hex \(([\d ]+)\)", x).group(1).split() for x in setup.blocks_section(mb) if "hex (" in x],
+            dtype = np.int64
+        )
+    quadLabels = np.array(
+            re.findall(r"\((\d+) (\d+) (\d+) (\d+)\)", "".join(setup.boundary_section(boundaryDefinition))),
+            dtype = np.int64
+        )
+    
+    return vertices, hexLabels, quadLabels
+
+
+def test_compacted_sections(make_multiblock, write_edit):
+    mb = make_multiblock([4])
+    edit = write_edit(collapseTasks | boundaryTasks)
+    edit.execute(mb)
+    
+    vertices, hexLabels, quadLabels = written_sections(mb, edit.boundaryDefinition)
+    
+    ### Merged vertices are written once --> 1 vertex and the 2 vertices of an edge less
+    assert len(vertices) == len(mb.vertexStore) - 3
+    assert len(np.unique(vertices, axis = 0)) == len(vertices)
+    
+    ### Same block corners (coordinates) as with the vertex ids
+    blockIds = np.flatnonzero(mb.activeMask)
+    np.testing.assert_array_equal(vertices[hexLabels], mb.vertexStore.coordinates[mb.hexConnectivity[blockIds]])
+    
+    ### Boundary faces refer to the written (compacted) labels
+    faces = [(8, "right"), (17, "right"), (17, "front"), (8, "top"), (2, "right"), (8, "back")]
+    faceVertexIds = np.array([mb.hexConnectivity[blockId][list(blockFaceDefinition[side])] for blockId, side in faces])
+    np.testing.assert_array_equal(vertices[quadLabels], mb.vertexStore.coordinates[faceVertexIds])
+
+
+def run_build(workingDir, editTasks, incremental):
+    """ Write the edit file, build blockMeshDict and read it (without the header) """
+    
+    for editFile in workingDir.glob("block_edit_*"):
+        editFile.unlink()
+    (workingDir / "block_edit_test.json").write_text(json.dumps(editTasks))
+    
+    make_multi_block_blockmeshdict(
+            boundingBox,
+            1.0,
+            splitPlanes,
+            gridSpacing,
+            [4],
+            str(workingDir),
+            str(workingDir / "case"),
+            True,
+            incremental
+        )
+    
+    blockMeshDict = (workingDir / "case" / "system" / "blockMeshDict").read_text()
+    
+    return blockMeshDict[blockMeshDict.index("convertToMeters"):]
+
+
+@pytest.mark.parametrize("editChanges", [
+        [collapseTasks | boundaryTasks, boundaryTasks],
+        [boundaryTasks, collapseTasks | boundaryTasks],
+    ])
+def test_incremental_build(tmp_path, editChanges):
+    incrementalDir = tmp_path / "incremental"
+    fullDir = tmp_path / "full"
+    incrementalDir.mkdir()
+    fullDir.mkdir()
+    
+    ### Collapses added/removed, same boundaries --> the boundary section is written with the new labels
+    for editTasks in editChanges:
+        incrementalDict = run_build(incrementalDir, editTasks, True)
+    
+    assert incrementalDict == run_build(fullDir, editChanges[-1], False)
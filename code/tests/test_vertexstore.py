@@ -0,0 +1,85 @@
+import re
+import types
+
+import numpy as np
+
+from entity.multiblock import MultiBlock
+from operation.editjournal import EditJournal
+from operation.editplan import EditPlan
+from operation.setup import Setup
+
+from conftest import splitPlanes, gridSpacing
+
+
+### Bounding box with integer (and float) coordinates
+integerBoundingBox = {"x-min" : 0, "x-max" : 3, "y-min" : 0.0, "y-max" : 3, "z-min" : 0, "z-max" : 2.0}
+
+### Moves by integers keep integer coordinates (as a Python sum)
+vertexTasks = {
+    0 : {"edit-type" : "move", "id" : 5, "delta" : [1, 0.5, 0]},
+    1 : {"edit-type" : "move", "id" : 6, "new-location" : [2, 1, 0.5]},
+    2 : {"edit-type" : "scale", "id" : 6, "ratio" : 2, "reference" : [1, 1, 0]},
+}
+
+
+def make_integer_multiblock():
+    mb = MultiBlock(
+            integerBoundingBox,
+            splitPlanes,
+            gridSpacing,
+            []
+        )
+    mb.make()
+    
+    return mb
+
+
+def written_vertices(mb):
+    """ Coordinates of the vertices as written in blockMeshDict """
+    
+    return [re.match(r"\s*\((.*)\)", x).group(1) for x in Setup("", "").vertices_section(mb) if "// vertex-" in x]
+
+
+def test_integer_coordinates_written():
+    vertices = written_vertices(make_integer_multiblock())
+    
+    assert vertices[0] == "0 0.0 0"
+    assert vertices[1] == "1.0 0.0 0"
+    assert vertices[-1] == "3 3 2.0"
+
+
+def test_integer_coordinates_edited():
+    taskModule = types.SimpleNamespace(vertexEdit = vertexTasks)
+    
+    batched = make_integer_multiblock()
+    EditPlan(batched).compile(taskModule, ["vertexEdit"]).execute()
+    
+    sequential = make_integer_multiblock()
+    for step in EditPlan(sequential).compile(taskModule, ["vertexEdit"]).steps:
+        step.handler(step.arguments)
+    
+    ### 1.0 + 1, 1 + 0.5, 0 + 0 / 1 + 2 * (2 - 1), 1 + 2 * (1 - 1), 0 + 2 * (0.5 - 0)
+    for mb in (batched, sequential):
+        assert mb.vertices[5].coordinates() == (2.0, 1.5, 0)
+        assert mb.vertices[6].coordinates() == (3, 1, 1.0)
+        assert written_vertices(mb)[5:7] == ["2.0 1.5 0", "3 1 1.0"]
+    
+    np.testing.assert_array_equal(batched.vertexStore.integerMask, sequential.vertexStore.integerMask)
+
+
+def test_integer_coordinates_restored(tmp_path):
+    mb = make_integer_multiblock()
+    original = written_vertices(mb)
+    
+    journal = EditJournal(mb)
+    journal.apply(
+            EditPlan(mb).compile(types.SimpleNamespace(vertexEdit = vertexTasks), ["vertexEdit"]),
+            types.SimpleNamespace(vertexEdit = vertexTasks)
+        )
+    edited = written_vertices(mb)
+    
+    mb.save(str(tmp_path / "mb.npz"))
+    assert written_vertices(MultiBlock.load(str(tmp_path / "mb.npz"))) == edited
+    
+    journal.rollback()
+    assert written_vertices(mb) == original
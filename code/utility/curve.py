@@ -0,0 +1,530 @@
+import numpy as np
+
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from utility.udtypes import PointValueType
+
+
+CurveT = TypeVar("CurveT", bound = "Curve")
+
+CurveFunctionType = Callable[[np.ndarray], np.ndarray]
+
+### Number of curve samples used to find the curve parameter of a point
+projectionSampleCount = 512
+
+### Number of closest curve samples refined to find the curve parameter of a point
+projectionCandidateCount = 3
+
+### Local refinement of the curve parameter of a point --> (rounds, samples per round)
+projectionRefinement = (8, 17)
+
+### Maximum number of bisections of a curve segment
+maxRefinementLevel = 16
+
+### Check points inside a curve segment (fractions of the segment) for the chordal deviation
+chordCheckFraction = np.array([0.25, 0.5, 0.75])
+
+### Relative distance (to the curve size) between the curve ends below which the curve is closed
+closedCurveTolerance = 1e-9
+
+
+def _vector(
+        definition: Dict,
+        key: str,
+        default: Optional[List] = None
+    ) -> np.ndarray:
+    """ Get a vector entry (3 numbers) of a curve definition """
+    
+    value = definition.get(key, default)
+    
+    if (not isinstance(value, (list, tuple)) or len(value) != 3
+            or not all(isinstance(x, (int, float)) for x in value)):
+        raise ValueError(f"curve entry '{key}' must be a list of 3 numbers --> {value!r}")
+    
+    return np.asarray(value, dtype = np.float64)
+
+
+def _number(
+        definition: Dict,
+        key: str,
+        default: Optional[PointValueType] = None
+    ) -> float:
+    """ Get a number entry of a curve definition """
+    
+    value = definition.get(key, default)
+    
+    if not isinstance(value, (int, float)):
+        raise ValueError(f"curve entry '{key}' must be a number --> {value!r}")
+    
+    return float(value)
+
+
+def _range(
+        definition: Dict,
+        key: str,
+        default: Optional[List] = None
+    ) -> Tuple[float, float]:
+    """ Get a parameter range entry (2 different numbers) of a curve definition """
+    
+    value = definition.get(key, default)
+    
+    if (not isinstance(value, (list, tuple)) or len(value) != 2
+            or not all(isinstance(x, (int, float)) for x in value) or value[0] == value[1]):
+        raise ValueError(f"curve entry '{key}' must be a list of 2 different numbers --> {value!r}")
+    
+    return (float(value[0]), float(value[1]))
+
+
+def ellipse_curve(definition: Dict) -> Tuple[CurveFunctionType, Tuple[float, float]]:
+    """
+    Ellipse (or circle) --> center + cos(angle) * major-axis + sin(angle) * minor-axis
+    
+    Entries:
+        center: Center of the ellipse
+        major-axis: Vector from the center to the ellipse at angle 0 (semi-axis)
+        minor-axis: Vector from the center to the ellipse at angle 90 (semi-axis)
+        angle-range: Range of the curve parameter (angle in degree). Defaults to [0, 360].
+    """
+    
+    center = _vector(definition, "center")
+    majorAxis = _vector(definition, "major-axis")
+    minorAxis = _vector(definition, "minor-axis")
+    
+    def function(angle: np.ndarray) -> np.ndarray:
+        angleRadian = np.radians(angle)[:, np.newaxis]
+        return center + np.cos(angleRadian) * majorAxis + np.sin(angleRadian) * minorAxis
+    
+    return function, _range(definition, "angle-range", [0.0, 360.0])
+
+
+def helix_curve(definition: Dict) -> Tuple[CurveFunctionType, Tuple[float, float]]:
+    """
+    Circular helix around an axis
+    
+    Entries:
+        origin: Point on the helix axis
+        axis: Vector along the helix axis (direction of the advance)
+        radius-vector: Vector from the axis to the helix at angle 0 (normal to the axis)
+        pitch: Advance along the axis per turn
+        angle-range: Range of the curve parameter (angle in degree)
+    """
+    
+    origin = _vector(definition, "origin")
+    axis = _vector(definition, "axis")
+    radiusVector = _vector(definition, "radius-vector")
+    pitch = _number(definition, "pitch")
+    
+    if np.linalg.norm(axis) == 0.0:
+        raise ValueError("curve entry 'axis' can't be a zero vector")
+    
+    axis = axis / np.linalg.norm(axis)
+    
+    ### Radius vector is taken normal to the axis
+    radiusVector = radiusVector - np.dot(radiusVector, axis) * axis
+    binormal = np.cross(axis, radiusVector)
+    
+    def function(angle: np.ndarray) -> np.ndarray:
+        angleRadian = np.radians(angle)[:, np.newaxis]
+        return (
+                origin
+                + np.cos(angleRadian) * radiusVector
+                + np.sin(angleRadian) * binormal
+                + (pitch * angle / 360.0)[:, np.newaxis] * axis
+            )
+    
+    return function, _range(definition, "angle-range")
+
+
+def naca4_curve(definition: Dict) -> Tuple[CurveFunctionType, Tuple[float, float]]:
+    """
+    Upper or lower side of a NACA 4-digit airfoil
+    
+    Entries:
+        code: 4-digit code of the airfoil, e.g. "2412"
+        leading-edge: Location of the leading edge
+        chord: Vector from the leading edge to the trailing edge (chord length)
+        normal: Direction of the thickness (from the lower to the upper side)
+        side: "upper" or "lower"
+        chord-range: Range of the curve parameter (chord fraction x/c). Defaults to [0, 1].
+    """
+    
+    code = definition.get("code")
+    if not isinstance(code, str) or len(code) != 4 or not code.isdigit():
+        raise ValueError(f"curve entry 'code' must be a 4-digit string --> {code!r}")
+    
+    side = definition.get("side")
+    if side not in ["upper", "lower"]:
+        raise ValueError(f"curve entry 'side' must be 'upper' or 'lower' --> {side!r}")
+    
+    maxCamber = int(code[0]) / 100.0
+    maxCamberPosition = int(code[1]) / 10.0
+    thickness = int(code[2:]) / 100.0
+    
+    leadingEdge = _vector(definition, "leading-edge")
+    chord = _vector(definition, "chord")
+    normal = _vector(definition, "normal")
+    
+    chordLength = np.linalg.norm(chord)
+    if chordLength > 0.0:
+        normal = normal - np.dot(normal, chord) / chordLength**2 * chord
+    
+    if chordLength == 0.0 or np.linalg.norm(normal) == 0.0:
+        raise ValueError("curve entries 'chord' and 'normal' must be non-zero, non-parallel vectors")
+    
+    normal = chordLength * normal / np.linalg.norm(normal)
+    sideSign = 1.0 if side == "upper" else -1.0
+    
+    def function(x: np.ndarray) -> np.ndarray:
+        x = np.clip(x, 0.0, 1.0)
+        halfThickness = 5.0 * thickness * (
+                0.2969 * np.sqrt(x) - 0.1260 * x - 0.3516 * x**2 + 0.2843 * x**3 - 0.1015 * x**4
+            )
+        
+        ### Camber line and its slope
+        camber = np.zeros_like(x)
+        slope = np.zeros_like(x)
+        if maxCamber > 0.0 and maxCamberPosition > 0.0:
+            p = maxCamberPosition
+            isFront = x < p
+            camber = np.where(
+                    isFront,
+                    maxCamber / p**2 * (2.0 * p * x - x**2),
+                    maxCamber / (1.0 - p)**2 * ((1.0 - 2.0 * p) + 2.0 * p * x - x**2)
+                )
+            slope = np.where(
+                    isFront,
+                    2.0 * maxCamber / p**2 * (p - x),
+                    2.0 * maxCamber / (1.0 - p)**2 * (p - x)
+                )
+        
+        theta = np.arctan(slope)
+        xSide = x - sideSign * halfThickness * np.sin(theta)
+        ySide = camber + sideSign * halfThickness * np.cos(theta)
+        
+        return leadingEdge + xSide[:, np.newaxis] * chord + ySide[:, np.newaxis] * normal
+    
+    return function, _range(definition, "chord-range", [0.0, 1.0])
+
+
+def function_curve(definition: Dict) -> Tuple[CurveFunctionType, Tuple[float, float]]:
+    """
+    Curve given by a function of the curve parameter
+    
+    Entries:
+        function: Callable mapping an (N,) array of parameters to the (N, 3) curve points
+        parameter-range: Range of the curve parameter. Defaults to [0, 1].
+    """
+    
+    if not callable(definition.get("function")):
+        raise ValueError(f"curve entry 'function' must be callable --> {definition.get('function')!r}")
+    
+    return definition["function"], _range(definition, "parameter-range", [0.0, 1.0])
+
+
+### Curve type --> builder of the curve function and its parameter range
+curveBuilder = {
+    "ellipse" : ellipse_curve,
+    "helix" : helix_curve,
+    "naca4" : naca4_curve,
+    "function" : function_curve,
+}
+
+
+class Curve:
+    """
+    Parametric curve for the spline/polyline edges.
+    
+    The curve function maps an array of parameters to the curve points,
+    all operations (projection of the edge vertices, adaptive sampling)
+    are done for all edges on the curve together.
+    
+    Usage:
+        curve = Curve.from_definition({"type" : "ellipse", "center" : [0, 0, 0], ...})
+        curvePoints = curve.sample(startPoints, endPoints, tolerance = 1e-4)
+    """
+    
+    def __init__(
+            self,
+            function: CurveFunctionType,
+            parameterRange: Tuple[float, float]
+        ) -> None:
+        """
+        Initialize Curve instance
+        
+        Args:
+            function (CurveFunctionType): Maps an (N,) array of parameters to the (N, 3) curve points
+            parameterRange (Tuple[float, float]): Range of the curve parameter
+        """
+        
+        self._function = function
+        self._parameterRange = parameterRange
+    
+    def __repr__(self):
+        return f"Curve : parameter {self._parameterRange[0]} --> {self._parameterRange[1]}"
+    
+    @property
+    def parameterRange(self) -> Tuple[float, float]:
+        return self._parameterRange
+    
+    def is_closed(self) -> bool:
+        """
+        Check if the curve ends at its start (ellipse over 360 degrees, closed function curve)
+        
+        Returns:
+            bool: True, if the curve is closed
+        """
+        
+        samplePoints = self.points(np.linspace(*self._parameterRange, projectionSampleCount))
+        curveSize = np.linalg.norm(samplePoints.max(axis = 0) - samplePoints.min(axis = 0))
+        
+        return bool(np.linalg.norm(samplePoints[-1] - samplePoints[0]) <= closedCurveTolerance * curveSize)
+    
+    @classmethod
+    def from_definition(
+            cls,
+            definition: Union[Dict, Callable]
+        ) -> CurveT:
+        """
+        Create a curve from its definition in the edit file
+        
+        Args:
+            definition (Union[Dict, Callable]): Dictionary with the "type" and the entries of the curve, or a function of the parameter in [0, 1]
+        
+        Raises:
+            ValueError: If the definition is invalid
+        
+        Returns:
+            CurveT: Curve object
+        """
+        
+        if callable(definition):
+            definition = {"type" : "function", "function" : definition}
+        
+        if not isinstance(definition, dict) or definition.get("type") not in curveBuilder:
+            raise ValueError(f"curve must be a function or a dictionary with 'type' any of {list(curveBuilder)}")
+        
+        return cls(*curveBuilder[definition["type"]](definition))
+    
+    def points(
+            self,
+            parameters: np.ndarray
+        ) -> np.ndarray:
+        """
+        Get the curve points
+        
+        Args:
+            parameters (np.ndarray): Curve parameters, any shape
+        
+        Raises:
+            ValueError: If the curve function doesn't return one point per parameter
+        
+        Returns:
+            np.ndarray: (..., 3) coordinates of the curve points
+        """
+        
+        parameters = np.asarray(parameters, dtype = np.float64)
+        points = np.asarray(self._function(parameters.ravel()), dtype = np.float64)
+        
+        if points.shape != (parameters.size, 3):
+            raise ValueError(f"Curve function must return an array of shape ({parameters.size}, 3) --> {points.shape}")
+        
+        return points.reshape(parameters.shape + (3,))
+    
+    def project(
+            self,
+            points: np.ndarray
+        ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the parameters of the closest curve points
+        
+        Args:
+            points (np.ndarray): (N, 3) coordinates of the points
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (N,) curve parameters, (N,) distances from the curve
+        """
+        
+        points = np.asarray(points, dtype = np.float64).reshape(-1, 3)
+        startParameter, endParameter = self._parameterRange
+        lowParameter, highParameter = min(self._parameterRange), max(self._parameterRange)
+        
+        ### Closest curve samples (more than one --> closed curves, curves passing near themselves)
+        sampleParameters = np.linspace(startParameter, endParameter, projectionSampleCount)
+        samplePoints = self.points(sampleParameters)
+        squaredDistance = (
+                (points**2).sum(axis = 1)[:, np.newaxis]
+                - 2.0 * points @ samplePoints.T
+                + (samplePoints**2).sum(axis = 1)
+            )
+        candidates = np.argpartition(squaredDistance, projectionCandidateCount, axis = 1)[:, :projectionCandidateCount]
+        parameters = sampleParameters[candidates]
+        
+        ### Local refinement around the closest parameters
+        rounds, count = projectionRefinement
+        step = abs(endParameter - startParameter) / (projectionSampleCount - 1)
+        offsets = np.linspace(-1.0, 1.0, count)
+        for _ in range(rounds):
+            localParameters = np.clip(parameters[..., np.newaxis] + step * offsets, lowParameter, highParameter)
+            localDistance = ((self.points(localParameters) - points[:, np.newaxis, np.newaxis, :])**2).sum(axis = 3)
+            parameters = np.take_along_axis(
+                    localParameters,
+                    np.argmin(localDistance, axis = 2)[..., np.newaxis],
+                    axis = 2
+                )[..., 0]
+            step *= 2.0 / (count - 1)
+        
+        distances = np.linalg.norm(self.points(parameters) - points[:, np.newaxis, :], axis = 2)
+        closest = np.argmin(distances, axis = 1)
+        pointRange = np.arange(len(points))
+        
+        return parameters[pointRange, closest], distances[pointRange, closest]
+    
+    def sample(
+            self,
+            startPoints: np.ndarray,
+            endPoints: np.ndarray,
+            tolerance: PointValueType,
+            parameterRanges: Optional[np.ndarray] = None
+        ) -> List[np.ndarray]:
+        """
+        Get the points of the curve between the start and the end of edges.
+        
+        Each curve segment is bisected until the curve is within the
+        tolerance (chordal deviation) of the straight segment, checked at
+        the quarter points of the segment. Only the segments which fail
+        are split, so the point count follows the curvature. All edges
+        are refined together, one curve evaluation per refinement level.
+        
+        On a closed curve, an edge with a projected vertex runs the shorter
+        way round (across the seam of the parameter range, if needed).
+        Given parameters are kept as they are, e.g. for the longer way.
+        
+        Args:
+            startPoints (np.ndarray): (M, 3) coordinates of the start vertex of the edges
+            endPoints (np.ndarray): (M, 3) coordinates of the end vertex of the edges
+            tolerance (PointValueType): Maximum distance between the curve and the line through the points
+            parameterRanges (Optional[np.ndarray], optional): (M, 2) curve parameters of the edge start/end, a NaN row is found by projecting the vertices on the curve. Defaults to None.
+        
+        Raises:
+            ValueError: If the tolerance isn't positive, or an edge vertex isn't on the curve (within the tolerance)
+        
+        Returns:
+            List[np.ndarray]: (k, 3) coordinates of the inner points (excluding the vertices) of each edge
+        """
+        
+        if not tolerance > 0:
+            raise ValueError(f"Curve tolerance must be positive --> {tolerance!r}")
+        
+        startPoints = np.asarray(startPoints, dtype = np.float64).reshape(-1, 3)
+        endPoints = np.asarray(endPoints, dtype = np.float64).reshape(-1, 3)
+        nEdge = len(startPoints)
+        
+        if parameterRanges is None:
+            parameterRanges = np.full((nEdge, 2), np.nan)
+        parameterRanges = np.array(parameterRanges, dtype = np.float64).reshape(nEdge, 2)
+        
+        ### Parameters of the edge vertices
+        edgeVertices = np.stack((startPoints, endPoints), axis = 1)
+        isProjected = np.isnan(parameterRanges)
+        parameterRanges[isProjected] = self.project(edgeVertices[isProjected])[0]
+        
+        ### The curve must pass through the edge vertices (at the given or the projected parameters)
+        distances = np.linalg.norm(self.points(parameterRanges) - edgeVertices, axis = 2).ravel()
+        offCurve = np.flatnonzero(distances > tolerance)
+        if offCurve.size > 0:
+            raise ValueError(
+                    f"Edge vertices are not on the curve --> vertex {edgeVertices.reshape(-1, 3)[offCurve[0]].tolist()}"
+                    f" is {distances[offCurve[0]]:.6g} away (tolerance {tolerance})"
+                )
+        
+        startParameters, endParameters = parameterRanges[:, 0], parameterRanges[:, 1]
+        
+        if (startParameters == endParameters).any():
+            raise ValueError("Start and end vertex of an edge are at the same location on the curve.")
+        
+        ### Closed curve --> the projected end of the edge is shifted by a period to take the shorter way
+        curvePoints = self.points
+        if self.is_closed():
+            lowParameter = min(self._parameterRange)
+            period = abs(self._parameterRange[1] - self._parameterRange[0])
+            
+            span = endParameters - startParameters
+            isLonger = isProjected.any(axis = 1) & (np.abs(span) > 0.5 * period)
+            shift = np.where(isLonger, np.sign(span) * period, 0.0)
+            
+            endParameters = endParameters - np.where(isProjected[:, 1], shift, 0.0)
+            startParameters = startParameters + np.where(isProjected[:, 1], 0.0, shift)
+            
+            ### Parameters outside of the range are evaluated at the same location inside the range
+            def curvePoints(parameters: np.ndarray) -> np.ndarray:
+                isOutside = (parameters < lowParameter) | (parameters > lowParameter + period)
+                return self.points(np.where(isOutside, lowParameter + np.mod(parameters - lowParameter, period), parameters))
+        
+        ### Segments --> edge, start and end fraction of the edge parameter range
+        segmentEdges = np.arange(nEdge)
+        segmentStarts = np.zeros(nEdge)
+        segmentEnds = np.ones(nEdge)
+        
+        keptEdges = [np.empty(0, dtype = np.int64)]
+        keptStarts = [np.empty(0)]
+        
+        for level in range(maxRefinementLevel + 1):
+            fractions = np.column_stack((
+                    segmentStarts,
+                    segmentStarts[:, np.newaxis] + np.outer(segmentEnds - segmentStarts, chordCheckFraction),
+                    segmentEnds
+                ))
+            parameters = (
+                    startParameters[segmentEdges, np.newaxis]
+                    + fractions * (endParameters - startParameters)[segmentEdges, np.newaxis]
+                )
+            points = curvePoints(parameters)
+            
+            ### Distance of the check points from the segment chord
+            chordStart = points[:, :1, :]
+            chord = points[:, -1:, :] - chordStart
+            chordLength2 = np.maximum((chord**2).sum(axis = 2), np.finfo(np.float64).tiny)
+            relative = points[:, 1:-1, :] - chordStart
+            position = np.clip((relative * chord).sum(axis = 2) / chordLength2, 0.0, 1.0)
+            deviation = np.linalg.norm(relative - position[:, :, np.newaxis] * chord, axis = 2).max(axis = 1)
+            
+            isSplit = deviation > tolerance
+            if level == maxRefinementLevel:
+                isSplit[:] = False
+            
+            keptEdges.append(segmentEdges[~isSplit])
+            keptStarts.append(segmentStarts[~isSplit])
+            
+            if not isSplit.any():
+                break
+            
+            ### Bisection of the failed segments
+            middles = 0.5 * (segmentStarts[isSplit] + segmentEnds[isSplit])
+            segmentEdges = np.repeat(segmentEdges[isSplit], 2)
+            segmentStarts, segmentEnds = (
+                    np.column_stack((segmentStarts[isSplit], middles)).ravel(),
+                    np.column_stack((middles, segmentEnds[isSplit])).ravel(),
+                )
+        
+        ### Inner points --> start of every segment except the first one of each edge
+        keptEdges = np.concatenate(keptEdges)
+        keptStarts = np.concatenate(keptStarts)
+        isInner = keptStarts > 0.0
+        keptEdges, keptStarts = keptEdges[isInner], keptStarts[isInner]
+        
+        order = np.lexsort((keptStarts, keptEdges))
+        keptEdges, keptStarts = keptEdges[order], keptStarts[order]
+        
+        innerPoints = curvePoints(
+                startParameters[keptEdges] + keptStarts * (endParameters - startParameters)[keptEdges]
+            )
+        
+        return np.split(innerPoints, np.cumsum(np.bincount(keptEdges, minlength = nEdge))[:-1])
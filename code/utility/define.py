@@ -11,6 +11,14 @@ templateFilenameBlockEdit = "block_edit.py"
 
 ofCaseTemplateDirname = "case_system_template"
 
+snapshotDirName = ".simblom_snapshot"
+
+### Accepted formats of the edit file --> block_edit_*.<suffix>
+editFileSuffix = [".py", ".json", ".toml"]
+
+### Cache of the tables read from the edit file --> .<edit file>.cache
+editCacheSuffix = ".cache"
+
 blockFaceName = ["front", "back", "left", "right", "bottom", "top"]
 
 quadrantEdgeRule = {
@@ -238,20 +246,43 @@ quadrantEdgeRule = {
         },
 }
 
-edgePosition = [
-        "back-bottom",
-        "back-top",
-        "front-bottom",
-        "front-top",
-        "back-left",
-        "back-right",
-        "front-left",
-        "front-right",
-        "left-bottom",
-        "left-top",
-        "right-bottom",
-        "right-top"
-    ]
+### Block face convention -> positions of the face vertices in the block vertex tuple
+### Block vertex tuple --> back-bottom-left, back-bottom-right, back-top-right, back-top-left,
+###                        front-bottom-left, front-bottom-right, front-top-right, front-top-left
+blockFaceDefinition = {
+        "front" : (4, 7, 6, 5),
+        "back" : (0, 1, 2, 3),
+        "left" : (0, 3, 7, 4),
+        "right" : (5, 6, 2, 1),
+        "bottom" : (0, 4, 5, 1),
+        "top" : (3, 2, 6, 7),
+    }
+
+### Block edge convention -> (direction, position, start vertex, end vertex)
+### The start/end vertices are the positions in the block vertex tuple
+blockEdgeDefinition = (
+        ("x", "back-bottom", 0, 1),
+        ("x", "back-top", 3, 2),
+        ("x", "front-bottom", 4, 5),
+        ("x", "front-top", 7, 6),
+        ("y", "back-left", 0, 3),
+        ("y", "back-right", 1, 2),
+        ("y", "front-left", 4, 7),
+        ("y", "front-right", 5, 6),
+        ("z", "left-bottom", 0, 4),
+        ("z", "left-top", 3, 7),
+        ("z", "right-bottom", 1, 5),
+        ("z", "right-top", 2, 6),
+    )
+
+### Edge positions of the block edges, in the order of the edge indices
+edgePosition = [x[1] for x in blockEdgeDefinition]
+
+### Unordered pair of face names --> edge index, e.g. frozenset({"top", "back"}) : 1
+blockEdgeIndex = {
+    frozenset(position.split("-")) : edgeId
+    for edgeId, position in enumerate(edgePosition)
+}
 
 slicePlaneAxisIndex = {
     "xy" : {
@@ -276,6 +307,14 @@ taskTypeCheck = [
     "boundary",
 ]
 
+### Task types changing the multi-block geometry
+geometryTaskType = [
+    "vertexEdit", 
+    "edgeEdit",
+    "faceEdit",
+    "blockEdit",
+]
+
 
 blockShiftCoefficient = {
     1: {
@@ -317,4 +356,22 @@ angleForQuadrant = {
             "theta-side-arc" : (3*90) + (3*45/2.0),
             "theta-top-arc" : (3*90) + (45/2.0),
         },
+}
+
+### Direction of the inner corner shift of the quadrant center block
+### along the (1st, 2nd) axis of the slice plane
+quadrantShiftFactor = {
+    1 : (-1, -1),
+    2 : (1, -1),
+    3 : (1, 1),
+    4 : (-1, 1),
+}
+
+### Blocks of the quadrants of a (4 x 4 block) circle --> quadrant number : (center block, corner block)
+### Offsets from the starting block along the (1st, 2nd) axis of the slice plane, in execution order
+circleQuadrantBlockOffset = {
+    1 : ((2, 2), (3, 3)),
+    2 : ((1, 2), (0, 3)),
+    3 : ((1, 1), (0, 0)),
+    4 : ((2, 1), (3, 0)),
 }
\ No newline at end of file
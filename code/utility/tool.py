@@ -1,7 +1,8 @@
 
 import math
 import numpy as np
-from scipy.spatial.transform import Rotation as R
+
+from functools import lru_cache
 
 from typing import (
     Dict,
@@ -152,6 +153,92 @@ def surface_normal_from_tree_points(
         
 
 
+@lru_cache(maxsize = 256)
+def _rotation_matrix(
+        unitNormalVector: Tuple[float, float, float],
+        rotationAngle: float
+    ) -> np.ndarray:
+    """ Cached (read-only) rotation matrix of a (unit axis, angle in degree) pair, see rotation_matrix """
+    
+    kx, ky, kz = unitNormalVector
+    angleRadian = math.radians(rotationAngle)
+    cosAngle = math.cos(angleRadian)
+    sinAngle = math.sin(angleRadian)
+    
+    ### Rodrigues' rotation formula --> R = I + sin(a) K + (1 - cos(a)) K^2
+    crossMatrix = np.array([
+            [0.0, -kz, ky],
+            [kz, 0.0, -kx],
+            [-ky, kx, 0.0],
+        ])
+    
+    matrix = np.eye(3) + sinAngle * crossMatrix + (1.0 - cosAngle) * (crossMatrix @ crossMatrix)
+    matrix.flags.writeable = False
+    
+    return matrix
+
+
+
+def rotation_matrix(
+        normalVector: VectorType,
+        rotationAngle: AngleType
+    ) -> np.ndarray:
+    """
+    Get the matrix of a rotation about an axis (right-hand rule).
+    The matrix is computed once per (axis, angle) pair.
+
+    Args:
+        normalVector (VectorType): Vector along the rotation axis (normalized here)
+        rotationAngle (AngleType): Angle of rotation in degree
+
+    Raises:
+        ValueError: If the vector of the rotation axis is zero
+
+    Returns:
+        np.ndarray: (3, 3) rotation matrix (read-only)
+    """
+    
+    normalVector = np.asarray(normalVector, dtype = np.float64)
+    norm = np.linalg.norm(normalVector)
+    
+    if norm == 0.0:
+        raise ValueError("Rotation axis can't be defined by a zero vector.")
+    
+    return _rotation_matrix(
+            tuple((normalVector / norm).tolist()),
+            float(rotationAngle)
+        )
+
+
+
+def rotate_points(
+        points: PointListType,
+        axisPoint: PointType,
+        normalVector: VectorType,
+        rotationAngle: AngleType
+    ) -> np.ndarray:
+    """
+    Rotate points about an axis in 3D space, all points in one matrix multiplication
+
+    Args:
+        points (PointListType): (N, 3) coordinates of the points to be rotated
+        axisPoint (PointType): Point on the rotation axis
+        normalVector (VectorType): Vector along the rotation axis
+        rotationAngle (AngleType): Angle of rotation in degree
+
+    Returns:
+        np.ndarray: (N, 3) coordinates of the points after rotation
+    """
+    
+    axisPoint = np.asarray(axisPoint, dtype = np.float64)
+    
+    ### Rotate the points relative to the axis point (row vectors --> transposed matrix)
+    relativePoints = np.asarray(points, dtype = np.float64).reshape(-1, 3) - axisPoint
+    
+    return relativePoints @ rotation_matrix(normalVector, rotationAngle).T + axisPoint
+
+
+
 def point_rotation_coordinates(
         point: PointType,
         axisPoint: PointType,
@@ -171,31 +258,7 @@ def point_rotation_coordinates(
         PointType: Return the point coordinates after rotation.
     """
     
-    point = np.array(point)
-    axisPoint = np.array(axisPoint)
-    normalVector = np.array(normalVector)
-    
-    ### Translate the axis point to the origin
-    pointRelativeToOrigin = point - axisPoint
-    
-    ### Define the rotation using the normal vector as the axis
-    ### The normal vector should be normalized for correct rotation application
-    normalVector = normalVector / np.linalg.norm(normalVector)
-    
-    ### SciPy's Rotation.from_rotvec takes a vector 
-    ### where direction is axis and norm is angle in radians
-    angleRadian = np.deg2rad(rotationAngle)
-    rotationVector = normalVector * angleRadian
-    
-    rotation = R.from_rotvec(rotationVector)
-    
-    ### Apply the rotation
-    relativeRotatedPoint = rotation.apply(pointRelativeToOrigin)
-    
-    ### Translate the point back to its original position
-    rotatedPoint = relativeRotatedPoint + axisPoint
-    
-    return tuple(rotatedPoint)
+    return tuple(rotate_points([point], axisPoint, normalVector, rotationAngle)[0].tolist())
 
 
 
@@ -254,6 +317,67 @@ def grid_spacing(
 
 
 
+def lattice_hex_connectivity(
+        nx: int,
+        ny: int,
+        nz: int,
+    ) -> Tuple[np.ndarray]:
+    """
+    Compute the hex connectivity of a (z, y, x) block lattice.
+    
+    Blocks are numbered first along x, then along y, then along z,
+    the vertices of the lattice follow the same convention. The
+    8 vertices of each block are ordered according to the blockMesh
+    convention (back face first, then front face, counter-clockwise).
+
+    Args:
+        nx (int): Number of blocks along x
+        ny (int): Number of blocks along y
+        nz (int): Number of blocks along z
+
+    Returns:
+        Tuple[np.ndarray]: (nBlocks, 8) array of vertex ids and (nBlocks, 3) array of (x, y, z) multi-block indices
+    """
+    
+    izGrid, iyGrid, ixGrid = np.meshgrid(
+            np.arange(nz),
+            np.arange(ny),
+            np.arange(nx),
+            indexing = "ij"
+        )
+    
+    multiBlockIndices = np.stack(
+            (ixGrid.ravel(), iyGrid.ravel(), izGrid.ravel()),
+            axis = 1
+        )
+    
+    ### Vertex id of the back-bottom-left corner of each block
+    nxVertex = nx + 1
+    nxyVertex = (nx + 1) * (ny + 1)
+    origin = (
+            multiBlockIndices[:, 0]
+            + multiBlockIndices[:, 1] * nxVertex
+            + multiBlockIndices[:, 2] * nxyVertex
+        )
+    
+    ### Offsets of the 8 block corners w.r.t. the back-bottom-left corner
+    cornerOffset = np.array([
+            0,
+            1,
+            1 + nxVertex,
+            nxVertex,
+            nxyVertex,
+            nxyVertex + 1,
+            nxyVertex + 1 + nxVertex,
+            nxyVertex + nxVertex,
+        ])
+    
+    connectivity = origin[:, np.newaxis] + cornerOffset[np.newaxis, :]
+    
+    return connectivity, multiBlockIndices
+
+
+
 def slice_plane_from_block_pair(
         block1: BlockT,
         block2: BlockT
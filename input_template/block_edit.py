@@ -35,6 +35,7 @@ EDGE
     - scale
     - make edge an arc
     - make edge a spline
+    - make edge a polyline
 ---------------------------------------
 Define boundary/patch
 ---------------------------------------
@@ -9,6 +9,25 @@ export_directory="/path/to/the/export/directory"
 ### Read multi-block edit file? "yes" or "no"
 read_edit_file="yes"
 
+#---------------------------------------
+### Incremental build? "yes" or "no"
+### Reuses the unchanged parts of the previous run
+incremental_build="no"
+
+#---------------------------------------
+### Analyze the edit tasks? "yes" or "no"
+### Writes the overlapping tasks and the independent groups in edit_analysis.txt
+edit_analysis="no"
+
+#---------------------------------------
+### Write the polyMesh directly? "yes" or "no"
+### Straight-edged multi-blocks only (no arc/spline/polyline edges, no collapsed blocks)
+### blockMesh is not run, the polyMesh is written in case/constant/polyMesh
+write_polymesh="no"
+
+### Format of the polyMesh files, "binary" or "ascii"
+polymesh_format="binary"
+
 #---------------------------------------
 ### For scaling the mesh
 ### All dimensions gets multiplied by
@@ -49,6 +68,12 @@ gid_spacing='{
 }'
 
 #---------------------------------------
+### BLOCKS TO EXCLUDE
+###
+### Block ids and/or inclusive multi-block index ranges.
+### A range excludes every block inside it, "null" for an open end
+### and a missing axis means the entire axis.
+### e.g. {"x" : [null, 2], "z" : [5, null]} --> blocks with ix <= 2 and iz >= 5
 
 hex2exclude='{
     "exclude-list" : []
@@ -58,6 +83,10 @@ hex2exclude='{
 
 export export_directory
 export read_edit_file
+export incremental_build
+export edit_analysis
+export write_polymesh
+export polymesh_format
 export bounding_box
 export convert_to_meters
 export split_plane_list
@@ -78,10 +107,17 @@ simply_multiblockmesh="path/to/the/'simply_multiblockmesh.py'/script/in/local/di
 VSEP="----------------------------------------"
 
 $python $simply_multiblockmesh
+status=$?
 
 #---------------------------------------
 
-if [[ "$?" == 0 ]]; then
+if [[ "$status" == 0 && "$write_polymesh" == "yes" ]]; then
+    printf "\n\n\n"
+    printf "%s\n" $VSEP
+    printf "### polyMesh written, 'blockMesh' is not needed ###\n"
+    printf "%s\n\n\n" $VSEP
+    
+elif [[ "$status" == 0 ]]; then
     printf "\n\n\n"
     printf "%s\n" $VSEP
     printf "### Running 'blockMesh' ###\n"